@@ -0,0 +1,121 @@
+import glob
+import json
+import os
+import re
+import zlib
+
+# 보관 사유
+OUTCOMES = {
+    'completed': "✅ 진행됨",
+    'expired': "⏱️ 자동 취소",
+    'cancelled': "❌ 취소",
+}
+
+# 기록 형식 버전 (첫 바이트), 사전을 바꾸면 새 버전을 추가해야 예전 기록을 읽을 수 있음
+_FORMAT_VERSION = 1
+
+# 작은 기록도 잘 압축되도록 모든 기록에 반복되는 키를 미리 사전으로 제공
+_ZDICT = (
+    b'{"id":"","guild_id":,"channel_id":,"title":"","description":"","timestamp":,"datetime_text":"",'
+    b'"min_participants":,"mentioned_users":[],"creator_id":,"creator_name":"","responses":{"":true,"":false},'
+    b'"recurrence":null,"occurrence":0,"outcome":"completed","expired","cancelled","archived_at":}'
+)
+
+SEGMENT_BYTES = 64 * 1024 * 1024
+
+
+def archive_entry(schedule, outcome: str, archived_at: float):
+    """보관할 일정의 (색인 행, 사용자별 색인 행 목록, 기록) 생성 (이벤트 루프에서 상태를 복사해 둠)"""
+    record = {
+        'id': schedule.id,
+        'guild_id': schedule.guild_id,
+        'channel_id': schedule.channel_id,
+        'title': schedule.title,
+        'description': schedule.description,
+        'timestamp': schedule.timestamp,
+        'datetime_text': schedule.datetime_text,
+        'min_participants': schedule.min_participants,
+        'mentioned_users': list(schedule.mentioned_users),
+        'creator_id': schedule.creator_id,
+        'creator_name': schedule.creator_name,
+        'responses': {str(user_id): attending for user_id, attending in schedule.responses.items()},
+        'recurrence': schedule.recurrence.encode() if schedule.recurrence else None,
+        'occurrence': schedule.occurrence,
+        'duration': schedule.duration,
+        'outcome': outcome,
+        'archived_at': archived_at,
+    }
+    row = (schedule.id, schedule.guild_id, schedule.channel_id, schedule.title, schedule.timestamp, outcome,
+           schedule.attending_count, len(schedule.mentioned_users))
+    users = [(user_id, schedule.timestamp, schedule.id, _attending(schedule.responses.get(user_id)))
+             for user_id in dict.fromkeys(schedule.mentioned_users)]
+    return row, users, record
+
+
+def _attending(value):
+    return None if value is None else int(value)
+
+
+def compress_record(record):
+    compressor = zlib.compressobj(9, zdict=_ZDICT)
+    data = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode()
+    return bytes((_FORMAT_VERSION,)) + compressor.compress(data) + compressor.flush()
+
+
+def decompress_record(blob: bytes):
+    if blob[0] != _FORMAT_VERSION:
+        raise ValueError(f"알 수 없는 보관 기록 형식입니다: {blob[0]}")
+    decompressor = zlib.decompressobj(zdict=_ZDICT)
+    return json.loads(decompressor.decompress(blob[1:]) + decompressor.flush())
+
+
+class ArchiveSegments:
+    """압축한 기록을 덧붙이기만 하는 세그먼트 파일 모음 (모든 메서드는 동기 호출, 워커 스레드에서 사용)
+
+    샤드 프로세스마다 prefix 를 달리해 각자 자기 파일에만 쓴다. 위치(세그먼트, offset, 길이)는 DB 색인에 저장한다.
+    """
+
+    def __init__(self, directory: str, prefix: str = "archive", segment_bytes: int = SEGMENT_BYTES):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.prefix = prefix
+        self.segment_bytes = segment_bytes
+
+        pattern = re.compile(rf"{re.escape(prefix)}-(\d+)\.zz$")
+        numbers = [int(m.group(1)) for path in glob.glob(os.path.join(directory, f"{glob.escape(prefix)}-*.zz"))
+                   if (m := pattern.search(os.path.basename(path)))]
+        self._number = max(numbers, default=1)
+
+    def _segment(self):
+        return f"{self.prefix}-{self._number:06d}.zz"
+
+    def append(self, blobs):
+        """기록들을 현재 세그먼트 끝에 쓰고 디스크에 반영한 뒤 위치 목록 반환"""
+        path = os.path.join(self.directory, self._segment())
+        if os.path.exists(path) and os.path.getsize(path) >= self.segment_bytes:
+            self._number += 1
+            path = os.path.join(self.directory, self._segment())
+
+        locations = []
+        with open(path, "ab") as f:
+            offset = f.tell()
+            for blob in blobs:
+                f.write(blob)
+                locations.append((self._segment(), offset, len(blob)))
+                offset += len(blob)
+            f.flush()
+            # 색인이 가리키는 기록이 항상 파일에 있도록 색인 커밋 전에 반영
+            os.fsync(f.fileno())
+        return locations
+
+    def truncate(self, locations):
+        """append 로 쓴 기록들을 세그먼트에서 잘라냄 (색인 커밋에 실패했을 때)"""
+        segment, offset, _ = locations[0]
+        with open(os.path.join(self.directory, segment), "r+b") as f:
+            f.truncate(offset)
+            os.fsync(f.fileno())
+
+    def read(self, segment: str, offset: int, length: int):
+        with open(os.path.join(self.directory, os.path.basename(segment)), "rb") as f:
+            f.seek(offset)
+            return decompress_record(f.read(length))
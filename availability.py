@@ -0,0 +1,192 @@
+import bisect
+import math
+
+# 가능 시간은 30분 단위 칸으로 나눠 계산
+SLOT_SECONDS = 30 * 60
+
+# 가능 시간을 등록하고 추천받을 수 있는 기간 (일)
+HORIZON_DAYS = 28
+
+
+def slot_range(start: float, end: float, inside: bool = True):
+    """[start, end) 구간의 칸 번호 범위 (inside 면 구간 안에 완전히 들어가는 칸만, 아니면 걸치는 칸 모두)"""
+    if inside:
+        return math.ceil(start / SLOT_SECONDS), math.floor(end / SLOT_SECONDS)
+    return math.floor(start / SLOT_SECONDS), math.ceil(end / SLOT_SECONDS)
+
+
+def range_mask(first: int, last: int, base: int, width: int):
+    """칸 [first, last) 를 base 기준 비트로 표시한 정수 (width 칸 밖은 잘라냄)"""
+    first = max(first - base, 0)
+    last = min(last - base, width)
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+class AvailabilityStore:
+    """길드/사용자별 가능 시간 구간 (겹치거나 맞닿은 구간은 합쳐서 시작 시각순으로 보관)
+
+    구간이 바뀔 때마다 칸 단위 비트 정수도 다시 만들어 두므로, 조회할 때는 시프트 한 번으로 잘라 쓰기만 한다.
+    """
+
+    def __init__(self, writer=None):
+        self.writer = writer
+        self._intervals = {}  # (guild_id, user_id) -> [[start, end]] 정렬 리스트
+        self._bits = {}  # (guild_id, user_id) -> (기준 칸, 기준 칸부터의 가능 칸 비트)
+
+    def __len__(self):
+        return len(self._intervals)
+
+    def __contains__(self, key):
+        """(guild_id, user_id) 가 가능 시간을 등록했는지"""
+        return key in self._intervals
+
+    def load(self, rows):
+        """DB 에서 읽은 (guild_id, user_id, start, end) 행으로 복원"""
+        for guild_id, user_id, start, end in rows:
+            self._merge(self._intervals.setdefault((guild_id, user_id), []), start, end)
+        for key in self._intervals:
+            self._rebuild(key)
+
+    def intervals(self, guild_id, user_id):
+        return [tuple(interval) for interval in self._intervals.get((guild_id, user_id), ())]
+
+    def add(self, guild_id, user_id, start: float, end: float, now: float):
+        intervals = self._intervals.setdefault((guild_id, user_id), [])
+        self._merge(intervals, start, end)
+        self._changed(guild_id, user_id, intervals, now)
+
+    def remove(self, guild_id, user_id, start: float, end: float, now: float):
+        intervals = self._intervals.get((guild_id, user_id))
+        if intervals is None:
+            return
+        remaining = []
+        for s, e in intervals:
+            if e <= start or s >= end:
+                remaining.append([s, e])
+                continue
+            if s < start:
+                remaining.append([s, start])
+            if e > end:
+                remaining.append([end, e])
+        intervals[:] = remaining
+        self._changed(guild_id, user_id, intervals, now)
+
+    def bitset(self, guild_id, user_id, base: int, width: int):
+        """base 칸부터 width 칸 동안 가능한 칸을 비트로 표시한 정수 (bit i = base + i 번째 칸)"""
+        origin, bits = self._bits.get((guild_id, user_id), (base, 0))
+        bits = bits >> (base - origin) if base >= origin else bits << (origin - base)
+        return bits & ((1 << width) - 1)
+
+    def _changed(self, guild_id, user_id, intervals, now: float):
+        # 이미 지난 구간은 더 쓸 일이 없으므로 바뀔 때마다 정리
+        intervals[:] = [interval for interval in intervals if interval[1] > now]
+        if not intervals:
+            del self._intervals[(guild_id, user_id)]
+        self._rebuild((guild_id, user_id))
+        if self.writer is not None:
+            self.writer.save_availability(guild_id, user_id, [tuple(interval) for interval in intervals])
+
+    def _rebuild(self, key):
+        intervals = self._intervals.get(key)
+        if not intervals:
+            self._bits.pop(key, None)
+            return
+        origin = slot_range(intervals[0][0], intervals[0][0])[0]
+        width = slot_range(intervals[-1][1], intervals[-1][1])[0] - origin
+        bits = 0
+        for start, end in intervals:
+            bits |= range_mask(*slot_range(start, end), origin, width)
+        self._bits[key] = (origin, bits)
+
+    @staticmethod
+    def _merge(intervals, start: float, end: float):
+        index = bisect.bisect_left(intervals, [start, end])
+        # 앞 구간과 맞닿거나 겹치면 합침
+        if index and intervals[index - 1][1] >= start:
+            index -= 1
+            start = intervals[index][0]
+            end = max(end, intervals[index][1])
+        last = index
+        while last < len(intervals) and intervals[last][0] <= end:
+            end = max(end, intervals[last][1])
+            last += 1
+        intervals[index:last] = [[start, end]]
+
+
+def run_starts(bits: int, length: int):
+    """length 칸이 연속으로 비어 있는 시작 칸 (bit i 는 i ~ i+length-1 칸이 모두 1일 때 1)
+
+    시프트 폭을 두 배씩 늘려 가며 AND 하므로 O(log length) 번의 정수 연산으로 끝난다.
+    """
+    covered = 1
+    while covered < length and bits:
+        step = min(covered, length - covered)
+        bits &= bits >> step
+        covered += step
+    return bits
+
+
+def add_counts(planes, bits: int):
+    """칸별 인원 수를 비트 평면(planes[j] = 인원 수의 j 번째 비트)으로 누적 (모든 칸을 한 번에 더함)"""
+    carry = bits
+    for j, plane in enumerate(planes):
+        if not carry:
+            return
+        planes[j], carry = plane ^ carry, plane & carry
+    if carry:
+        planes.append(carry)
+
+
+def at_least(planes, threshold: int, full: int):
+    """인원 수가 threshold 이상인 칸 (평면을 높은 비트부터 threshold 와 비교)"""
+    if threshold <= 0:
+        return full
+    if threshold >= 1 << len(planes):
+        return 0
+    greater, equal = 0, full
+    for j in reversed(range(len(planes))):
+        if threshold >> j & 1:
+            equal &= planes[j]
+        else:
+            greater |= equal & planes[j]
+            equal &= full ^ planes[j]
+    return greater | equal
+
+
+def best_slots(free, min_count: int, length: int, width: int, limit: int = 5):
+    """min_count 명 이상이 length 칸 연속으로 가능한 시작 칸을 인원 많은 순, 이른 순으로 limit 개 반환
+
+    free: 사용자별 가능 칸 비트 정수 목록. 반환값: [(시작 칸 위치, 가능 인원)]
+    서로 겹치는 시간대는 하나만 추천한다.
+    """
+    full = (1 << max(width - length + 1, 0)) - 1
+    planes = []
+    for bits in free:
+        add_counts(planes, run_starts(bits, length) & full)
+
+    # 가장 많은 인원 수를 이분 탐색으로 찾고, 그 수부터 한 명씩 낮춰 가며 후보를 고름
+    low, high = min_count, len(free)
+    if not at_least(planes, low, full):
+        return []
+    while low < high:
+        middle = (low + high + 1) // 2
+        if at_least(planes, middle, full):
+            low = middle
+        else:
+            high = middle - 1
+
+    picked = []
+    blocked = 0
+    for count in range(low, min_count - 1, -1):
+        candidates = at_least(planes, count, full) & ~blocked
+        while candidates and len(picked) < limit:
+            slot = (candidates & -candidates).bit_length() - 1
+            picked.append((slot, count))
+            window = range_mask(slot - length + 1, slot + length, 0, width)
+            blocked |= window
+            candidates &= ~window
+        if len(picked) >= limit:
+            break
+    return picked
@@ -0,0 +1,250 @@
+"""네트워크 없이 봇 핸들러를 실행하기 위한 discord.Client / Interaction / User / Message 대역
+
+모든 API 호출은 FakeClient.calls 에 경로별로 기록되고, latency 만큼 지연된다.
+"""
+import asyncio
+import itertools
+import random
+from collections import Counter
+
+
+class FakeClient:
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, cached_users: bool = False, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.cached_users = cached_users  # True 면 get_user 가 게이트웨이 캐시처럼 사용자를 돌려줌
+        self.calls = Counter()
+        self.users = {}
+        self.channels = {}
+        self._ids = itertools.count(10 ** 17)
+        self._random = random.Random(seed)
+
+    def next_id(self):
+        return next(self._ids)
+
+    async def request(self, route: str):
+        """API 호출 한 번을 기록하고 지연 시간만큼 대기"""
+        self.calls[route] += 1
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        else:
+            await asyncio.sleep(0)
+
+    def reset_calls(self):
+        self.calls.clear()
+
+    # discord.Client 인터페이스
+    def get_user(self, user_id):
+        return self.user(user_id) if self.cached_users else None
+
+    async def fetch_user(self, user_id):
+        await self.request("GET /users/{id}")
+        return self.user(user_id)
+
+    def get_channel(self, channel_id):
+        return self.channel(channel_id)
+
+    def get_partial_messageable(self, channel_id):
+        return self.channel(channel_id)
+
+    # 테스트 데이터 생성
+    def user(self, user_id):
+        user = self.users.get(user_id)
+        if user is None:
+            user = self.users[user_id] = FakeUser(self, user_id)
+        return user
+
+    def channel(self, channel_id):
+        channel = self.channels.get(channel_id)
+        if channel is None:
+            channel = self.channels[channel_id] = FakeChannel(self, channel_id)
+        return channel
+
+
+class FakeMessage:
+    def __init__(self, client: FakeClient, channel, message_id: int, embeds=None):
+        self.client = client
+        self.channel = channel
+        self.id = message_id
+        # 실제 Discord 처럼 수신 측은 항상 새 임베드 객체를 받음
+        self.embeds = [e.copy() for e in embeds or ()]
+
+    async def edit(self, **kwargs):
+        await self.client.request("PATCH /channels/{id}/messages/{id}")
+        if kwargs.get("embed") is not None:
+            self.embeds = [kwargs["embed"].copy()]
+        return self
+
+
+class FakeChannel:
+    def __init__(self, client: FakeClient, channel_id: int):
+        self.client = client
+        self.id = channel_id
+        self.messages = {}
+
+    async def send(self, embed=None, view=None, **kwargs):
+        await self.client.request("POST /channels/{id}/messages")
+        message = FakeMessage(self.client, self, self.client.next_id(), [embed] if embed else None)
+        self.messages[message.id] = message
+        return message
+
+    async def fetch_message(self, message_id):
+        await self.client.request("GET /channels/{id}/messages/{id}")
+        return self.messages.get(message_id) or FakeMessage(self.client, self, message_id)
+
+    def get_partial_message(self, message_id):
+        return self.messages.get(message_id) or FakeMessage(self.client, self, message_id)
+
+
+class FakeUser:
+    def __init__(self, client: FakeClient, user_id: int, name: str | None = None):
+        self.client = client
+        self.id = user_id
+        self.name = name or f"user{user_id}"
+        self.bot = False
+        self.dm_channel = None
+
+    @property
+    def mention(self):
+        return f"<@{self.id}>"
+
+    async def create_dm(self):
+        await self.client.request("POST /users/@me/channels")
+        self.dm_channel = FakeChannel(self.client, self.client.next_id())
+        return self.dm_channel
+
+    async def send(self, **kwargs):
+        channel = self.dm_channel or await self.create_dm()
+        return await channel.send(**kwargs)
+
+
+class FakeRole:
+    def __init__(self, guild, role_id: int, members=()):
+        self.guild = guild
+        self.id = role_id
+        self._member_ids = [m.id for m in members]
+
+    @property
+    def members(self):
+        # discord.Role.members 처럼 길드 멤버 캐시에 있는 멤버만
+        return [self.guild._members[i] for i in self._member_ids if i in self.guild._members]
+
+
+class FakeGuild:
+    """멤버 캐시를 가진 길드 (chunk() 전까지는 캐시가 비어 있음)"""
+
+    def __init__(self, guild_id: int, client: FakeClient | None = None, members=(), chunked: bool = True):
+        self.id = guild_id
+        self.client = client
+        self._all_members = {m.id: m for m in members}
+        self._members = dict(self._all_members) if chunked else {}
+        self.chunked = chunked
+        self.roles = {}
+
+    @property
+    def members(self):
+        return list(self._members.values())
+
+    def add_role(self, role_id: int, members):
+        role = self.roles[role_id] = FakeRole(self, role_id, members)
+        return role
+
+    def get_role(self, role_id):
+        return self.roles.get(role_id)
+
+    async def chunk(self, cache: bool = True):
+        # 게이트웨이 REQUEST_GUILD_MEMBERS (1000명씩 응답)
+        for _ in range(max(1, -(-len(self._all_members) // 1000))):
+            await self.client.request("GATEWAY REQUEST_GUILD_MEMBERS chunk")
+        self._members = dict(self._all_members)
+        self.chunked = True
+        return self.members
+
+
+class FakeInteractionResponse:
+    def __init__(self, interaction):
+        self._interaction = interaction
+        self._done = False
+        self.last = None  # 마지막 응답 인자
+
+    def is_done(self):
+        return self._done
+
+    async def _respond(self, route):
+        if self._done:
+            raise RuntimeError("이미 응답한 interaction 입니다.")
+        self._done = True
+        await self._interaction.client.request(route)
+
+    async def send_message(self, content=None, embed=None, **kwargs):
+        await self._respond("POST /interactions/{id}/callback")
+        self.last = {'content': content, 'embed': embed, **kwargs}
+        channel = self._interaction.channel
+        message = FakeMessage(self._interaction.client, channel, self._interaction.client.next_id(),
+                              [embed] if embed else None)
+        channel.messages[message.id] = message
+        self._interaction._original = message
+
+    async def edit_message(self, embed=None, **kwargs):
+        await self._respond("POST /interactions/{id}/callback")
+        if self._interaction.message is not None and embed is not None:
+            self._interaction.message.embeds = [embed.copy()]
+        self.last = {'embed': embed, **kwargs}
+
+    async def defer(self, **kwargs):
+        await self._respond("POST /interactions/{id}/callback")
+        self.last = {'deferred': True, **kwargs}
+
+
+class FakeWebhook:
+    def __init__(self, interaction):
+        self._interaction = interaction
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        await self._interaction.client.request("POST /webhooks/{id}/{token}")
+        self.sent.append({'content': content, **kwargs})
+
+
+class FakeInteraction:
+    def __init__(self, client: FakeClient, user: FakeUser, channel: FakeChannel,
+                 guild: FakeGuild | None = None, message: FakeMessage | None = None):
+        self.client = client
+        self.id = client.next_id()
+        self.user = user
+        self.channel = channel
+        self.channel_id = channel.id if channel else None
+        self.guild = guild
+        self.guild_id = guild.id if guild else None
+        self.message = message
+        self.response = FakeInteractionResponse(self)
+        self.followup = FakeWebhook(self)
+        self._original = None
+
+    async def original_response(self):
+        await self.client.request("GET /webhooks/{id}/messages/@original")
+        return self._original
+
+    async def edit_original_response(self, embed=None, **kwargs):
+        await self.client.request("PATCH /webhooks/{id}/messages/@original")
+        if self._original is None:
+            self._original = FakeMessage(self.client, self.channel, self.client.next_id())
+            self.channel.messages[self._original.id] = self._original
+        if embed is not None:
+            self._original.embeds = [embed.copy()]
+        return self._original
+
+    async def delete_original_response(self):
+        await self.client.request("DELETE /webhooks/{id}/messages/@original")
+        self._original = None
+
+
+def install(bot_module, client: FakeClient):
+    """main 모듈의 Discord 접근 지점을 FakeClient 로 교체"""
+    bot_module.user_cache.bot = client
+    bot_module.message_updater.bot = client
+    # 반복 일정 다음 회차 게시처럼 bot 에서 직접 채널을 찾는 경우
+    bot_module.bot.get_channel = client.get_channel
+    bot_module.bot.get_partial_messageable = client.get_partial_messageable
+    return client
@@ -0,0 +1,81 @@
+"""날짜/시간 파서 벤치마크
+
+예전 방식(형식 4개를 순서대로 strptime, 실패마다 예외)과 dtparse 의 단일 정규식 파서를 비교한다.
+
+사용법:
+    python -m bench.parse
+    python -m bench.parse --count 200000
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+
+from dtparse import DateTimeParseError, get_timezone, parse_datetime
+
+LEGACY_FORMATS = ["%Y-%m-%d %H:%M", "%Y/%m/%d %H:%M", "%Y.%m.%d %H:%M", "%Y-%m-%d %H:%M:%S"]
+
+# 예전 형식별 입력 (뒤쪽 형식일수록 실패한 strptime 을 더 많이 거침) + 잘못된 입력
+CASES = {
+    'dash': "2026-01-25 18:00",
+    'slash': "2026/01/25 18:00",
+    'dot': "2026.01.25 18:00",
+    'seconds': "2026-01-25 18:00:30",
+    'invalid': "다음 달 언젠가",
+}
+KOREAN_CASES = {
+    'tomorrow': "내일 오후 6시 30분",
+    'weekday': "다음주 금요일 20:00",
+    'relative': "1시간 30분 후",
+}
+
+
+def legacy_parse(value):
+    for fmt in LEGACY_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def run(func, value, count):
+    started = time.perf_counter()
+    for _ in range(count):
+        func(value)
+    return (time.perf_counter() - started) / count * 1e9
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="날짜/시간 파서 벤치마크")
+    parser.add_argument("--count", type=int, default=50000, help="입력별 반복 횟수")
+    args = parser.parse_args(argv)
+
+    tz = get_timezone("Asia/Seoul")
+    now = datetime.now(tz)
+
+    def compiled(value):
+        try:
+            return parse_datetime(value, tz, now)
+        except DateTimeParseError:
+            return None
+
+    # 두 방식이 같은 시각을 돌려주는지 확인
+    for value in CASES.values():
+        old, new = legacy_parse(value), compiled(value)
+        assert (old is None) == (new is None) and (old is None or old.replace(tzinfo=tz) == new), value
+
+    print(f"입력별 {args.count}회, 1회당 ns")
+    print(f"{'입력':<10} {'strptime 반복':>14} {'dtparse':>10} {'배율':>6}")
+    for name, value in CASES.items():
+        old = run(legacy_parse, value, args.count)
+        new = run(compiled, value, args.count)
+        print(f"{name:<10} {old:>14.0f} {new:>10.0f} {old / new:>5.1f}x")
+    for name, value in KOREAN_CASES.items():
+        new = run(compiled, value, args.count)
+        print(f"{name:<10} {'(지원 안 함)':>14} {new:>10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
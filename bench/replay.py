@@ -0,0 +1,353 @@
+"""상호작용 기록 재생 벤치마크
+
+TRACE_PATH 로 기록한 (또는 --generate 로 만든) 상호작용을 가상 시계 위에서 --speed 배속으로 재생한다.
+마감 스케줄러와 봇의 현재 시각은 가상 시계를 따르고, 메시지 수정/알림 묶음 간격과 DM rate limit 도
+같은 배율로 줄여 실제 운영과 같은 순서로 동작하게 한다.
+
+보고 항목:
+    - 상호작용 종류별 핸들러 지연 (실제 시간)
+    - 알람/만료 지연 (가상 시간, 실제 시간으로 환산한 값도 함께)
+    - 경로별 API 호출 수
+
+사용법:
+    python -m bench.replay --generate trace.jsonl --schedules 300 --hours 6
+    python -m bench.replay trace.jsonl --speed 1000
+    python -m bench.replay trace.jsonl --latency 0.1 --json replay.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+# main 을 불러오기 전에 임시 DB 를 사용하도록 설정
+os.environ.setdefault("DB_PATH", os.path.join(tempfile.mkdtemp(prefix="schedule-replay-"), "replay.db"))
+os.environ.pop("TRACE_PATH", None)
+
+import main  # noqa: E402
+from bench.fake_discord import FakeClient, FakeGuild, FakeInteraction, FakeMessage, install  # noqa: E402
+from bench.run import percentile  # noqa: E402
+from event_trace import load_trace  # noqa: E402
+from fanout import DMFanout, TokenBucket  # noqa: E402
+from recurrence import RecurrenceRule  # noqa: E402
+from scheduler import DeadlineScheduler  # noqa: E402
+
+
+class VirtualClock:
+    """start 부터 실제 시간의 speed 배로 흐르는 epoch 시계"""
+
+    def __init__(self, start: float, speed: float):
+        self.start = start
+        self.speed = speed
+        self._origin = time.monotonic()
+
+    def __call__(self):
+        return self.start + (time.monotonic() - self._origin) * self.speed
+
+    async def sleep_until(self, when: float):
+        delay = (when - self()) / self.speed
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def generate_trace(path, schedules, hours, seed=0, guilds=20, users=500, recurring=0.0):
+    """실제 사용 패턴을 흉내낸 기록 생성 (생성 후 일정 시각까지 응답이 몰리고, 목록 조회가 섞임)"""
+    rng = random.Random(seed)
+    start = float(int(time.time()))
+    span = hours * 3600
+    user_ids = list(range(1, users + 1))
+    events = []
+
+    for alias in range(schedules):
+        created = start + rng.uniform(0, span * 0.8)
+        at = created + rng.choice((600, 1800, 3600, 2 * 3600, 6 * 3600)) * rng.uniform(0.5, 1.5)
+        guild = users + 1 + rng.randrange(guilds)
+        channel = guild * 10 + rng.randrange(3)
+        invitees = rng.sample(user_ids, rng.randint(2, 20))
+        schedule = f"s{alias}"
+        event = {'t': round(created, 3), 'k': "create", 'g': guild, 'c': channel, 'u': invitees[0], 's': schedule,
+                 'at': round(at), 'n': max(1, round(len(invitees) * rng.uniform(0.3, 0.8))), 'i': invitees}
+        if rng.random() < recurring:
+            event['r'] = RecurrenceRule('daily', round(at), 2, None, "Asia/Seoul").encode()
+        events.append(event)
+
+        # 대부분 초대 직후에 응답하고, 일부는 일정 직전까지 미룸
+        for user in invitees:
+            if rng.random() < 0.85:
+                delay = min(rng.expovariate(1 / 1200), (at - created) * 0.9)
+                events.append({'t': round(created + delay, 3), 'k': "click", 's': schedule, 'u': user,
+                               'a': int(rng.random() < 0.75)})
+
+    for _ in range(int(hours * 20)):
+        guild = users + 1 + rng.randrange(guilds)
+        events.append({'t': round(start + rng.uniform(0, span), 3), 'k': "list", 'g': guild,
+                       'c': guild * 10 + rng.randrange(3), 'st': rng.choice(("all", "all", "pending", "confirmed"))})
+
+    events.sort(key=lambda event: event['t'])
+    with open(path, "w", encoding="utf-8") as f:
+        for event in events:
+            f.write(json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n")
+    return len(events)
+
+
+class Replayer:
+    def __init__(self, events, args):
+        self.events = events
+        self.speed = args.speed
+        self.client = install(main, FakeClient(latency=args.latency / args.speed, jitter=args.jitter / args.speed))
+        self.clock = VirtualClock(events[0]['t'] - 1, args.speed)
+
+        self.guilds = {}
+        self.schedule_ids = {}  # 기록의 일정 번호 -> 재생 중 만든 일정 ID
+        self.creating = {}  # 기록의 일정 번호 -> 생성이 끝나면 완료되는 future
+        self.latencies = defaultdict(list)  # 종류 -> 핸들러 지연 (실제 초)
+        self.lateness = defaultdict(list)  # 마감 종류 -> 지연 (가상 초)
+        self.armed = {}  # (일정 ID, 마감 종류) -> 마감을 등록한 가상 시각
+        self.skipped = defaultdict(int)
+        self.tasks = set()
+
+        # 봇의 현재 시각과 마감 스케줄러를 가상 시계로 교체
+        main.clock = self.clock
+        main.deadline_scheduler = DeadlineScheduler(time_func=self.clock, speed=self.speed)
+
+        # 실제 시간 기준 간격과 rate limit 도 같은 배율로 줄임
+        main.message_updater.window /= self.speed
+        main.dm_digest.window /= self.speed
+        if args.throttle:
+            main.dm_fanout.global_bucket = TokenBucket(DMFanout.GLOBAL_RATE * self.speed)
+        else:
+            main.dm_fanout.global_bucket = TokenBucket(float('inf'))
+        main.dm_fanout.CHANNEL_RATE = DMFanout.CHANNEL_RATE * self.speed
+
+        self._originals = {name: getattr(main, name)
+                           for name in ("remind_schedule", "expire_schedule", "arm_reminder", "arm_expiry")}
+        main.remind_schedule = self.timed_deadline('reminder', main.remind_schedule, main.REMINDER_OFFSET)
+        main.expire_schedule = self.timed_deadline('expire', main.expire_schedule, 0)
+        main.arm_reminder = self.tracked_arm('reminder', main.arm_reminder)
+        main.arm_expiry = self.tracked_arm('expire', main.arm_expiry)
+
+    def tracked_arm(self, kind, arm):
+        def wrapper(schedule):
+            self.armed[(schedule.id, kind)] = self.clock()
+            return arm(schedule)
+        return wrapper
+
+    def timed_deadline(self, kind, callback, offset):
+        async def wrapper(schedule_id):
+            schedule = main.schedule_store.get(schedule_id)
+            if schedule is not None:
+                # 이미 지난 마감(일정 직전에 확정된 경우 등)은 등록 시각부터 잼
+                deadline = max(schedule.timestamp - offset, self.armed.pop((schedule_id, kind), 0))
+                self.lateness[kind].append(self.clock() - deadline)
+            return await callback(schedule_id)
+        return wrapper
+
+    def restore(self):
+        for name, function in self._originals.items():
+            setattr(main, name, function)
+
+    def guild(self, alias):
+        guild = self.guilds.get(alias)
+        if guild is None:
+            guild = self.guilds[alias] = FakeGuild(alias)
+        return guild
+
+    async def run(self):
+        main.deadline_scheduler.start()
+        started = time.perf_counter()
+        for event in self.events:
+            await self.clock.sleep_until(event['t'])
+            if event['k'] == "create":
+                # 같은 시각에 기록된 클릭이 생성보다 먼저 처리되지 않도록
+                self.creating[event['s']] = asyncio.get_running_loop().create_future()
+            task = asyncio.create_task(self.dispatch(event))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+        if self.tasks:
+            await asyncio.gather(*list(self.tasks))
+        events_done = time.perf_counter() - started
+
+        # 남은 알람/만료가 모두 처리될 때까지 가상 시간을 계속 흘려보냄
+        while len(main.deadline_scheduler) or main.deadline_scheduler.in_flight():
+            await asyncio.sleep(0.01)
+        await main.job_pipeline.drain()
+        await main.dm_digest.drain()
+        await main.message_updater.drain()
+        await main.schedule_writer.flush()
+        main.deadline_scheduler.stop()
+        return events_done, time.perf_counter() - started
+
+    async def dispatch(self, event):
+        handler = getattr(self, f"on_{event['k']}")
+        if event['k'] == "click" and event['s'] in self.creating:
+            await self.creating[event['s']]
+        started = time.perf_counter()
+        try:
+            await handler(event)
+        except Exception as e:
+            self.skipped[f"{event['k']}_error"] += 1
+            print(f"재생 오류 ({event['k']}): {e}")
+            return
+        self.latencies[event['k']].append(time.perf_counter() - started)
+
+    async def on_create(self, event):
+        try:
+            await self.create(event)
+        finally:
+            self.creating.pop(event['s']).set_result(None)
+
+    async def create(self, event):
+        interaction = FakeInteraction(self.client, self.client.user(event['u']), self.client.channel(event['c']),
+                                      self.guild(event['g']))
+        options = {}
+        if 'd' in event:
+            options['소요시간'] = max(1, event['d'] // 60)
+        rule = RecurrenceRule.decode(event.get('r'))
+        if rule is not None:
+            options['반복'] = rule.freq
+            options['반복횟수'] = rule.count
+            if rule.until is not None:
+                until = datetime.fromtimestamp(rule.until, ZoneInfo(rule.timezone) if rule.timezone else None)
+                options['반복종료'] = until.strftime("%Y-%m-%d")
+
+        schedule = await main.create_schedule.callback(
+            interaction,
+            제목=f"일정 {event['s']}",
+            설명="재생 일정",
+            날짜시간=datetime.fromtimestamp(event['at'], timezone.utc),
+            최소인원=event['n'],
+            참석자=" ".join(f"<@{user}>" for user in event['i']),
+            **options,
+        )
+        if schedule is None:
+            self.skipped['create_rejected'] += 1
+        else:
+            self.schedule_ids[event['s']] = schedule.id
+
+    async def on_click(self, event):
+        schedule_id = self.schedule_ids.get(event['s'])
+        if schedule_id is None:
+            # 기록 시작 전에 만들어졌거나 생성이 거절된 일정
+            self.skipped['click_unknown_schedule'] += 1
+            return
+
+        schedule = main.schedule_store.get(schedule_id)
+        channel = self.client.channel(event['u'])
+        embeds = [main.embed_renderer.invite(schedule)] if schedule is not None else []
+        interaction = FakeInteraction(self.client, self.client.user(event['u']), channel,
+                                      message=FakeMessage(self.client, channel, self.client.next_id(), embeds))
+        await main.handle_response(interaction, schedule_id, bool(event['a']))
+
+    async def on_list(self, event):
+        interaction = FakeInteraction(self.client, self.client.user(self.client.next_id()),
+                                      self.client.channel(event['c']), self.guild(event['g']))
+        await main.list_schedules.callback(interaction, 상태=event.get('st', 'all'))
+
+    def report(self, events_done, elapsed):
+        span = self.events[-1]['t'] - self.events[0]['t']
+        result = {
+            'events': len(self.events),
+            'events_by_kind': {kind: sum(1 for e in self.events if e['k'] == kind) for kind in ("create", "click", "list")},
+            'trace_span_s': round(span, 1),
+            'speed': self.speed,
+            'replay_s': round(events_done, 3),
+            'total_s': round(elapsed, 3),
+            'handlers': {
+                kind: {
+                    'count': len(samples),
+                    'p50_ms': round(percentile(samples, 0.5) * 1000, 3),
+                    'p99_ms': round(percentile(samples, 0.99) * 1000, 3),
+                    'max_ms': round(max(samples) * 1000, 3),
+                }
+                for kind, samples in sorted(self.latencies.items())
+            },
+            'deadlines': {
+                kind: {
+                    'count': len(samples),
+                    'p50_s': round(percentile(samples, 0.5), 3),
+                    'p99_s': round(percentile(samples, 0.99), 3),
+                    'max_s': round(max(samples), 3),
+                    # 가상 시간 지연을 배속으로 나눈 실제 처리 지연
+                    'p99_real_ms': round(percentile(samples, 0.99) / self.speed * 1000, 3),
+                }
+                for kind, samples in sorted(self.lateness.items())
+            },
+            'api_calls': dict(sorted(self.client.calls.items())),
+            'api_calls_total': sum(self.client.calls.values()),
+            'skipped': dict(self.skipped),
+        }
+        return result
+
+
+def print_report(result):
+    print(f"\n[replay] 이벤트 {result['events']}개 {result['events_by_kind']}, "
+          f"기록 구간 {result['trace_span_s']}초 → {result['speed']:g}배속 재생 {result['replay_s']}초 "
+          f"(마감 처리까지 {result['total_s']}초)")
+    for kind, stats in result['handlers'].items():
+        print(f"  {kind:<7} {stats['count']:>6}건  p50 {stats['p50_ms']}ms, p99 {stats['p99_ms']}ms, 최대 {stats['max_ms']}ms")
+    for kind, stats in result['deadlines'].items():
+        print(f"  {kind:<9} {stats['count']:>5}건  지연 p50 {stats['p50_s']}s, p99 {stats['p99_s']}s, "
+              f"최대 {stats['max_s']}s (가상 시간, p99 실제 {stats['p99_real_ms']}ms)")
+    print(f"  API 호출 {result['api_calls_total']}회: " +
+          ", ".join(f"{route} {count}" for route, count in result['api_calls'].items()))
+    if result['skipped']:
+        print(f"  건너뜀: {result['skipped']}")
+
+
+async def replay(events, args):
+    replayer = Replayer(events, args)
+    try:
+        events_done, elapsed = await replayer.run()
+    finally:
+        replayer.restore()
+    await main.job_pipeline.close()
+    await main.schedule_writer.close()
+    return replayer.report(events_done, elapsed)
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="상호작용 기록 재생 벤치마크")
+    parser.add_argument("trace", nargs="?", help="재생할 기록 파일 (TRACE_PATH 로 기록한 JSONL)")
+    parser.add_argument("--generate", metavar="PATH", help="기록 파일 대신 가상 사용 패턴을 만들어 PATH 에 저장")
+    parser.add_argument("--schedules", type=int, default=300, help="--generate 로 만들 일정 수")
+    parser.add_argument("--hours", type=float, default=6, help="--generate 로 만들 기록 구간 (시간)")
+    parser.add_argument("--recurring", type=float, default=0.0, help="--generate 에서 반복 일정 비율")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--speed", type=float, default=1000, help="가상 시계 배속")
+    parser.add_argument("--latency", type=float, default=0.0, help="API 호출당 지연 (가상 시간, 초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="API 호출당 추가 무작위 지연 (가상 시간, 초)")
+    parser.add_argument("--throttle", action="store_true", help="Discord 전역 rate limit 을 배속에 맞춰 적용")
+    parser.add_argument("--json", help="결과를 JSON 으로 저장할 경로")
+    args = parser.parse_args(argv)
+
+    if args.generate:
+        count = generate_trace(args.generate, args.schedules, args.hours, args.seed, recurring=args.recurring)
+        print(f"이벤트 {count}개를 {args.generate} 에 저장했습니다.")
+        if not args.trace:
+            return 0
+    if not args.trace:
+        parser.error("재생할 기록 파일을 지정하거나 --generate 를 사용하세요.")
+
+    events = load_trace(args.trace)
+    if not events:
+        print("재생할 이벤트가 없습니다.")
+        return 1
+
+    result = asyncio.run(replay(events, args))
+    print_report(result)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"\n결과를 {args.json} 에 저장했습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
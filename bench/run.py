@@ -0,0 +1,506 @@
+"""오프라인 벤치마크
+
+FakeClient 를 붙인 상태에서 주요 핸들러를 대량으로 실행하고
+처리량, p50/p99 지연, API 호출 수, 시나리오별 최대 메모리 사용량(tracemalloc)을 보고한다.
+
+사용법:
+    python -m bench.run                      # 모든 시나리오
+    python -m bench.run clicks reminders     # 일부 시나리오만
+    python -m bench.run --latency 0.05 --json bench.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# main 을 불러오기 전에 임시 DB 를 사용하도록 설정
+os.environ.setdefault("DB_PATH", os.path.join(tempfile.mkdtemp(prefix="schedule-bench-"), "bench.db"))
+
+import main  # noqa: E402
+from bench.fake_discord import FakeClient, FakeGuild, FakeInteraction, FakeMessage, install  # noqa: E402
+from fanout import TokenBucket  # noqa: E402
+from models import Schedule  # noqa: E402
+
+GUILD_ID = 1
+TRACE_MEMORY = True
+
+
+def percentile(samples, q):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class Result:
+    def __init__(self, name, ops, elapsed, latencies, calls, peak_memory, extra=None):
+        self.name = name
+        self.ops = ops
+        self.elapsed = elapsed
+        self.latencies = latencies
+        self.calls = dict(calls)
+        self.peak_memory = peak_memory
+        self.extra = extra or {}
+
+    def as_dict(self):
+        return {
+            'scenario': self.name,
+            'ops': self.ops,
+            'elapsed_s': round(self.elapsed, 4),
+            'throughput_ops_s': round(self.ops / self.elapsed, 1) if self.elapsed else None,
+            'p50_ms': round(percentile(self.latencies, 0.50) * 1000, 3),
+            'p99_ms': round(percentile(self.latencies, 0.99) * 1000, 3),
+            'api_calls': self.calls,
+            'api_calls_total': sum(self.calls.values()),
+            'peak_memory_mb': round(self.peak_memory / 1024 / 1024, 2) if self.peak_memory is not None else None,
+            **self.extra,
+        }
+
+    def print(self):
+        d = self.as_dict()
+        print(f"\n[{d['scenario']}] {d['ops']}건 / {d['elapsed_s']}초 ({d['throughput_ops_s']} ops/s)")
+        memory = f"{d['peak_memory_mb']}MB" if d['peak_memory_mb'] is not None else "-"
+        print(f"  지연 p50 {d['p50_ms']}ms, p99 {d['p99_ms']}ms, 최대 메모리 {memory}")
+        print(f"  API 호출 {d['api_calls_total']}회: " +
+              ", ".join(f"{route} {count}" for route, count in sorted(d['api_calls'].items())))
+        for key, value in self.extra.items():
+            print(f"  {key}: {value}")
+
+
+def reset_state():
+    """시나리오 사이에 봇 상태 초기화"""
+    for schedule in list(main.schedule_store):
+        main.disarm_schedule(schedule.id)
+        main.message_updater.forget(schedule.id)
+        main.embed_renderer.forget(schedule.id)
+        main.schedule_store.remove(schedule.id)
+
+
+def make_schedule(client: FakeClient, channel_id, invitees, min_participants, starts_in, activated=False):
+    channel = client.channel(channel_id)
+    message = FakeMessage(client, channel, client.next_id())
+    channel.messages[message.id] = message
+
+    schedule_id = f"{GUILD_ID}_{channel_id}_{client.next_id()}"
+    schedule = Schedule(
+        id=schedule_id,
+        guild_id=GUILD_ID,
+        channel_id=channel_id,
+        title=f"일정 {schedule_id}",
+        description="벤치마크 일정",
+        datetime_text="bench",
+        timestamp=time.time() + starts_in,
+        min_participants=min_participants,
+        mentioned_users=invitees,
+        creator_id=invitees[0],
+        creator_name="bench",
+        activated=activated,
+        message_id=message.id,
+    )
+    main.schedule_store.add(schedule)
+    if activated:
+        for user_id in invitees:
+            main.schedule_store.record_response(schedule, user_id, True)
+        main.arm_reminder(schedule)
+    else:
+        main.arm_expiry(schedule)
+    return schedule
+
+
+async def measure(name, client, run, **extra):
+    """run() 이 돌려준 (작업 수, 지연 목록) 으로 결과 생성"""
+    client.reset_calls()
+    # 프로세스 최대 RSS 는 앞선 시나리오의 최댓값이 남아 있으므로, 시나리오마다 tracemalloc 최댓값을 새로 잼
+    if TRACE_MEMORY:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+    started = time.perf_counter()
+    ops, latencies, *more = await run()
+
+    # 후속 작업, 병합 대기 중인 메시지 수정과 DB 기록까지 포함
+    await main.job_pipeline.drain()
+    await main.dm_digest.drain()
+    await main.message_updater.drain()
+    await main.schedule_writer.flush()
+
+    elapsed = time.perf_counter() - started
+    peak = None
+    if TRACE_MEMORY:
+        # 시나리오 실행 중 파이썬 힙 최대 사용량
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return Result(name, ops, elapsed, latencies, client.calls, peak, {**extra, **(more[0] if more else {})})
+
+
+async def scenario_create(client, args):
+    """/일정생성 을 args.creates 번 실행 (일정마다 args.invitees 명 초대)"""
+    creator = client.user(client.next_id())
+    guild = FakeGuild(GUILD_ID)
+    when = time.strftime("%Y-%m-%d %H:%M", time.localtime(time.time() + 86400))
+    users = [client.next_id() for _ in range(max(1000, args.invitees * 4))]
+    rng = random.Random(1)
+
+    count = args.creates
+
+    async def run():
+        latencies = []
+        for i in range(count):
+            invitees = rng.sample(users, args.invitees)
+            interaction = FakeInteraction(client, creator, client.channel(i % args.channels + 1), guild)
+            started = time.perf_counter()
+            await main.create_schedule.callback(
+                interaction,
+                제목=f"일정 {i}",
+                설명="벤치마크 일정",
+                날짜시간=await main.DateTimeTransformer().transform(interaction, when),
+                최소인원=args.invitees,
+                참석자=" ".join(f"<@{u}>" for u in invitees),
+            )
+            latencies.append(time.perf_counter() - started)
+        return count, latencies
+
+    return await measure("create_schedule", client, run)
+
+
+async def scenario_roles(client, args):
+    """멤버 캐시가 빈 길드에서 역할 멘션(args.role_size 명)으로 /일정생성 을 동시에 args.role_creates 번 실행"""
+    members = [client.user(client.next_id()) for _ in range(args.role_size)]
+    guild = FakeGuild(GUILD_ID + 1, client, members, chunked=False)
+    role = guild.add_role(client.next_id(), members)
+    creator = client.user(client.next_id())
+    when = time.strftime("%Y-%m-%d %H:%M", time.localtime(time.time() + 86400))
+    chunks_before = main.mention_resolver.chunk_requests
+
+    async def create(i, latencies):
+        interaction = FakeInteraction(client, creator, client.channel(i % args.channels + 1), guild)
+        started = time.perf_counter()
+        await main.create_schedule.callback(
+            interaction,
+            제목=f"역할 일정 {i}",
+            설명="벤치마크 일정",
+            날짜시간=await main.DateTimeTransformer().transform(interaction, when),
+            최소인원=1,
+            # 역할 멤버와 겹치는 개별 멘션은 한 번만 초대되어야 함
+            참석자=f"<@&{role.id}> <@{members[0].id}> <@{members[1].id}>",
+        )
+        latencies.append(time.perf_counter() - started)
+
+    async def run():
+        latencies = []
+        await asyncio.gather(*(create(i, latencies) for i in range(args.role_creates)))
+        invitees = {len(s.mentioned_users) for s in main.schedule_store}
+        return args.role_creates, latencies, {
+            'chunk_requests': main.mention_resolver.chunk_requests - chunks_before,
+            'invitees_per_schedule': sorted(invitees),
+        }
+
+    return await measure("create_schedule (role)", client, run)
+
+
+async def scenario_clicks(client, args):
+    """args.clicks 번의 참석/불참 버튼 클릭 (일정 하나당 초대 인원만큼 클릭)"""
+    per_schedule = args.invitees * 10
+    schedules = []
+    for i in range(max(1, args.clicks // per_schedule)):
+        invitees = [client.next_id() for _ in range(per_schedule)]
+        schedules.append(make_schedule(client, i % args.channels + 1, invitees,
+                                       min_participants=per_schedule // 2, starts_in=86400))
+
+    clicks = [(s, u) for s in schedules for u in s.mentioned_users]
+    random.Random(2).shuffle(clicks)
+    invite = main.embed_renderer.invite(schedules[0])
+
+    async def click(schedule, user_id, latencies):
+        channel = client.channel(user_id)
+        interaction = FakeInteraction(client, client.user(user_id), channel,
+                                      message=FakeMessage(client, channel, client.next_id(), [invite]))
+        started = time.perf_counter()
+        await main.handle_response(interaction, schedule.id, random.random() < 0.7)
+        latencies.append(time.perf_counter() - started)
+
+    async def run():
+        latencies = []
+        # 동시 클릭을 흉내내기 위해 일정 크기씩 묶어서 동시에 실행
+        for start in range(0, len(clicks), args.concurrency):
+            await asyncio.gather(*(click(s, u, latencies) for s, u in clicks[start:start + args.concurrency]))
+        return len(clicks), latencies
+
+    return await measure("handle_response", client, run, schedules=len(schedules))
+
+
+async def scenario_list(client, args):
+    """args.schedules 개 일정이 있을 때 채널마다 /일정목록 실행"""
+    per_channel = max(1, min(20, args.schedules // args.channels))
+    for i in range(args.schedules):
+        invitees = [client.next_id() for _ in range(args.invitees)]
+        make_schedule(client, i % args.channels + 1, invitees, min_participants=args.invitees, starts_in=86400)
+
+    user = client.user(client.next_id())
+
+    async def run():
+        latencies = []
+        for _ in range(args.repeat):
+            for channel_id in range(1, args.channels + 1):
+                interaction = FakeInteraction(client, user, client.channel(channel_id), FakeGuild(GUILD_ID))
+                started = time.perf_counter()
+                await main.list_schedules.callback(interaction)
+                latencies.append(time.perf_counter() - started)
+        return len(latencies), latencies
+
+    return await measure("list_schedules", client, run, schedules=args.schedules, per_channel=per_channel)
+
+
+async def scenario_reminders(client, args):
+    """args.reminders 개의 확정 일정이 같은 시각에 10분 전 알람을 보냄"""
+    lateness = []
+    original = main.send_reminder
+
+    async def timed_reminder(schedule):
+        lateness.append(time.time() - (schedule.timestamp - main.REMINDER_OFFSET))
+        return await original(schedule)
+
+    main.send_reminder = timed_reminder
+    lead = 1.0
+    try:
+        for i in range(args.reminders):
+            invitees = [client.next_id() for _ in range(args.invitees)]
+            make_schedule(client, i % args.channels + 1, invitees, min_participants=1,
+                          starts_in=main.REMINDER_OFFSET + lead, activated=True)
+        await main.schedule_writer.flush()
+
+        async def run():
+            while len(lateness) < args.reminders or len(main.deadline_scheduler):
+                await asyncio.sleep(0.05)
+            # 알람 DM 전송이 끝날 때까지 대기
+            while main.deadline_scheduler.in_flight():
+                await asyncio.sleep(0.05)
+            return len(lateness), lateness, {
+                'lateness_p50_ms': round(percentile(lateness, 0.5) * 1000, 1),
+                'lateness_max_ms': round(max(lateness) * 1000, 1),
+            }
+
+        return await measure("reminders", client, run, note="지연 = 알람 마감 시각부터 전송 시작까지")
+    finally:
+        main.send_reminder = original
+
+
+async def scenario_digest(client, args):
+    """args.reminders 개의 확정 일정이 같은 시각에 알람을 보내되, 참석자는 args.digest_users 명 안에서 겹침"""
+    users = [client.next_id() for _ in range(args.digest_users)]
+    rng = random.Random(5)
+    merged_before = main.dm_digest.merged
+    lead = 1.0
+
+    for i in range(args.reminders):
+        make_schedule(client, i % args.channels + 1, rng.sample(users, min(args.invitees, len(users))),
+                      min_participants=1, starts_in=main.REMINDER_OFFSET + lead, activated=True)
+    await main.schedule_writer.flush()
+    notifications = args.reminders * min(args.invitees, len(users))
+
+    async def run():
+        started = time.perf_counter()
+        while len(main.deadline_scheduler) or main.deadline_scheduler.in_flight():
+            await asyncio.sleep(0.05)
+        await main.dm_digest.drain()
+        return notifications, [time.perf_counter() - started], {
+            'digest_window_s': main.dm_digest.window,
+            'dms_merged': main.dm_digest.merged - merged_before,
+        }
+
+    return await measure("digest", client, run, note="알림 수 대비 실제 DM 전송 수는 API 호출 수 참고")
+
+
+async def scenario_priority(client, args):
+    """대량 초대 DM(args.bulk_invitees 명 x args.bulk_creates 개)이 전송되는 도중 args.priority_reminders 개의 알람이 도래"""
+    latency = client.latency
+    client.latency = max(latency, args.priority_latency)
+    delivered = []
+    original = main.send_reminder
+
+    async def timed_reminder(schedule):
+        await original(schedule)
+        delivered.append(time.time() - (schedule.timestamp - main.REMINDER_OFFSET))
+
+    main.send_reminder = timed_reminder
+    try:
+        lead = 0.3
+        for i in range(args.bulk_creates):
+            invitees = [client.next_id() for _ in range(args.bulk_invitees)]
+            schedule = make_schedule(client, i % args.channels + 1, invitees, min_participants=len(invitees),
+                                     starts_in=86400)
+            await main.job_pipeline.submit(main.BULK, main.send_invites, schedule)
+        for i in range(args.priority_reminders):
+            invitees = [client.next_id() for _ in range(args.invitees)]
+            make_schedule(client, i % args.channels + 1, invitees, min_participants=1,
+                          starts_in=main.REMINDER_OFFSET + lead, activated=True)
+
+        async def run():
+            started = time.perf_counter()
+            while len(delivered) < args.priority_reminders:
+                await asyncio.sleep(0.01)
+            reminders_done = time.perf_counter() - started
+            await main.job_pipeline.drain()
+            return args.priority_reminders, delivered, {
+                'reminder_delivery_p50_ms': round(percentile(delivered, 0.5) * 1000, 1),
+                'reminder_delivery_max_ms': round(max(delivered) * 1000, 1),
+                'reminders_done_s': round(reminders_done, 3),
+                'bulk_done_s': round(time.perf_counter() - started, 3),
+            }
+
+        return await measure("priority", client, run, note="지연 = 알람 마감 시각부터 알람 DM 전송 완료까지")
+    finally:
+        main.send_reminder = original
+        client.latency = latency
+
+
+async def scenario_suggest(client, args):
+    """args.suggest_users 명이 각자 가능 시간을 등록한 뒤 전원을 멘션해 /시간추천 을 args.repeat 번 실행"""
+    rng = random.Random(1)
+    guild = FakeGuild(GUILD_ID)
+    users = [client.next_id() for _ in range(args.suggest_users)]
+    now = time.time()
+    for user_id in users:
+        # 사람마다 앞으로 4주 동안 1~4시간짜리 가능 시간 20개
+        for _ in range(20):
+            start = now + rng.uniform(0, main.HORIZON_DAYS * 86400)
+            main.availability_store.add(GUILD_ID, user_id, start, start + rng.uniform(3600, 4 * 3600), now)
+
+    creator = client.user(client.next_id())
+    mentions = " ".join(f"<@{u}>" for u in users)
+
+    async def run():
+        latencies = []
+        for _ in range(args.repeat):
+            interaction = FakeInteraction(client, creator, client.channel(1), guild)
+            started = time.perf_counter()
+            await main.suggest_time.callback(interaction, 참석자=mentions, 최소인원=max(1, len(users) // 20),
+                                             소요시간=120, 기간=main.HORIZON_DAYS)
+            latencies.append(time.perf_counter() - started)
+        return len(latencies), latencies
+
+    return await measure("suggest_time", client, run, users=len(users), days=main.HORIZON_DAYS)
+
+
+async def scenario_buckets(client, args):
+    """args.bucket_users 명에게 DM 을 보낸 뒤, 채널 버킷이 다시 가득 차면 정리되는지 확인"""
+    fanout = main.dm_fanout
+    users = [client.next_id() for _ in range(args.bucket_users)]
+    refill = fanout.CHANNEL_BURST / fanout.CHANNEL_RATE
+
+    def build(user_id):
+        return {'content': "벤치마크 DM"}
+
+    async def run():
+        started = time.perf_counter()
+        await fanout.send(users, build, "버킷 벤치마크")
+        latencies = [time.perf_counter() - started]
+        after_send = len(fanout._channel_buckets)
+
+        # 다시 가득 찰 때까지 기다린 뒤 한 명에게 보내면, 그 사람 버킷만 남아야 함
+        await asyncio.sleep(refill + 0.1)
+        started = time.perf_counter()
+        await fanout.send([users[0]], build, "버킷 벤치마크")
+        latencies.append(time.perf_counter() - started)
+        return len(users) + 1, latencies, {
+            'buckets_after_send': after_send,
+            'buckets_after_refill': len(fanout._channel_buckets),
+        }
+
+    return await measure("channel_buckets", client, run, note=f"버킷이 가득 차는 시간 {refill}초 대기 포함")
+
+
+SCENARIOS = {
+    'create': scenario_create,
+    'roles': scenario_roles,
+    'clicks': scenario_clicks,
+    'list': scenario_list,
+    'reminders': scenario_reminders,
+    'digest': scenario_digest,
+    'priority': scenario_priority,
+    'suggest': scenario_suggest,
+    'buckets': scenario_buckets,
+}
+
+
+async def run_all(args):
+    client = install(main, FakeClient(latency=args.latency, jitter=args.jitter))
+    if not args.throttle:
+        # 봇 내부 처리 비용만 측정하도록 DM rate limit 해제
+        main.dm_fanout.global_bucket = TokenBucket(float('inf'))
+    main.message_updater.window = args.edit_window
+    main.dm_digest.window = args.digest_window
+    main.deadline_scheduler.start()
+
+    results = []
+    for name in args.scenarios or SCENARIOS:
+        reset_state()
+        result = await SCENARIOS[name](client, args)
+        result.print()
+        results.append(result.as_dict())
+
+    main.deadline_scheduler.stop()
+    await main.job_pipeline.close()
+    await main.schedule_writer.close()
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="일정 봇 오프라인 벤치마크")
+    parser.add_argument("scenarios", nargs="*", help=f"실행할 시나리오 {list(SCENARIOS)} (기본: 전체)")
+    parser.add_argument("--creates", type=int, default=1000)
+    parser.add_argument("--schedules", type=int, default=10000)
+    parser.add_argument("--role-size", type=int, default=300, help="roles 시나리오의 역할 인원")
+    parser.add_argument("--role-creates", type=int, default=5)
+    parser.add_argument("--clicks", type=int, default=100000)
+    parser.add_argument("--reminders", type=int, default=1000)
+    parser.add_argument("--invitees", type=int, default=5)
+    parser.add_argument("--channels", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3, help="/일정목록 반복 횟수")
+    parser.add_argument("--concurrency", type=int, default=100, help="동시에 처리할 클릭 수")
+    parser.add_argument("--latency", type=float, default=0.0, help="API 호출당 지연 (초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="API 호출당 추가 무작위 지연 (초)")
+    parser.add_argument("--edit-window", type=float, default=0.2, help="메시지 수정 병합 간격 (초)")
+    parser.add_argument("--digest-window", type=float, default=0.2, help="알림 DM 묶음 간격 (초, 0 이면 묶지 않음)")
+    parser.add_argument("--digest-users", type=int, default=200, help="digest 시나리오의 참석자 수")
+    parser.add_argument("--bulk-invitees", type=int, default=1000, help="priority 시나리오의 일정당 초대 인원")
+    parser.add_argument("--bulk-creates", type=int, default=5, help="priority 시나리오의 대량 초대 일정 수")
+    parser.add_argument("--priority-reminders", type=int, default=50, help="priority 시나리오의 알람 일정 수")
+    parser.add_argument("--priority-latency", type=float, default=0.005,
+                        help="priority 시나리오의 최소 API 호출 지연 (초)")
+    parser.add_argument("--suggest-users", type=int, default=300, help="suggest 시나리오의 참석자 수")
+    parser.add_argument("--bucket-users", type=int, default=1000, help="buckets 시나리오의 DM 수신자 수")
+    parser.add_argument("--throttle", action="store_true", help="Discord rate limit 을 그대로 적용")
+    parser.add_argument("--no-trace-memory", action="store_true",
+                        help="메모리 측정 생략 (tracemalloc 부담 없이 처리량만 측정)")
+    parser.add_argument("--json", help="결과를 JSON 으로 저장할 경로")
+    parser.add_argument("--metrics", help="실행 후 봇 지표(Prometheus 텍스트)를 저장할 경로")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"알 수 없는 시나리오: {', '.join(unknown)}")
+    return args
+
+
+def main_cli(argv=None):
+    global TRACE_MEMORY
+    args = parse_args(argv)
+    TRACE_MEMORY = not args.no_trace_memory
+    results = asyncio.run(run_all(args))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n결과를 {args.json} 에 저장했습니다.")
+    if args.metrics:
+        with open(args.metrics, "w", encoding="utf-8") as f:
+            f.write(main.registry.render())
+        print(f"\n지표를 {args.metrics} 에 저장했습니다.")
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,169 @@
+"""샤드 여러 개를 별도 프로세스로 띄워 같은 SQLite 파일을 공유하는 오프라인 시뮬레이션
+
+가짜 게이트웨이는 실제 Discord 처럼 길드 이벤트(/일정생성)를 (guild_id >> 22) % 샤드 수 로,
+DM 버튼 클릭은 모두 0번 샤드로 보낸다. 다른 프로세스 소유 일정의 클릭은 공유 DB 를 통해 전달된다.
+
+사용법:
+    python -m bench.shards --shards 4 --guilds 64 --per-guild 10
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+from sharding import guild_shard
+
+
+def make_guild_ids(count, seed=3):
+    """임의의 생성 시각을 가진 길드 snowflake"""
+    rng = random.Random(seed)
+    return [(rng.getrandbits(40) << 22) | rng.getrandbits(22) for _ in range(count)]
+
+
+def owned_guilds(guild_ids, shard_id, shard_count):
+    return [g for g in guild_ids if guild_shard(g, shard_count) == shard_id]
+
+
+def worker(shard_id, args, db_path, guild_ids, barrier, results):
+    # main 을 불러오기 전에 이 프로세스가 맡을 샤드 지정
+    os.environ.update(DB_PATH=db_path, SHARD_COUNT=str(args.shards), SHARD_IDS=str(shard_id), METRICS_PORT="0")
+    results.put(asyncio.run(run_shard(shard_id, args, guild_ids, barrier)))
+
+
+async def run_shard(shard_id, args, guild_ids, barrier):
+    import discord
+    import main
+    from bench.fake_discord import FakeClient, FakeGuild, FakeInteraction, FakeMessage, install
+    from fanout import TokenBucket
+
+    client = install(main, FakeClient(latency=args.latency, seed=shard_id))
+    main.dm_fanout.global_bucket = TokenBucket(float('inf'))
+    main.message_updater.window = 0.2
+    main.deadline_scheduler.start()
+    poller = asyncio.create_task(main.poll_forwarded_responses())
+
+    # 1) 맡은 길드의 일정 생성 (가짜 게이트웨이가 길드 이벤트를 소유 샤드로만 전달)
+    mine = owned_guilds(guild_ids, shard_id, args.shards)
+    when = time.strftime("%Y-%m-%d %H:%M", time.localtime(time.time() + 86400))
+    started = time.perf_counter()
+    user_ids = iter(range((shard_id + 1) * 10 ** 15, (shard_id + 2) * 10 ** 15))
+    for guild_id in mine:
+        guild = FakeGuild(guild_id)
+        creator = client.user(client.next_id())
+        for i in range(args.per_guild):
+            invitees = [next(user_ids) for _ in range(args.invitees)]
+            interaction = FakeInteraction(client, creator, client.channel(guild_id + i % 3), guild)
+            await main.create_schedule.callback(
+                interaction,
+                제목=f"{guild_id} 일정 {i}",
+                설명="샤드 벤치마크 일정",
+                날짜시간=await main.DateTimeTransformer().transform(interaction, when),
+                최소인원=args.invitees,
+                참석자=" ".join(f"<@{u}>" for u in invitees),
+            )
+    await main.schedule_writer.flush()
+    create_elapsed = time.perf_counter() - started
+    await asyncio.to_thread(barrier.wait)
+
+    # 2) DM 버튼 클릭은 모두 0번 샤드로 들어옴
+    clicks = forwarded = 0
+    started = time.perf_counter()
+    if main.shard_ownership.receives_dms:
+        rows = await asyncio.to_thread(
+            main.schedule_writer.database.conn.execute("SELECT id, mentioned_users FROM schedules").fetchall
+        )
+        pairs = [(schedule_id, int(u)) for schedule_id, users in rows for u in users.split(",")]
+        random.Random(4).shuffle(pairs)
+        invite = [discord.Embed(title="📅 새로운 일정 초대")]
+        for schedule_id, user_id in pairs:
+            channel = client.channel(user_id)
+            interaction = FakeInteraction(client, client.user(user_id), channel,
+                                          message=FakeMessage(client, channel, client.next_id(), invite))
+            forwarded += not main.shard_ownership.owns_schedule(schedule_id)
+            await main.handle_response(interaction, schedule_id, True)
+            clicks += 1
+        await main.schedule_writer.flush()
+
+    # 3) 맡은 일정이 모두 확정될 때까지 전달된 응답 처리
+    deadline = time.monotonic() + args.timeout
+    while time.monotonic() < deadline:
+        if all(s.activated for s in main.schedule_store):
+            break
+        await asyncio.sleep(0.05)
+    settle_elapsed = time.perf_counter() - started
+
+    poller.cancel()
+    await main.message_updater.drain()
+    await main.schedule_writer.flush()
+    main.deadline_scheduler.stop()
+
+    result = {
+        'shard': shard_id,
+        'guilds': len(mine),
+        'schedules': len(main.schedule_store),
+        'activated': sum(s.activated for s in main.schedule_store),
+        'create_s': round(create_elapsed, 3),
+        'clicks': clicks,
+        'forwarded_out': forwarded,
+        'settle_s': round(settle_elapsed, 3),
+        'api_calls': sum(client.calls.values()),
+    }
+    await main.schedule_writer.close()
+    return result
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="샤드 다중 프로세스 시뮬레이션")
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--guilds", type=int, default=64)
+    parser.add_argument("--per-guild", type=int, default=10, help="길드당 생성할 일정 수")
+    parser.add_argument("--invitees", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="API 호출당 지연 (초)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="전달된 응답 처리 대기 한도 (초)")
+    return parser.parse_args(argv)
+
+
+def main_cli(argv=None):
+    args = parse_args(argv)
+    db_path = os.path.join(tempfile.mkdtemp(prefix="schedule-shards-"), "shards.db")
+    guild_ids = make_guild_ids(args.guilds)
+
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(args.shards)
+    results = ctx.Queue()
+    processes = [ctx.Process(target=worker, args=(i, args, db_path, guild_ids, barrier, results))
+                 for i in range(args.shards)]
+
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+    shard_results = sorted((results.get() for _ in processes), key=lambda r: r['shard'])
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - started
+
+    print(f"\n[shards] 프로세스 {args.shards}개 / 길드 {args.guilds}개 / 일정 {args.guilds * args.per_guild}개 "
+          f"/ {elapsed:.2f}초")
+    for r in shard_results:
+        print(f"  샤드 {r['shard']}: 길드 {r['guilds']}개, 일정 {r['activated']}/{r['schedules']} 확정, "
+              f"생성 {r['create_s']}초, 클릭 {r['clicks']}회 (전달 {r['forwarded_out']}회), "
+              f"처리 완료까지 {r['settle_s']}초, API 호출 {r['api_calls']}회")
+
+    # 공유 DB 기준 최종 상태 확인
+    conn = sqlite3.connect(db_path)
+    total, activated = conn.execute("SELECT COUNT(*), SUM(activated) FROM schedules").fetchone()
+    pending = conn.execute("SELECT COUNT(*) FROM forwarded_responses").fetchone()[0]
+    conn.close()
+    expected = args.guilds * args.per_guild
+    ok = total == expected and activated == expected and pending == 0
+    print(f"  DB: 일정 {total}개 중 {activated or 0}개 확정, 남은 전달 응답 {pending}건 → {'OK' if ok else 'FAIL'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
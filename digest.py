@@ -0,0 +1,145 @@
+import asyncio
+from collections import defaultdict
+
+import discord
+
+from embeds import EMBED_TOTAL_LIMIT, FIELD_VALUE_LIMIT, MAX_FIELDS
+from jobs import KIND_PRIORITY, NORMAL
+
+# 메시지 하나에 넣을 수 있는 임베드 수
+MAX_EMBEDS = 10
+
+# 묶음 DM 항목 제목 (알림 종류별)
+DIGEST_HEADINGS = {
+    'reminder': "⏰ 곧 시작",
+    'activation': "🎉 확정",
+}
+
+
+class DigestBatcher:
+    """같은 사용자에게 window 초 안에 쌓인 알림을 DM 한 통으로 묶어 전송"""
+
+    def __init__(self, fanout, window: float = 2.0):
+        self.fanout = fanout
+        self.window = window
+
+        self._pending = defaultdict(list)  # user_id -> [(kind, schedule, embed)]
+        self._waiters = []
+        self._flush_handle = None
+        self._tasks = set()
+        self.batches = 0
+        self.merged = 0  # 묶이면서 줄어든 DM 수
+
+    def __len__(self):
+        return sum(len(items) for items in self._pending.values())
+
+    async def send(self, user_ids, kind: str, schedule, embed: discord.Embed, label: str):
+        """알림을 묶음 대기열에 넣고 실제로 전송될 때까지 대기 (window 가 0 이면 바로 전송)"""
+        await asyncio.shield(self.add(user_ids, kind, schedule, embed, label))
+
+    def add(self, user_ids, kind: str, schedule, embed: discord.Embed, label: str):
+        """알림을 묶음 대기열에 넣고 전송이 끝나면 완료되는 future 를 반환 (기다리지 않아도 됨)"""
+        user_ids = list(dict.fromkeys(user_ids))
+        loop = asyncio.get_running_loop()
+        if not user_ids:
+            waiter = loop.create_future()
+            waiter.set_result(None)
+            return waiter
+
+        if self.window <= 0:
+            task = loop.create_task(self.fanout.send(user_ids, lambda _: {'embed': embed}, label, kind=kind))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            return task
+
+        for user_id in user_ids:
+            self._pending[user_id].append((kind, schedule, embed))
+
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._start_flush)
+        return waiter
+
+    def _start_flush(self):
+        self._flush_handle = None
+        task = asyncio.create_task(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self):
+        """쌓인 알림을 사용자별로 묶어 전송"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending, self._pending = self._pending, defaultdict(list)
+        waiters, self._waiters = self._waiters, []
+
+        try:
+            # 알림이 하나뿐인 사용자는 원래 임베드 그대로, 여러 개면 묶음 임베드
+            groups = defaultdict(list)  # kind -> [user_id]
+            priorities = {}  # kind -> 묶인 알림 중 가장 급한 우선순위
+            for user_id, items in pending.items():
+                kind = items[0][0] if len(items) == 1 else 'digest'
+                groups[kind].append(user_id)
+                priority = min(KIND_PRIORITY.get(item[0], NORMAL) for item in items)
+                priorities[kind] = min(priorities.get(kind, priority), priority)
+                self.merged += len(items) - 1
+
+            digests = {}  # 재시도 때 다시 만들지 않도록 보관
+
+            def build(user_id):
+                items = pending[user_id]
+                if len(items) == 1:
+                    return {'embed': items[0][2]}
+                if user_id not in digests:
+                    digests[user_id] = build_digest(items)
+                return {'embeds': digests[user_id]}
+
+            await asyncio.gather(*(
+                self.fanout.send(user_ids, build, f"알림 묶음 ({kind})", kind=kind, priority=priorities[kind])
+                for kind, user_ids in groups.items()
+            ))
+            self.batches += 1
+        finally:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    async def drain(self):
+        """대기 중인 묶음을 모두 전송"""
+        if self._pending:
+            await self.flush()
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+
+def build_digest(items):
+    """여러 알림을 필드 하나씩으로 담은 임베드 목록 (메시지 전체의 임베드/필드/글자 수 제한 안에서)"""
+    title = f"🔔 일정 알림 {len(items)}건"
+    embeds = []
+    embed = None
+    used = len(title) + 20  # 제목과 '외 N건' 꼬리말 자리
+    shown = 0
+
+    for kind, schedule, _ in sorted(items, key=lambda item: item[1].timestamp):
+        name = f"{DIGEST_HEADINGS.get(kind, '🔔 알림')} · {schedule.title}"[:256]
+        value = f"📍 {schedule.datetime_text}\n{schedule.description}"[:FIELD_VALUE_LIMIT]
+
+        if used + len(name) + len(value) > EMBED_TOTAL_LIMIT:
+            break
+        if embed is None or len(embed.fields) >= MAX_FIELDS:
+            if len(embeds) >= MAX_EMBEDS:
+                break
+            embed = discord.Embed(color=discord.Color.orange())
+            embeds.append(embed)
+
+        embed.add_field(name=name, value=value, inline=False)
+        used += len(name) + len(value)
+        shown += 1
+
+    embeds[0].title = title
+    if shown < len(items):
+        embeds[-1].set_footer(text=f"… 외 {len(items) - shown}건")
+    return embeds
@@ -0,0 +1,153 @@
+import re
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# 입력 한 번을 정규식 한 번으로 해석 (형식마다 strptime 을 시도하지 않음)
+_PATTERN = re.compile(r"""
+    \s*
+    (?:
+        # 절대 날짜 + 시각: 2026-01-25 18:00, 2026/01/25, 2026.01.25, 1월 25일
+        (?:
+            (?P<year>\d{4})\s*[-/.]\s*(?P<month>\d{1,2})\s*[-/.]\s*(?P<day>\d{1,2})
+          | (?:(?P<kyear>\d{4})\s*년\s*)?(?P<kmonth>\d{1,2})\s*월\s*(?P<kday>\d{1,2})\s*일
+          | (?P<relday>오늘|내일|모레|글피)
+          | (?:(?P<week>이번\s*주|다음\s*주|담주)\s*)?(?P<weekday>[월화수목금토일])요일
+        )
+        (?:\s*,?\s*
+            (?:(?P<ampm>오전|오후|[AaPp][Mm])\s*)?
+            (?P<hour>\d{1,2})
+            (?:
+                :(?P<minute>\d{2})(?::(?P<second>\d{2}))?
+              | \s*시(?:\s*(?P<kminute>\d{1,2})\s*분|\s*(?P<half>반))?
+            )
+            (?:\s*(?P<ampm2>[AaPp][Mm]))?
+        )?
+      | # 상대 시각: 30분 후, 2시간 뒤, 1일 3시간 후
+        (?=\d)
+        (?:(?P<rdays>\d+)\s*일\s*)?
+        (?:(?P<rhours>\d+)\s*시간\s*)?
+        (?:(?P<rminutes>\d+)\s*분\s*)?
+        (?:후|뒤)
+    )
+    \s*
+""", re.VERBOSE)
+
+_RELATIVE_DAYS = {'오늘': 0, '내일': 1, '모레': 2, '글피': 3}
+_WEEKDAYS = {name: index for index, name in enumerate("월화수목금토일")}
+
+SUPPORTED_FORMATS = (
+    "• `YYYY-MM-DD HH:MM` (예: 2026-01-25 18:00, `/` `.` 구분자도 가능)\n"
+    "• `M월 D일 HH:MM` (예: 1월 25일 오후 6시)\n"
+    "• `내일 18:00`, `모레 오후 7시 30분`, `다음주 금요일 20:00`\n"
+    "• `30분 후`, `2시간 뒤`, `1일 3시간 후`"
+)
+
+
+class DateTimeParseError(ValueError):
+    pass
+
+
+def get_timezone(name: str):
+    """IANA 시간대 이름 (예: Asia/Seoul) 을 ZoneInfo 로 변환"""
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise DateTimeParseError(f"알 수 없는 시간대입니다: {name}") from None
+
+
+def parse_datetime(text: str, tz: ZoneInfo, now: datetime | None = None, default_time: dt_time | None = None):
+    """사용자 입력을 tz 기준으로 해석해 UTC aware datetime 으로 반환
+
+    시각이 없는 입력은 default_time 을 사용하고, default_time 도 없으면 오류로 처리한다.
+    """
+    match = _PATTERN.fullmatch(text)
+    if match is None:
+        raise DateTimeParseError(f"날짜/시간을 해석할 수 없습니다: {text}")
+
+    # 가장 흔한 "YYYY-MM-DD HH:MM" 입력은 중간 객체 없이 바로 생성
+    year, hour, minute = match['year'], match['hour'], match['minute']
+    if year and minute and not (match['ampm'] or match['ampm2']):
+        try:
+            local = datetime(int(year), int(match['month']), int(match['day']),
+                             int(hour), int(minute), int(match['second'] or 0), tzinfo=tz)
+        except ValueError:
+            raise DateTimeParseError("존재하지 않는 날짜/시각입니다.") from None
+        return local.astimezone(timezone.utc)
+
+    now = (now or datetime.now(timezone.utc)).astimezone(tz)
+
+    # 상대 시각은 현재 시각 기준
+    if match['rdays'] or match['rhours'] or match['rminutes']:
+        delta = timedelta(days=int(match['rdays'] or 0), hours=int(match['rhours'] or 0),
+                          minutes=int(match['rminutes'] or 0))
+        return (now + delta).astimezone(timezone.utc).replace(second=0, microsecond=0)
+
+    groups = match.groupdict()
+    day = _parse_date(groups, now.date())
+    clock = _parse_time(groups, default_time)
+    if clock is None:
+        raise DateTimeParseError(f"시각을 함께 입력해주세요: {text}")
+
+    return datetime.combine(day, clock, tzinfo=tz).astimezone(timezone.utc)
+
+
+def _parse_date(groups, today: date):
+    try:
+        if groups['year']:
+            return date(int(groups['year']), int(groups['month']), int(groups['day']))
+
+        if groups['kmonth']:
+            month, day = int(groups['kmonth']), int(groups['kday'])
+            if groups['kyear']:
+                return date(int(groups['kyear']), month, day)
+            # 연도를 생략하면 오늘 이후 가장 가까운 날짜
+            result = date(today.year, month, day)
+            return result if result >= today else date(today.year + 1, month, day)
+    except ValueError:
+        raise DateTimeParseError("존재하지 않는 날짜입니다.") from None
+
+    if groups['relday']:
+        return today + timedelta(days=_RELATIVE_DAYS[groups['relday']])
+
+    weekday = _WEEKDAYS[groups['weekday']]
+    week = (groups['week'] or "").replace(" ", "")
+    if not week:
+        # 요일만 쓰면 오늘 이후 가장 가까운 그 요일
+        return today + timedelta(days=(weekday - today.weekday()) % 7)
+
+    monday = today - timedelta(days=today.weekday())
+    return monday + timedelta(days=weekday + (0 if week == "이번주" else 7))
+
+
+def _parse_time(groups, default_time):
+    if groups['hour'] is None:
+        return default_time
+
+    hour = int(groups['hour'])
+    if groups['minute'] is not None:
+        minute = int(groups['minute'])
+    elif groups['kminute'] is not None:
+        minute = int(groups['kminute'])
+    else:
+        minute = 30 if groups['half'] else 0
+    second = int(groups['second'] or 0)
+
+    ampm = (groups['ampm'] or groups['ampm2'] or "").lower()
+    if ampm:
+        if not 1 <= hour <= 12:
+            raise DateTimeParseError("오전/오후와 함께 쓰는 시각은 1~12시여야 합니다.")
+        if ampm in ("오후", "pm"):
+            hour = hour % 12 + 12
+        else:
+            hour = hour % 12
+
+    try:
+        return dt_time(hour, minute, second)
+    except ValueError:
+        raise DateTimeParseError("존재하지 않는 시각입니다.") from None
+
+
+def format_datetime(timestamp: float, tz: ZoneInfo, show_zone: bool = False):
+    """저장된 시각을 해당 시간대의 표시용 문자열로 변환"""
+    text = datetime.fromtimestamp(timestamp, tz).strftime("%Y-%m-%d %H:%M")
+    return f"{text} ({tz.key})" if show_zone else text
@@ -0,0 +1,289 @@
+from collections import OrderedDict
+from datetime import datetime
+
+import discord
+
+# Discord 임베드 제한
+FIELD_VALUE_LIMIT = 1024
+MAX_FIELDS = 25
+EMBED_TOTAL_LIMIT = 6000
+
+# 넘치는 인원 요약 문구가 들어갈 자리
+OVERFLOW_RESERVE = 20
+
+
+def chunk_mentions(user_ids, max_fields: int, max_chars: int, sep: str = "\n"):
+    """멘션 목록을 필드 길이 제한에 맞게 나누고, 예산을 넘는 인원은 '외 N명'으로 요약"""
+    if not user_ids:
+        return ["없음"]
+
+    max_fields = max(1, max_fields)
+    chunks = []
+    current = ""
+    used = 0
+    shown = 0
+
+    for user_id in user_ids:
+        mention = f"<@{user_id}>"
+        piece = sep + mention if current else mention
+
+        # 현재 필드가 가득 찼으면 다음 필드로
+        if len(current) + len(piece) > FIELD_VALUE_LIMIT - OVERFLOW_RESERVE:
+            if len(chunks) + 1 >= max_fields:
+                break
+            chunks.append(current)
+            current = ""
+            piece = mention
+
+        if used + len(piece) > max_chars - OVERFLOW_RESERVE:
+            break
+
+        current += piece
+        used += len(piece)
+        shown += 1
+
+    remaining = len(user_ids) - shown
+    if remaining:
+        current += f"{sep if current else ''}… 외 {remaining}명"
+    chunks.append(current)
+    return chunks
+
+
+def format_duration(seconds: int):
+    """소요 시간 표시 (예: 1시간 30분)"""
+    hours, minutes = divmod(int(seconds) // 60, 60)
+    if hours and minutes:
+        return f"{hours}시간 {minutes}분"
+    return f"{hours}시간" if hours else f"{minutes}분"
+
+
+class EmbedRenderer:
+    """일정 임베드 템플릿 + 일정 버전별 캐시 (바뀌지 않은 일정은 다시 그리지 않음)"""
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._cache = OrderedDict()  # schedule_id -> {kind: (version, embed)}
+        self.hits = 0
+        self.misses = 0
+
+    def forget(self, schedule_id):
+        self._cache.pop(schedule_id, None)
+
+    def _cached(self, kind, schedule, build):
+        entries = self._cache.get(schedule.id)
+        if entries is None:
+            entries = self._cache[schedule.id] = {}
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(schedule.id)
+
+        cached = entries.get(kind)
+        if cached is not None and cached[0] == schedule.version:
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        embed = build(schedule)
+        entries[kind] = (schedule.version, embed)
+        return embed
+
+    # 그룹 채팅방 일정 현황
+    def status(self, schedule):
+        return self._cached('status', schedule, self._build_status)
+
+    # 시간 만료로 자동 취소된 일정 (그룹 채팅방)
+    def auto_cancel(self, schedule):
+        return self._cached('auto_cancel', schedule, self._build_auto_cancel)
+
+    # DM 알림
+    def invite(self, schedule):
+        return self._cached('invite', schedule, self._build_invite)
+
+    def activation(self, schedule):
+        return self._cached('activation', schedule, self._build_activation)
+
+    def cancellation(self, schedule):
+        return self._cached('cancellation', schedule, self._build_cancellation)
+
+    def auto_cancel_notice(self, schedule):
+        return self._cached('auto_cancel_notice', schedule, self._build_auto_cancel_notice)
+
+    def reminder(self, schedule):
+        return self._cached('reminder', schedule, self._build_reminder)
+
+    @staticmethod
+    def _build_status(schedule):
+        # 일정 취소된 경우
+        if schedule.cancelled:
+            embed = discord.Embed(
+                title=f"❌ {schedule.title} (취소됨)",
+                description=schedule.description,
+                color=discord.Color.red(),
+                timestamp=datetime.now()
+            )
+            embed.add_field(name="📍 날짜/시간", value=schedule.datetime_text, inline=False)
+            embed.add_field(name="👥 최소 인원", value=f"{schedule.min_participants}명", inline=True)
+            embed.add_field(name="🚫 취소 사유", value="최소 인원을 충족할 수 없습니다.", inline=False)
+            embed.set_footer(text=f"생성자: {schedule.creator_name}")
+            return embed
+
+        if schedule.activated:
+            # 일정 확정된 경우
+            embed = discord.Embed(
+                title=f"✅ {schedule.title} (확정)",
+                description=schedule.description,
+                color=discord.Color.green(),
+                timestamp=datetime.now()
+            )
+            status_field = ("🎉 상태", "**일정이 확정되었습니다!**")
+        else:
+            # 대기 중
+            embed = discord.Embed(
+                title=f"📅 {schedule.title}",
+                description=schedule.description,
+                color=discord.Color.blue(),
+                timestamp=datetime.now()
+            )
+            remaining = schedule.min_participants - schedule.attending_count
+            status_field = ("⏰ 상태", f"확정까지 {remaining}명 더 필요합니다.")
+
+        # 일정 정보
+        embed.add_field(name="📍 날짜/시간", value=schedule.datetime_text, inline=False)
+        embed.add_field(name="⌛ 소요 시간", value=format_duration(schedule.duration), inline=True)
+        embed.add_field(name="👥 최소 인원", value=f"{schedule.min_participants}명", inline=True)
+        _add_recurrence_field(embed, schedule)
+        embed.set_footer(text=f"생성자: {schedule.creator_name}")
+
+        # 참석자 현황 (멘션은 ID 만으로 만들 수 있으므로 사용자 조회가 필요 없음)
+        groups = ([], [], [])  # 참석, 불참, 미응답
+        for user_id in schedule.mentioned_users:
+            response = schedule.responses.get(user_id)
+            groups[2 if response is None else 0 if response else 1].append(user_id)
+
+        names = (
+            f"✅ 참석 ({len(groups[0])}명)",
+            f"❌ 불참 ({len(groups[1])}명)",
+            f"⏳ 미응답 ({len(groups[2])}명)",
+        )
+        _add_member_fields(embed, names, groups, reserved=len(status_field[0]) + len(status_field[1]))
+
+        # 활성화 상태
+        embed.add_field(name=status_field[0], value=status_field[1], inline=False)
+        return embed
+
+    @staticmethod
+    def _build_auto_cancel(schedule):
+        embed = discord.Embed(
+            title=f"❌ {schedule.title} (자동 취소됨)",
+            description=schedule.description,
+            color=discord.Color.red(),
+            timestamp=datetime.now()
+        )
+        embed.add_field(name="📍 날짜/시간", value=schedule.datetime_text, inline=False)
+        embed.add_field(name="👥 최소 인원", value=f"{schedule.min_participants}명", inline=True)
+        embed.add_field(name="🚫 취소 사유", value="일정 시간이 지났으나 최소 인원을 충족하지 못했습니다.", inline=False)
+
+        # 참석자 현황
+        embed.add_field(name="📊 최종 현황",
+                        value=f"참석 응답: {schedule.attending_count}명 / 최소 필요: {schedule.min_participants}명",
+                        inline=False)
+        embed.set_footer(text=f"생성자: {schedule.creator_name}")
+        return embed
+
+    @staticmethod
+    def _build_invite(schedule):
+        embed = discord.Embed(
+            title=f"📅 새로운 일정 초대",
+            description=f"**{schedule.title}**에 초대되었습니다!",
+            color=discord.Color.blue()
+        )
+        embed.add_field(name="📝 설명", value=schedule.description, inline=False)
+        embed.add_field(name="📍 날짜/시간", value=schedule.datetime_text, inline=False)
+        embed.add_field(name="⌛ 소요 시간", value=format_duration(schedule.duration), inline=False)
+        embed.add_field(name="👥 최소 인원", value=f"{schedule.min_participants}명", inline=False)
+        _add_recurrence_field(embed, schedule)
+        embed.set_footer(text=f"생성자: {schedule.creator_name}")
+        return embed
+
+    @staticmethod
+    def _build_activation(schedule):
+        embed = discord.Embed(
+            title="🎉 일정이 확정되었습니다!",
+            description=f"**{schedule.title}** 일정이 최소 인원을 충족하여 확정되었습니다.",
+            color=discord.Color.green()
+        )
+        embed.add_field(name="📍 날짜/시간", value=schedule.datetime_text, inline=False)
+        embed.add_field(name="📝 설명", value=schedule.description, inline=False)
+        return embed
+
+    @staticmethod
+    def _build_cancellation(schedule):
+        embed = discord.Embed(
+            title="❌ 일정이 취소되었습니다",
+            description=f"**{schedule.title}** 일정이 최소 인원을 충족하지 못해 취소되었습니다.",
+            color=discord.Color.red()
+        )
+        embed.add_field(name="📍 날짜/시간", value=schedule.datetime_text, inline=False)
+        embed.add_field(name="📝 설명", value=schedule.description, inline=False)
+        embed.add_field(name="🚫 취소 사유", value="참석 가능 인원이 최소 인원에 미달했습니다.", inline=False)
+        return embed
+
+    @staticmethod
+    def _build_auto_cancel_notice(schedule):
+        embed = discord.Embed(
+            title="❌ 일정이 자동 취소되었습니다",
+            description=f"**{schedule.title}** 일정이 시간 만료로 자동 취소되었습니다.",
+            color=discord.Color.red()
+        )
+        embed.add_field(name="📍 날짜/시간", value=schedule.datetime_text, inline=False)
+        embed.add_field(name="📝 설명", value=schedule.description, inline=False)
+        embed.add_field(name="🚫 취소 사유", value="일정 시간이 지났으나 최소 인원을 충족하지 못했습니다.", inline=False)
+        embed.add_field(name="📊 최종 현황",
+                        value=f"참석 응답: {schedule.attending_count}명 / 최소 필요: {schedule.min_participants}명",
+                        inline=False)
+        return embed
+
+    @staticmethod
+    def _build_reminder(schedule):
+        embed = discord.Embed(
+            title="⏰ 일정 알림 (10분 전)",
+            description=f"**{schedule.title}** 일정이 곧 시작됩니다!",
+            color=discord.Color.orange()
+        )
+        embed.add_field(name="📍 날짜/시간", value=schedule.datetime_text, inline=False)
+        embed.add_field(name="📝 설명", value=schedule.description, inline=False)
+        embed.add_field(name="⏰", value="10분 후 시작 예정입니다.", inline=False)
+        return embed
+
+
+def _add_recurrence_field(embed: discord.Embed, schedule):
+    if schedule.recurrence is not None:
+        embed.add_field(name="🔁 반복", value=f"{schedule.recurrence.describe()} ({schedule.occurrence + 1}회차)",
+                        inline=True)
+
+
+def _add_member_fields(embed: discord.Embed, names, groups, reserved: int = 0):
+    """참석/불참/미응답 목록을 남은 필드 수와 글자 수 안에서 나눠 추가"""
+    field_budget = MAX_FIELDS - len(embed.fields) - 1  # 상태 필드 자리
+    char_budget = EMBED_TOTAL_LIMIT - len(embed) - reserved - sum(len(n) + 8 for n in names)
+
+    # 멘션 하나당 최대 길이(<@ + 20자리 + > + 구분자) 기준으로 필요한 양 추정
+    needs = [len(ids) * 24 for ids in groups]
+
+    # 모두 한 필드씩에 들어가면 기존처럼 세 칸 나란히 표시
+    if all(need <= FIELD_VALUE_LIMIT - OVERFLOW_RESERVE for need in needs) and sum(needs) <= char_budget:
+        for name, ids in zip(names, groups):
+            embed.add_field(name=name, value=chunk_mentions(ids, 1, char_budget)[0], inline=True)
+        return
+
+    # 큰 목록은 필요량에 비례해 필드/글자 예산을 나눔 (각 목록 최소 1필드)
+    total_need = sum(needs) or 1
+    spare_fields = field_budget - len(groups)
+    for name, ids, need in zip(names, groups, needs):
+        share = need / total_need
+        max_fields = 1 + int(spare_fields * share)
+        max_chars = int(char_budget * share) if need else OVERFLOW_RESERVE
+
+        for index, chunk in enumerate(chunk_mentions(ids, max_fields, max(max_chars, OVERFLOW_RESERVE * 2), sep=" ")):
+            embed.add_field(name=name if index == 0 else "\u200b", value=chunk, inline=False)
@@ -0,0 +1,124 @@
+import asyncio
+import itertools
+import json
+import os
+
+# 기록하는 상호작용 종류
+EVENT_KINDS = ("create", "click", "list")
+
+
+class TraceRecorder:
+    """운영 중 상호작용(일정 생성, 버튼 클릭, 목록 조회)을 한 줄짜리 JSON 으로 기록
+
+    길드/채널/사용자/일정 ID 는 기록 순서대로 붙인 작은 번호로 바꿔 저장한다. (재생에는 서로 구분만
+    되면 충분하고, 실제 ID 를 남기지 않음) 번호는 프로세스마다 새로 매기므로 모든 이벤트에 실행(세션) 표시를
+    함께 남기고, 재생할 때는 (세션, 번호) 로 구분한다. 파일 쓰기는 모아서 flush_interval 마다 워커 스레드에서 한다.
+    """
+
+    def __init__(self, path: str, clock, flush_interval: float = 1.0):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.clock = clock
+        self.flush_interval = flush_interval
+
+        self.session = os.urandom(4).hex()
+        self._aliases = {}  # 실제 ID -> 기록용 번호
+        self._numbers = itertools.count(1)  # 지운 번호를 다시 쓰지 않도록 따로 셈
+        self._lines = []
+        self._flush_handle = None
+        self._flush_lock = asyncio.Lock()
+        self.recorded = 0
+
+    def alias(self, value):
+        number = self._aliases.get(value)
+        if number is None:
+            number = self._aliases[value] = next(self._numbers)
+        return number
+
+    def forget(self, schedule_id):
+        """끝난 일정의 번호를 지움 (운영 중 번호 표가 끝없이 커지지 않도록)"""
+        self._aliases.pop(schedule_id, None)
+
+    def record_create(self, schedule):
+        self._record("create", g=self.alias(schedule.guild_id), c=self.alias(schedule.channel_id),
+                     u=self.alias(schedule.creator_id), s=self.alias(schedule.id), at=schedule.timestamp,
+                     n=schedule.min_participants, i=[self.alias(u) for u in schedule.mentioned_users],
+                     r=schedule.recurrence.encode() if schedule.recurrence else None, d=schedule.duration)
+
+    def record_click(self, schedule_id, user_id, attending: bool):
+        self._record("click", s=self.alias(schedule_id), u=self.alias(user_id), a=int(attending))
+
+    def record_list(self, guild_id, channel_id, status: str):
+        self._record("list", g=self.alias(guild_id), c=self.alias(channel_id), st=status)
+
+    def _record(self, kind, **fields):
+        event = {'t': round(self.clock(), 3), 'k': kind, 'ss': self.session}
+        event.update((key, value) for key, value in fields.items() if value is not None)
+        self._lines.append(json.dumps(event, ensure_ascii=False, separators=(",", ":")))
+        self.recorded += 1
+
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.flush_interval, self._start_flush)
+
+    def _start_flush(self):
+        self._flush_handle = None
+        asyncio.get_running_loop().create_task(self.flush())
+
+    async def flush(self):
+        async with self._flush_lock:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+            if not self._lines:
+                return
+
+            lines, self._lines = self._lines, []
+            try:
+                await asyncio.to_thread(self._append, lines)
+            except OSError as e:
+                print(f"상호작용 기록 저장 오류 ({len(lines)}건): {e}")
+
+    def _append(self, lines):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    async def close(self):
+        await self.flush()
+
+
+# 기록용 번호가 들어 있는 필드
+ALIAS_FIELDS = ("g", "c", "u", "s")
+
+
+def load_trace(path: str):
+    """기록 파일의 이벤트를 시각 순서대로 반환 (알 수 없는 종류와 깨진 줄은 건너뜀)
+
+    여러 실행이 이어 쓴 파일도 재생할 수 있도록 (세션, 번호) 마다 파일 전체에서 겹치지 않는 번호를 다시 붙인다.
+    """
+    numbers = {}
+
+    def renumber(session, alias):
+        number = numbers.get((session, alias))
+        if number is None:
+            number = numbers[(session, alias)] = len(numbers) + 1
+        return number
+
+    events = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if event.get('k') not in EVENT_KINDS:
+                continue
+            session = event.pop('ss', None)
+            for key in ALIAS_FIELDS:
+                if key in event:
+                    event[key] = renumber(session, event[key])
+            if 'i' in event:
+                event['i'] = [renumber(session, alias) for alias in event['i']]
+            events.append(event)
+    events.sort(key=lambda event: event['t'])
+    return events
@@ -0,0 +1,231 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+
+import discord
+
+from jobs import KIND_PRIORITY, NORMAL
+from metrics import DM_TOTAL, RATE_LIMIT_HITS
+
+
+class TokenBucket:
+    """초당 rate 개의 토큰을 채우는 토큰 버킷 (최대 capacity 개까지 누적)"""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def is_idle(self):
+        """토큰이 가득 찬 상태면 버킷을 버려도 제한에 영향이 없음"""
+        self._refill(time.monotonic())
+        return self._tokens >= self.capacity and not self._lock.locked()
+
+    def block(self, seconds: float):
+        """429 응답의 retry_after 동안 버킷 전체를 멈춤"""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        self._tokens = 0
+
+
+class RateLimitLogHandler(logging.Handler):
+    """discord.http 의 429 경고 로그로 rate limit 횟수를 셈
+
+    discord.py 는 429 를 받으면 retry_after 만큼 기다렸다가 스스로 다시 보내므로, 봇 코드에는 예외가 거의
+    올라오지 않는다. 대신 그때마다 남기는 경고 로그를 센다. 전역 제한이면 같은 흐름에서 경고가 하나 더
+    이어지므로, 한 번에 분류하도록 이벤트 루프의 다음 차례에 반영한다. 전역 제한은 global_bucket 도 멈춘다.
+    """
+
+    def __init__(self, global_bucket: TokenBucket | None = None):
+        super().__init__(logging.WARNING)
+        self.global_bucket = global_bucket
+        self._pending = 0  # 아직 반영하지 않은 429 수
+        self._pending_global = 0
+        self._commit_handle = None
+
+    def emit(self, record: logging.LogRecord):
+        message = str(record.msg)
+        if message.startswith("We are being rate limited."):
+            self._pending += 1
+        elif message.startswith("Global rate limit has been hit."):
+            self._pending_global += 1
+            if self.global_bucket is not None and record.args:
+                self.global_bucket.block(float(record.args[0]))
+        else:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._commit()
+            return
+        if self._commit_handle is None:
+            self._commit_handle = loop.call_soon(self._commit)
+
+    def _commit(self):
+        self._commit_handle = None
+        is_global = min(self._pending_global, self._pending)
+        if is_global:
+            RATE_LIMIT_HITS.inc(is_global, scope="global")
+        if self._pending > is_global:
+            RATE_LIMIT_HITS.inc(self._pending - is_global, scope="route")
+        self._pending = self._pending_global = 0
+
+
+class PrioritySemaphore:
+    """자리가 나면 우선순위가 가장 높은(숫자가 작은) 대기자부터 깨우는 세마포어"""
+
+    def __init__(self, value: int):
+        self._value = value
+        self._waiters = []  # (priority, seq, future)
+        self._counter = itertools.count()
+
+    async def acquire(self, priority: int = NORMAL):
+        if self._value > 0 and not self._waiters:
+            self._value -= 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # 자리를 넘겨받은 직후 취소되면 다음 대기자에게 넘김 (취소된 대기자는 release 에서 건너뜀)
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._value += 1
+
+
+@dataclass(slots=True)
+class FanoutResult:
+    label: str
+    delivered: int = 0
+    failed: dict = field(default_factory=dict)  # user_id -> 실패 사유
+
+    @property
+    def total(self):
+        return self.delivered + len(self.failed)
+
+
+class DMFanout:
+    """여러 사용자에게 DM 을 동시에 보내는 엔진 (동시성 제한 + 토큰 버킷)
+
+    429 와 5xx 재시도는 discord.py HTTP 클라이언트에 맡긴다. (429 는 retry_after 만큼 기다렸다가,
+    500/502/504/524 는 최대 5회까지 다시 보냄) 여기서는 토큰 버킷으로 미리 속도를 맞춰 429 를 줄이고,
+    라이브러리가 포기하고 올린 오류는 재시도하지 않고 실패로 기록한다.
+    """
+
+    # Discord 전역 제한(초당 50회)과 DM 채널별 제한(5초당 5회)
+    GLOBAL_RATE = 50
+    CHANNEL_RATE = 1
+    CHANNEL_BURST = 5
+
+    def __init__(self, users, concurrency: int = 10):
+        self.users = users  # UserCache
+        self.global_bucket = TokenBucket(self.GLOBAL_RATE)
+        self._channel_buckets = {}  # user_id -> TokenBucket
+        self._next_sweep = 0.0
+        # 대량 초대가 동시 전송 자리를 모두 차지해도 알람이 먼저 자리를 받음
+        self._semaphore = PrioritySemaphore(concurrency)
+
+    def _channel_bucket(self, user_id):
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+        bucket = self._channel_buckets.get(user_id)
+        if bucket is None:
+            bucket = self._channel_buckets[user_id] = TokenBucket(self.CHANNEL_RATE, self.CHANNEL_BURST)
+        return bucket
+
+    def _sweep(self, now: float):
+        """다시 가득 찬 채널 버킷 정리 (가득 찬 버킷은 새로 만든 것과 같으므로 버려도 제한에 영향이 없음)
+
+        전송 직후에는 버킷이 비어 있으므로, 한 번 완전히 채워질 시간마다 새 버킷을 꺼낼 때 몰아서 확인한다.
+        """
+        idle = [user_id for user_id, bucket in self._channel_buckets.items() if bucket.is_idle()]
+        for user_id in idle:
+            del self._channel_buckets[user_id]
+        self._next_sweep = now + self.CHANNEL_BURST / self.CHANNEL_RATE
+
+    async def send(self, user_ids, build, label: str, kind: str = "dm", priority: int | None = None) -> FanoutResult:
+        """build(user_id) 가 돌려준 send() 인자로 각 사용자에게 DM 전송
+
+        kind 는 지표 분류용이며, priority 를 생략하면 kind 에 맞는 우선순위를 사용한다.
+        """
+        if priority is None:
+            priority = KIND_PRIORITY.get(kind, NORMAL)
+        result = FanoutResult(label)
+        user_ids = list(dict.fromkeys(user_ids))
+        await asyncio.gather(*(self._deliver(user_id, build, result, priority) for user_id in user_ids))
+
+        if result.delivered:
+            DM_TOTAL.inc(result.delivered, notification=kind, result="delivered")
+        if result.failed:
+            DM_TOTAL.inc(len(result.failed), notification=kind, result="failed")
+
+        if result.total:
+            print(f"📨 {label}: 전송 {result.delivered}명 / 실패 {len(result.failed)}명")
+        return result
+
+    async def _deliver(self, user_id, build, result: FanoutResult, priority: int):
+        await self._semaphore.acquire(priority)
+        try:
+            await self._deliver_one(user_id, build, result)
+        finally:
+            self._semaphore.release()
+
+    async def _deliver_one(self, user_id, build, result: FanoutResult):
+        try:
+            # DM 채널이 캐시에 없을 때만 조회 요청이 발생
+            if not self.users.has_dm_channel(user_id):
+                await self.global_bucket.acquire()
+            channel = await self.users.get_dm_channel(user_id)
+
+            await self.global_bucket.acquire()
+            await self._channel_bucket(user_id).acquire()
+            await channel.send(**build(user_id))
+
+            result.delivered += 1
+        except discord.Forbidden:
+            result.failed[user_id] = "DM 차단됨"
+        except discord.NotFound:
+            self.users.invalidate(user_id)
+            result.failed[user_id] = "사용자를 찾을 수 없음"
+        except discord.HTTPException as e:
+            result.failed[user_id] = f"HTTP {e.status}"
+            print(f"DM 전송 실패 (User {user_id}): {e}")
+        except Exception as e:
+            result.failed[user_id] = str(e)
+            print(f"DM 전송 실패 (User {user_id}): {e}")
@@ -0,0 +1,124 @@
+import asyncio
+import contextvars
+import time
+from collections import deque
+
+from metrics import JOB_WAIT_SECONDS, JOBS_TOTAL
+
+# 작업 우선순위 (숫자가 작을수록 먼저 처리)
+CRITICAL, NORMAL, BULK = 0, 1, 2
+LANES = ("critical", "normal", "bulk")
+
+# 알림 종류별 우선순위 (알람은 대량 초대보다 먼저)
+KIND_PRIORITY = {
+    'reminder': CRITICAL,
+    'auto_cancel': NORMAL,
+    'activation': NORMAL,
+    'cancellation': NORMAL,
+    'invite': BULK,
+}
+
+# 워커 안에서 실행 중인지 (워커가 자기 파이프라인이 비기를 기다리며 멈추지 않도록)
+_IN_WORKER = contextvars.ContextVar("in_job_worker", default=False)
+
+
+class JobPipeline:
+    """상호작용 응답(ack) 이후의 후속 작업을 우선순위 대기열로 처리하는 워커 풀
+
+    워커는 항상 더 급한 대기열부터 꺼낸다. 대기열마다 크기 제한이 있어 가득 차면 넣는 쪽이 기다린다.
+    단, 작업 안에서 넣는 후속 작업은 기다리지 않고 넘침 대기열에 쌓는다. (모든 워커가 가득 찬 대기열에
+    넣으려고 기다리면 그 대기열을 비울 워커가 없어 멈추기 때문)
+    """
+
+    def __init__(self, workers: int = 4, maxsize: int = 1000):
+        self.workers = workers
+        self._queues = [asyncio.Queue(maxsize) for _ in LANES]
+        self._overflow = [deque() for _ in LANES]  # 워커가 넣은 작업 중 대기열에 자리가 없던 것 (들어온 순서 유지)
+        self._ready = None  # 꺼낼 수 있는 작업 수 (워커를 시작할 때 생성)
+        self._tasks = []
+        self._unfinished = 0
+        self._idle = None
+        self._closed = False
+
+    def __len__(self):
+        return sum(queue.qsize() for queue in self._queues) + sum(map(len, self._overflow))
+
+    def depth(self, lane: int):
+        return self._queues[lane].qsize() + len(self._overflow[lane])
+
+    async def submit(self, lane: int, func, *args, label: str = ""):
+        """func(*args) 를 lane 대기열에 추가 (대기열이 가득 차면 자리가 날 때까지 대기, 워커 안에서는 기다리지 않음)"""
+        if self._closed:
+            # 종료 중에 들어온 작업은 버리지 않고 바로 실행
+            await self._run(lane, time.perf_counter(), func, args, label)
+            return
+
+        self._start()
+        self._unfinished += 1
+        self._idle.clear()
+        job = (time.perf_counter(), func, args, label)
+        try:
+            if _IN_WORKER.get():
+                self._put_nowait(lane, job)
+            else:
+                await self._queues[lane].put(job)
+        except BaseException:
+            self._finish()
+            raise
+        self._ready.release()
+
+    def _put_nowait(self, lane, job):
+        queue, overflow = self._queues[lane], self._overflow[lane]
+        if overflow or queue.full():
+            overflow.append(job)
+        else:
+            queue.put_nowait(job)
+
+    def _start(self):
+        if self._tasks:
+            return
+        self._ready = asyncio.Semaphore(0)
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def _worker(self):
+        _IN_WORKER.set(True)
+        while True:
+            await self._ready.acquire()
+            lane = next(lane for lane, queue in enumerate(self._queues) if not queue.empty())
+            queued, func, args, label = self._queues[lane].get_nowait()
+            if self._overflow[lane]:
+                # 넘친 작업은 대기열에 자리가 나는 대로 순서대로 옮김
+                self._queues[lane].put_nowait(self._overflow[lane].popleft())
+            try:
+                await self._run(lane, queued, func, args, label)
+            finally:
+                self._finish()
+
+    async def _run(self, lane, queued, func, args, label):
+        JOB_WAIT_SECONDS.observe(time.perf_counter() - queued, lane=LANES[lane])
+        try:
+            await func(*args)
+            JOBS_TOTAL.inc(lane=LANES[lane], result="done")
+        except Exception as e:
+            JOBS_TOTAL.inc(lane=LANES[lane], result="failed")
+            print(f"후속 작업 처리 오류 ({label or getattr(func, '__name__', func)}): {e}")
+
+    def _finish(self):
+        self._unfinished -= 1
+        if not self._unfinished:
+            self._idle.set()
+
+    async def drain(self):
+        """대기 중인 작업과 그 작업이 새로 넣은 작업까지 모두 끝날 때까지 대기"""
+        if self._idle is not None:
+            await self._idle.wait()
+
+    async def close(self):
+        await self.drain()
+        self._closed = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
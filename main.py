@@ -1,10 +1,41 @@
+import asyncio
+import functools
+import gc
+import heapq
+import logging
 import os
+import time
 import dotenv
-from datetime import datetime, timedelta
+from datetime import datetime, time as dt_time, timedelta, timezone
 
 import discord
 from discord import app_commands
-from discord.ext import commands, tasks
+from discord.ext import commands
+
+from archive import OUTCOMES, ArchiveSegments
+from availability import HORIZON_DAYS, SLOT_SECONDS, AvailabilityStore, best_slots, range_mask, slot_range
+from digest import DigestBatcher
+from dtparse import SUPPORTED_FORMATS, DateTimeParseError, format_datetime, get_timezone, parse_datetime
+from embeds import EmbedRenderer, chunk_mentions, format_duration
+from event_trace import TraceRecorder
+from fanout import DMFanout, RateLimitLogHandler
+from jobs import BULK, NORMAL, JobPipeline
+from mentions import MentionResolver
+from message_updater import MessageEditCoalescer
+from metrics import (
+    BUTTON_ACK_SECONDS, COMMAND_SECONDS, DEADLINE_CALLBACK_SECONDS, DEADLINE_LATENESS_SECONDS, DM_TOTAL,
+    JOB_WAIT_SECONDS, RATE_LIMIT_HITS, CallbackCounter, Gauge, MetricsServer, registry,
+)
+from models import DEFAULT_DURATION, Schedule, ScheduleStore
+from recurrence import FREQUENCIES, RecurrenceRule
+from scheduler import DeadlineScheduler
+from sharding import ShardOwnership, schedule_guild
+from startup import StartupProfiler, command_tree_hash
+from storage import ScheduleDatabase, WriteBehindWriter
+from user_cache import UserCache
+
+# 프로세스 시작부터 첫 상호작용까지 단계별 시간
+startup_profiler = StartupProfiler()
 
 dotenv.load_dotenv()
 
@@ -14,433 +45,625 @@ if ENV == "dev":
 else:
     BOT_TOKEN = os.getenv("BOT_TOKEN")
 
+DB_PATH = os.getenv("DB_PATH", "data/schedules.db")
+# 끝난 일정의 압축 보관 기록 위치 (기본: DB 파일 옆 archive 디렉터리)
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR") or os.path.join(os.path.dirname(DB_PATH) or ".", "archive")
+DM_CONCURRENCY = int(os.getenv("DM_CONCURRENCY", "10"))
+MESSAGE_EDIT_WINDOW = float(os.getenv("MESSAGE_EDIT_WINDOW", "1.0"))
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108") or 0)  # 0 이면 지표 서버 비활성화
+DIGEST_WINDOW = float(os.getenv("DIGEST_WINDOW", "2.0"))  # 0 이면 알림을 묶지 않음
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "8"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "1000"))  # 우선순위별 대기열 크기 (가득 차면 넣는 쪽이 대기)
+TRACE_PATH = os.getenv("TRACE_PATH")  # 지정하면 상호작용을 재생용으로 기록
+DEFAULT_TIMEZONE = get_timezone(os.getenv("DEFAULT_TIMEZONE", "Asia/Seoul"))
+FORCE_COMMAND_SYNC = os.getenv("FORCE_COMMAND_SYNC", "") not in ("", "0")  # 명령어가 그대로여도 동기화
+
+# 샤딩 (SHARD_IDS 를 나눠 여러 프로세스로 실행하면 각 프로세스는 맡은 샤드의 길드 일정만 관리)
+SHARD_COUNT = os.getenv("SHARD_COUNT")
+SHARD_IDS = os.getenv("SHARD_IDS")
+FORWARD_POLL_INTERVAL = 0.5
+shard_ownership = ShardOwnership.from_env(SHARD_COUNT, SHARD_IDS)
+
 # 봇 설정
 intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
 
-bot = commands.Bot(command_prefix='/', intents=intents)
 
-# 일정 데이터 저장 (실제 서비스에서는 DB 사용 권장)
-schedules = {}  # 대기 중 및 취소될 일정
-activated_schedules = {}  # 확정된 일정 (알람 대기 중)
+class ScheduleBot(commands.AutoShardedBot):
+    forward_task = None
+    sync_task = None
+    startup_done = False  # 재연결로 on_ready 가 다시 호출돼도 시작 작업을 반복하지 않음
 
+    async def setup_hook(self):
+        startup_profiler.mark("login")
 
-# 날짜/시간 형식 변환기
-class DateTimeTransformer(app_commands.Transformer):
-    async def transform(self, interaction: discord.Interaction, value: str) -> str:
-        formats = [
-            "%Y-%m-%d %H:%M",
-            "%Y/%m/%d %H:%M",
-            "%Y.%m.%d %H:%M",
-            "%Y-%m-%d %H:%M:%S",
-        ]
+        # 참석/불참 버튼은 custom_id 의 일정 ID 로 라우팅
+        self.add_dynamic_items(AttendanceButton, SchedulePageButton)
+        await restore_schedules()
+        startup_profiler.mark("restore")
+
+        # 명령어 동기화는 전역 작업이므로 0번 샤드를 맡은 프로세스만, 게이트웨이 연결과 별도로 실행
+        if shard_ownership.receives_dms:
+            self.sync_task = asyncio.create_task(sync_commands())
+
+        # 다른 프로세스가 받은 DM 버튼 응답 처리
+        if not shard_ownership.owns_all:
+            self.forward_task = asyncio.create_task(poll_forwarded_responses())
+            print(f"🧩 샤드 {sorted(shard_ownership.shard_ids)} / {shard_ownership.shard_count} 를 맡습니다.")
 
-        for fmt in formats:
+        if METRICS_PORT:
             try:
-                datetime.strptime(value, fmt)
-                return value
-            except ValueError:
-                continue
+                await metrics_server.start()
+                print(f"📊 지표를 http://{METRICS_HOST}:{METRICS_PORT}/metrics 에서 제공합니다.")
+            except OSError as e:
+                print(f"지표 서버 시작 오류: {e}")
+
+    async def close(self):
+        # 남은 메시지 수정과 아직 저장되지 않은 변경 사항을 모두 기록한 뒤 종료
+        for task in (self.forward_task, self.sync_task):
+            if task is not None:
+                task.cancel()
+        await job_pipeline.close()
+        if trace_recorder is not None:
+            await trace_recorder.close()
+        await message_updater.drain()
+        await dm_digest.drain()
+        await schedule_writer.close()
+        await metrics_server.stop()
+        await super().close()
+
+
+bot = ScheduleBot(
+    command_prefix='/',
+    intents=intents,
+    shard_count=shard_ownership.shard_count if SHARD_COUNT else None,
+    shard_ids=sorted(shard_ownership.shard_ids) if SHARD_COUNT and SHARD_IDS else None,
+)
 
-        raise app_commands.AppCommandError(
-            f"❌ 올바르지 않은 날짜/시간 형식입니다.\n\n"
-            f"**지원하는 형식:**\n"
-            f"• `YYYY-MM-DD HH:MM` (예: 2026-01-25 18:00)\n"
-            f"• `YYYY/MM/DD HH:MM` (예: 2026/01/25 18:00)\n"
-            f"• `YYYY.MM.DD HH:MM` (예: 2026.01.25 18:00)\n\n"
-            f"**입력하신 값:** `{value}`"
-        )
+# 일정 데이터 저장 (SQLite WAL, 변경 사항은 모아서 기록)
+# 끝난 일정은 메모리와 일정 표에서 빼고 압축 보관 기록으로 옮김 (샤드 프로세스마다 다른 파일에 기록)
+schedule_writer = WriteBehindWriter(
+    ScheduleDatabase(DB_PATH, archive=ArchiveSegments(ARCHIVE_DIR, prefix=shard_ownership.tag))
+)
+schedule_store = ScheduleStore(schedule_writer)  # 대기 중 및 확정된 일정 (알람 대기 중)
+availability_store = AvailabilityStore(schedule_writer)  # /시간추천 에 쓰는 사용자별 가능 시간
 
+# 사용자/DM 채널 조회 캐시와 DM 일괄 전송 (동시성 및 rate limit 관리)
+user_cache = UserCache(bot)
+dm_fanout = DMFanout(user_cache, concurrency=DM_CONCURRENCY)
 
-class AttendanceButton(discord.ui.View):
-    def __init__(self, schedule_id: str):
-        super().__init__(timeout=None)
-        self.schedule_id = schedule_id
+# discord.py 가 내부에서 기다렸다 다시 보내는 429 도 지표에 잡히도록 경고 로그를 셈
+logging.getLogger("discord.http").addHandler(RateLimitLogHandler(dm_fanout.global_bucket))
 
-    @discord.ui.button(label="참석", style=discord.ButtonStyle.green, custom_id="attend_yes")
-    async def attend_yes(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.handle_response(interaction, True)
+# 알람/확정 DM 은 사용자별로 묶어서 전송
+dm_digest = DigestBatcher(dm_fanout, window=DIGEST_WINDOW)
 
-    @discord.ui.button(label="불참", style=discord.ButtonStyle.red, custom_id="attend_no")
-    async def attend_no(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.handle_response(interaction, False)
+# 상호작용에 먼저 응답한 뒤 처리할 후속 작업 (알림/메시지 수정은 대량 초대보다 먼저)
+job_pipeline = JobPipeline(workers=JOB_WORKERS, maxsize=JOB_QUEUE_SIZE)
 
-    async def handle_response(self, interaction: discord.Interaction, attending: bool):
-        # 대기 중 일정과 활성화된 일정 모두 확인
-        schedule = schedules.get(self.schedule_id) or activated_schedules.get(self.schedule_id)
+# 그룹 채팅방 일정 메시지 수정 요청 병합
+message_updater = MessageEditCoalescer(bot, window=MESSAGE_EDIT_WINDOW)
 
-        if not schedule:
-            await interaction.response.send_message("일정을 찾을 수 없습니다.", ephemeral=True)
-            return
+# 길드별 시간대 (설정하지 않은 길드는 DEFAULT_TIMEZONE)
+guild_timezones = {}
 
-        user_id = interaction.user.id
+# 참석자 멘션 해석 (역할/@everyone 은 멤버 캐시로 펼침)
+mention_resolver = MentionResolver()
+MAX_INVITEES = int(os.getenv("MAX_INVITEES", "1000"))
 
-        # 이미 응답한 경우
-        if user_id in schedule['responses']:
-            await interaction.response.send_message("이미 응답하셨습니다.", ephemeral=True)
-            return
+# 일정 소요 시간 상한 (분)
+MAX_DURATION_MINUTES = 7 * 24 * 60
 
-        # 일정이 이미 취소된 경우
-        if schedule.get('cancelled'):
-            await interaction.response.send_message(f"이 일정은 취소 되었습니다.", ephemeral=True)
-            return
+# 일정 생성 시 알려줄 시간 충돌 참석자 수 상한
+CONFLICT_REPORT_LIMIT = 20
+
+# /시간추천 결과 개수와 기본 탐색 기간 (일)
+SUGGEST_LIMIT = 5
+SUGGEST_DAYS = 14
+
+# 일정 임베드 렌더링 (일정 버전별 캐시)
+embed_renderer = EmbedRenderer()
+
+# 지표 (Prometheus 텍스트 형식, 로컬 HTTP 로 제공)
+metrics_server = MetricsServer(registry, METRICS_HOST, METRICS_PORT)
+Gauge(registry, "schedule_bot_schedules", "메모리에 있는 진행 중 일정 수", lambda: len(schedule_store))
+Gauge(registry, "schedule_bot_deadlines", "등록된 알람/만료 마감 수", lambda: len(deadline_scheduler))
+Gauge(registry, "schedule_bot_pending_writes", "아직 DB 에 기록되지 않은 변경 수", lambda: len(schedule_writer))
+CallbackCounter(registry, "schedule_bot_user_cache_hits_total", "사용자/DM 채널 캐시 적중 수", lambda: user_cache.hits)
+CallbackCounter(registry, "schedule_bot_user_cache_misses_total", "사용자/DM 채널 캐시 미스 수", lambda: user_cache.misses)
+CallbackCounter(registry, "schedule_bot_digest_merged_total", "알림 묶음으로 줄어든 DM 수", lambda: dm_digest.merged)
+Gauge(registry, "schedule_bot_job_queue", "대기 중인 후속 작업 수", lambda: len(job_pipeline))
+Gauge(registry, "schedule_bot_startup_seconds", "프로세스 시작부터 첫 상호작용까지 걸린 시간",
+      lambda: startup_profiler.elapsed("interaction") or 0)
+
+
+def timed_command(func):
+    """슬래시 명령어 처리 시간을 기록"""
+    @functools.wraps(func)
+    async def wrapper(interaction: discord.Interaction, *args, **kwargs):
+        with COMMAND_SECONDS.time(command=func.__name__):
+            return await func(interaction, *args, **kwargs)
+    return wrapper
+
+# 현재 시각 (epoch 초, 재생 벤치마크에서는 가상 시계로 교체)
+clock = time.time
 
-        # 응답 저장
-        schedule['responses'][user_id] = attending
+# 알람/만료 마감 시각 관리
+deadline_scheduler = DeadlineScheduler()
 
-        # DM 메시지의 버튼 제거
-        status = "참석" if attending else "불참"
+# 상호작용 기록 (bench.replay 로 재생)
+trace_recorder = TraceRecorder(TRACE_PATH, lambda: clock()) if TRACE_PATH else None
+REMINDER_OFFSET = timedelta(minutes=10).total_seconds()
 
+
+# 날짜/시간 형식 변환기
+class DateTimeTransformer(app_commands.Transformer):
+    async def transform(self, interaction: discord.Interaction, value: str) -> datetime:
         try:
-            current_embed = interaction.message.embeds[0] if interaction.message.embeds else None
+            return parse_datetime(value, guild_timezone(interaction.guild_id), current_datetime())
+        except DateTimeParseError as e:
+            raise app_commands.AppCommandError(
+                f"❌ 올바르지 않은 날짜/시간 형식입니다. ({e})\n\n"
+                f"**지원하는 형식:**\n{SUPPORTED_FORMATS}\n\n"
+                f"**입력하신 값:** `{value}`"
+            )
 
-            if current_embed:
-                current_embed.color = discord.Color.green() if attending else discord.Color.red()
-                current_embed.set_footer(text=f"✅ {status}으로 응답 완료")
 
-            await interaction.response.edit_message(embed=current_embed, view=None)
-        except Exception as e:
-            print(f"DM 메시지 업데이트 오류: {e}")
-            await interaction.response.send_message(f"'{schedule['title']}' 일정에 **{status}**으로 응답하셨습니다!",
-                                                    ephemeral=True)
-
-        # 현재 참석자 수 계산
-        attending_count = sum(1 for v in schedule['responses'].values() if v)
-        no_response_count = len([u for u in schedule['mentioned_users'] if u not in schedule['responses']])
-
-        if schedule["activated"] and attending:
-            await self.notify_activation_to_user(schedule, user_id)
-
-        # 일정 확정 확인
-        if attending_count >= schedule['min_participants'] and not schedule['activated']:
-            schedule['activated'] = True
-            await self.move_to_activated_queue(schedule)
-            await self.notify_activation(schedule)
-            await self.update_schedule_message(schedule)
-        # 일정 취소 확인
-        elif attending_count + no_response_count < schedule['min_participants'] and not schedule.get('cancelled'):
-            schedule['cancelled'] = True
-            await self.notify_cancellation(schedule)
-            await self.update_schedule_message(schedule)
-            await self.remove_cancelled_schedule(schedule)
-        else:
-            await self.update_schedule_message(schedule)
+def current_datetime():
+    """clock 기준 현재 시각 (UTC aware datetime)"""
+    return datetime.fromtimestamp(clock(), timezone.utc)
 
-    async def move_to_activated_queue(self, schedule):
-        """확정된 일정을 activated_schedules 큐로 이동"""
-        schedule_id = schedule['id']
-        activated_schedules[schedule_id] = schedule
 
-        # 대기 큐에서 제거
-        if schedule_id in schedules:
-            del schedules[schedule_id]
+def new_schedule_id(guild_id, channel_id):
+    """일정 ID (길드_채널_생성 시각), 가상 시계에서 같은 시각에 만든 일정이 있으면 시각을 조금씩 늘려 구분"""
+    created = clock()
+    while (schedule_id := f"{guild_id}_{channel_id}_{created}") in schedule_store:
+        created += 1e-6
+    return schedule_id
 
-        print(f"✅ 일정 '{schedule['title']}'이 확정 큐로 이동되었습니다.")
 
-    async def remove_cancelled_schedule(self, schedule):
-        """취소된 일정을 큐에서 삭제"""
-        schedule_id = schedule['id']
+def guild_timezone(guild_id):
+    return guild_timezones.get(guild_id, DEFAULT_TIMEZONE)
 
-        if schedule_id in schedules:
-            del schedules[schedule_id]
-            print(f"❌ 취소된 일정 '{schedule['title']}'이 삭제되었습니다.")
 
-    async def update_schedule_message(self, schedule):
-        """그룹 채팅방의 일정 메시지 업데이트"""
-        try:
-            channel = bot.get_channel(schedule['channel_id'])
-            message = await channel.fetch_message(schedule['message_id'])
+def display_datetime(timestamp: float, guild_id):
+    """길드 시간대 기준 표시용 날짜/시간 (기본 시간대가 아니면 시간대 이름도 표시)"""
+    tz = guild_timezone(guild_id)
+    return format_datetime(timestamp, tz, show_zone=tz != DEFAULT_TIMEZONE)
 
-            embed = self.create_schedule_embed(schedule)
-            await message.edit(embed=embed)
-        except Exception as e:
-            print(f"메시지 업데이트 오류: {e}")
-
-    def create_schedule_embed(self, schedule):
-        """일정 정보 임베드 생성"""
-        # 일정 취소된 경우
-        if schedule.get('cancelled'):
-            embed = discord.Embed(
-                title=f"❌ {schedule['title']} (취소됨)",
-                description=schedule['description'],
-                color=discord.Color.red(),
-                timestamp=datetime.now()
-            )
-            embed.add_field(name="📍 날짜/시간", value=schedule['datetime'], inline=False)
-            embed.add_field(name="👥 최소 인원", value=f"{schedule['min_participants']}명", inline=True)
-            embed.add_field(name="🚫 취소 사유", value="최소 인원을 충족할 수 없습니다.", inline=False)
-            embed.set_footer(text=f"생성자: {schedule['creator_name']}")
-            return embed
-
-        # 일정 확정된 경우
-        if schedule.get('activated'):
-            embed = discord.Embed(
-                title=f"✅ {schedule['title']} (확정)",
-                description=schedule['description'],
-                color=discord.Color.green(),
-                timestamp=datetime.now()
-            )
-        else:
-            # 대기 중
-            embed = discord.Embed(
-                title=f"📅 {schedule['title']}",
-                description=schedule['description'],
-                color=discord.Color.blue(),
-                timestamp=datetime.now()
+
+class AttendanceButton(discord.ui.DynamicItem[discord.ui.Button], template=r'attend:(?P<choice>yes|no):(?P<schedule_id>[\w.]+)'):
+    """일정 ID 를 custom_id 에 담은 참석/불참 버튼 (재시작 후에도 동작)"""
+
+    def __init__(self, schedule_id: str, attending: bool):
+        super().__init__(
+            discord.ui.Button(
+                label="참석" if attending else "불참",
+                style=discord.ButtonStyle.green if attending else discord.ButtonStyle.red,
+                custom_id=f"attend:{'yes' if attending else 'no'}:{schedule_id}",
             )
+        )
+        self.schedule_id = schedule_id
+        self.attending = attending
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match['schedule_id'], match['choice'] == 'yes')
+
+    async def callback(self, interaction: discord.Interaction):
+        await handle_response(interaction, self.schedule_id, self.attending)
+
+
+def attendance_view(schedule_id: str):
+    """DM 에 붙일 참석/불참 버튼 View 생성"""
+    view = discord.ui.View(timeout=None)
+    view.add_item(AttendanceButton(schedule_id, True))
+    view.add_item(AttendanceButton(schedule_id, False))
+
+    # 클릭은 등록된 AttendanceButton 이 처리하므로 View 자체는 view store 에 저장하지 않음
+    view.stop()
+    return view
+
 
-        # 일정 정보
-        embed.add_field(name="📍 날짜/시간", value=schedule['datetime'], inline=False)
-        embed.add_field(name="👥 최소 인원", value=f"{schedule['min_participants']}명", inline=True)
-
-        # 참석자 현황
-        attending = []
-        not_attending = []
-        no_response = []
-
-        for user_id in schedule['mentioned_users']:
-            if user_id in schedule['responses']:
-                user = bot.get_user(user_id)
-                if schedule['responses'][user_id]:
-                    attending.append(user.mention if user else f"<@{user_id}>")
-                else:
-                    not_attending.append(user.mention if user else f"<@{user_id}>")
-            else:
-                user = bot.get_user(user_id)
-                no_response.append(user.mention if user else f"<@{user_id}>")
-
-        attending_text = "\n".join(attending) if attending else "없음"
-        not_attending_text = "\n".join(not_attending) if not_attending else "없음"
-        no_response_text = "\n".join(no_response) if no_response else "없음"
-
-        embed.add_field(name=f"✅ 참석 ({len(attending)}명)", value=attending_text, inline=True)
-        embed.add_field(name=f"❌ 불참 ({len(not_attending)}명)", value=not_attending_text, inline=True)
-        embed.add_field(name=f"⏳ 미응답 ({len(no_response)}명)", value=no_response_text, inline=True)
-
-        # 활성화 상태
-        if schedule.get('activated'):
-            embed.add_field(name="🎉 상태", value="**일정이 확정되었습니다!**", inline=False)
+async def handle_response(interaction: discord.Interaction, schedule_id: str, attending: bool):
+    """참석/불참 버튼 응답 처리"""
+    started = time.perf_counter()
+    if trace_recorder is not None:
+        trace_recorder.record_click(schedule_id, interaction.user.id, attending)
+    # 대기 중 일정과 활성화된 일정 모두 확인
+    schedule = schedule_store.get(schedule_id)
+
+    if not schedule:
+        # DM 버튼은 항상 0번 샤드로 들어오므로 다른 프로세스 소유 일정이면 넘겨줌
+        if not shard_ownership.owns_schedule(schedule_id):
+            schedule_writer.forward_response(schedule_id, schedule_guild(schedule_id), interaction.user.id, attending)
+            await acknowledge_response(interaction, attending)
+            BUTTON_ACK_SECONDS.observe(time.perf_counter() - started)
+            return
+
+        await interaction.response.send_message("일정을 찾을 수 없습니다.", ephemeral=True)
+        return
+
+    already_responded, was_cancelled, follow_up = await record_response(schedule, interaction.user.id, attending)
+
+    # 이미 응답한 경우
+    if already_responded:
+        await interaction.response.send_message("이미 응답하셨습니다.", ephemeral=True)
+        return
+
+    # 일정이 이미 취소된 경우
+    if was_cancelled:
+        await interaction.response.send_message(f"이 일정은 취소 되었습니다.", ephemeral=True)
+        return
+
+    await acknowledge_response(interaction, attending, schedule.title)
+    BUTTON_ACK_SECONDS.observe(time.perf_counter() - started)
+    await job_pipeline.submit(NORMAL, follow_up, label=f"응답 처리 '{schedule.title}'")
+
+
+async def acknowledge_response(interaction: discord.Interaction, attending: bool, title: str | None = None):
+    """DM 메시지의 버튼을 제거하고 응답 결과를 표시"""
+    status = "참석" if attending else "불참"
+
+    try:
+        current_embed = interaction.message.embeds[0] if interaction.message.embeds else None
+
+        if current_embed:
+            current_embed.color = discord.Color.green() if attending else discord.Color.red()
+            current_embed.set_footer(text=f"✅ {status}으로 응답 완료")
+
+        await interaction.response.edit_message(embed=current_embed, view=None)
+    except Exception as e:
+        print(f"DM 메시지 업데이트 오류: {e}")
+        target = f"'{title}' 일정에" if title else "일정에"
+        await interaction.response.send_message(f"{target} **{status}**으로 응답하셨습니다!", ephemeral=True)
+
+
+async def record_response(schedule, user_id, attending):
+    """응답을 기록하고 (이미 응답함, 이미 취소됨, 후속 처리) 를 반환
+
+    후속 처리(확정/취소 알림, 그룹 메시지 수정)는 버튼 응답(ack) 이후에 실행한다.
+    """
+    # 응답 기록과 확정/취소 판단은 일정별 잠금 안에서 한 번에 처리
+    async with schedule_store.lock(schedule.id):
+        already_responded = user_id in schedule.responses
+        was_cancelled = schedule.cancelled
+        activate = cancel = False
+
+        # 이미 확정된 일정에 참석한 경우 본인에게만 확정 알림
+        notify_self = schedule.activated and attending
+
+        if not already_responded and not was_cancelled:
+            # 응답 저장
+            schedule_store.record_response(schedule, user_id, attending)
+
+            # 일정 확정 확인
+            if schedule.attending_count >= schedule.min_participants and not schedule.activated:
+                schedule.activated = activate = True
+                schedule_store.save(schedule)
+
+                # 확정 시점의 참석자에게만 일괄 알림 (이후 참석자는 개별 알림)
+                attendees = [u for u, v in schedule.responses.items() if v]
+            # 일정 취소 확인
+            elif schedule.attending_count + schedule.pending_count < schedule.min_participants and not schedule.activated:
+                schedule.cancelled = cancel = True
+                schedule_store.save(schedule)
+
+    async def follow_up():
+        if activate:
+            await move_to_activated_queue(schedule)
+            await notify_activation(schedule, attendees)
+            await update_schedule_message(schedule)
+        elif cancel:
+            await notify_cancellation(schedule)
+            await update_schedule_message(schedule)
+            await remove_cancelled_schedule(schedule)
+            await schedule_next_occurrence(schedule)
         else:
-            remaining = schedule['min_participants'] - len(attending)
-            embed.add_field(name="⏰ 상태", value=f"확정까지 {remaining}명 더 필요합니다.", inline=False)
+            if notify_self:
+                await notify_activation_to_user(schedule, user_id)
+            await update_schedule_message(schedule)
 
-        embed.set_footer(text=f"생성자: {schedule['creator_name']}")
+    return already_responded, was_cancelled, follow_up
 
-        return embed
 
-    async def notify_activation_to_user(self, schedule, user_id):
+async def poll_forwarded_responses():
+    """다른 샤드 프로세스가 넘긴 응답을 주기적으로 가져와 반영"""
+    while True:
+        await asyncio.sleep(FORWARD_POLL_INTERVAL)
         try:
-            user = await bot.fetch_user(user_id)
-            embed = discord.Embed(
-                title="🎉 일정이 확정되었습니다!",
-                description=f"**{schedule['title']}** 일정이 최소 인원을 충족하여 확정되었습니다.",
-                color=discord.Color.green()
-            )
-            embed.add_field(name="📍 날짜/시간", value=schedule['datetime'], inline=False)
-            embed.add_field(name="📝 설명", value=schedule['description'], inline=False)
-            await user.send(embed=embed)
+            forwarded = await schedule_writer.take_forwarded(shard_ownership)
         except Exception as e:
-            print(f"DM 전송 실패 (User {user_id}): {e}")
-
-    async def notify_activation(self, schedule):
-        """일정 활성화 시 참석자들에게 DM 전송"""
-        for user_id in schedule['mentioned_users']:
-            if schedule['responses'].get(user_id, False):
-                await self.notify_activation_to_user(schedule, user_id)
+            print(f"전달된 응답 조회 오류: {e}")
+            continue
 
-    async def notify_cancellation(self, schedule):
-        """일정 취소 시 모든 참석자들에게 DM 전송"""
-        for user_id in schedule['mentioned_users']:
-            try:
-                user = await bot.fetch_user(user_id)
-                embed = discord.Embed(
-                    title="❌ 일정이 취소되었습니다",
-                    description=f"**{schedule['title']}** 일정이 최소 인원을 충족하지 못해 취소되었습니다.",
-                    color=discord.Color.red()
-                )
-                embed.add_field(name="📍 날짜/시간", value=schedule['datetime'], inline=False)
-                embed.add_field(name="📝 설명", value=schedule['description'], inline=False)
-                embed.add_field(name="🚫 취소 사유", value="참석 가능 인원이 최소 인원에 미달했습니다.", inline=False)
-                await user.send(embed=embed)
-            except Exception as e:
-                print(f"DM 전송 실패 (User {user_id}): {e}")
-
-
-@tasks.loop(minutes=1)
-async def check_reminders():
-    """1분마다 확정된 일정을 확인하고 10분 전 알람 전송"""
-    now = datetime.now()
-    schedules_to_remove = []
-
-    for schedule_id, schedule in activated_schedules.items():
-        try:
-            # 일정 시간 파싱
-            formats = ["%Y-%m-%d %H:%M", "%Y/%m/%d %H:%M", "%Y.%m.%d %H:%M", "%Y-%m-%d %H:%M:%S"]
-            schedule_time = None
-
-            for fmt in formats:
-                try:
-                    schedule_time = datetime.strptime(schedule['datetime'], fmt)
-                    break
-                except ValueError:
-                    continue
-
-            if not schedule_time:
-                print(f"⚠️ 일정 '{schedule['title']}'의 시간 형식을 파싱할 수 없습니다.")
+        for schedule_id, user_id, attending in forwarded:
+            schedule = schedule_store.get(schedule_id)
+            if schedule is None:
                 continue
 
-            # 10분 전 시간 계산
-            reminder_time = schedule_time - timedelta(minutes=10)
+            already_responded, was_cancelled, follow_up = await record_response(schedule, user_id, attending)
+            if not already_responded and not was_cancelled:
+                await job_pipeline.submit(NORMAL, follow_up, label=f"전달된 응답 처리 '{schedule.title}'")
 
-            # 현재 시간이 알람 시간을 지났고, 아직 알람을 보내지 않았다면
-            if now >= reminder_time and not schedule.get('reminder_sent'):
-                await send_reminder(schedule)
-                schedule['reminder_sent'] = True
-                schedules_to_remove.append(schedule_id)
-                print(f"⏰ 일정 '{schedule['title']}'에 대한 알람이 전송되었습니다.")
 
-        except Exception as e:
-            print(f"알람 확인 중 오류 (일정 ID: {schedule_id}): {e}")
+async def move_to_activated_queue(schedule):
+    """확정된 일정을 알람 대기 상태로 전환"""
+    schedule_id = schedule.id
 
-    # 알람을 보낸 일정들을 큐에서 제거
-    for schedule_id in schedules_to_remove:
-        del activated_schedules[schedule_id]
-        print(f"🗑️ 알람 전송 완료된 일정 '{activated_schedules.get(schedule_id, {}).get('title', schedule_id)}'이 삭제되었습니다.")
+    # 만료 마감 대신 10분 전 알람 마감 등록
+    deadline_scheduler.cancel((schedule_id, 'expire'))
+    arm_reminder(schedule)
 
+    print(f"✅ 일정 '{schedule.title}'이 확정 큐로 이동되었습니다.")
 
-@tasks.loop(minutes=1)
-async def check_expired_schedules():
-    """1분마다 대기 중인 일정을 확인하고 시간이 지난 일정 자동 취소"""
-    now = datetime.now()
-    schedules_to_cancel = []
 
-    for schedule_id, schedule in list(schedules.items()):
-        # 이미 취소된 일정은 스킵
-        if schedule.get('cancelled'):
-            continue
+async def remove_cancelled_schedule(schedule):
+    """취소된 일정을 큐에서 삭제"""
+    schedule_id = schedule.id
+    disarm_schedule(schedule_id)
 
-        try:
-            # 일정 시간 파싱
-            formats = ["%Y-%m-%d %H:%M", "%Y/%m/%d %H:%M", "%Y.%m.%d %H:%M", "%Y-%m-%d %H:%M:%S"]
-            schedule_time = None
-
-            for fmt in formats:
-                try:
-                    schedule_time = datetime.strptime(schedule['datetime'], fmt)
-                    break
-                except ValueError:
-                    continue
-
-            if not schedule_time:
-                print(f"⚠️ 일정 '{schedule['title']}'의 시간 형식을 파싱할 수 없습니다.")
-                continue
+    if finish_schedule(schedule_id, 'cancelled'):
+        print(f"❌ 취소된 일정 '{schedule.title}'이 삭제되었습니다.")
 
-            # 일정 시간이 지났다면 자동 취소
-            if now >= schedule_time:
-                schedules_to_cancel.append((schedule_id, schedule))
-                print(f"⏱️ 일정 '{schedule['title']}'의 시간이 지나 자동 취소됩니다.")
 
-        except Exception as e:
-            print(f"만료 일정 확인 중 오류 (일정 ID: {schedule_id}): {e}")
+async def update_schedule_message(schedule):
+    """그룹 채팅방의 일정 메시지 업데이트 (연속된 요청은 병합)"""
+    message_updater.request(schedule, embed_renderer.status)
 
-    # 시간이 지난 일정들 취소 처리
-    for schedule_id, schedule in schedules_to_cancel:
-        schedule['cancelled'] = True
-        await auto_cancel_schedule(schedule)
 
-        # 큐에서 제거
-        if schedule_id in schedules:
-            del schedules[schedule_id]
-            print(f"🗑️ 만료된 일정 '{schedule['title']}'이 삭제되었습니다.")
+async def notify_activation_to_user(schedule, user_id):
+    await notify_activation(schedule, [user_id])
 
 
-async def auto_cancel_schedule(schedule):
-    """시간 만료로 자동 취소된 일정 처리"""
-    # 그룹 채팅방 메시지 업데이트
+async def notify_activation(schedule, user_ids=None):
+    """일정 활성화 시 참석자들에게 DM 전송 (묶음 대기열에 넣기만 하고 전송을 기다리지 않음)"""
+    if user_ids is None:
+        user_ids = [u for u in schedule.mentioned_users if schedule.responses.get(u, False)]
+
+    embed = embed_renderer.activation(schedule)
+    dm_digest.add(user_ids, "activation", schedule, embed, f"일정 확정 '{schedule.title}'")
+
+
+async def notify_cancellation(schedule):
+    """일정 취소 시 모든 참석자들에게 DM 전송"""
+    embed = embed_renderer.cancellation(schedule)
+    return await dm_fanout.send(schedule.mentioned_users, lambda _: {'embed': embed}, f"일정 취소 '{schedule.title}'", kind="cancellation")
+
+
+def expiry_deadline(schedule):
+    """대기 중 일정의 만료 마감 (key, 시각, 콜백)"""
+    schedule_id = schedule.id
+    return (schedule_id, 'expire'), schedule.timestamp, lambda: expire_schedule(schedule_id)
+
+
+def reminder_deadline(schedule):
+    """확정된 일정의 10분 전 알람 마감 (key, 시각, 콜백)"""
+    schedule_id = schedule.id
+    return (schedule_id, 'reminder'), schedule.timestamp - REMINDER_OFFSET, lambda: remind_schedule(schedule_id)
+
+
+def arm_expiry(schedule):
+    """대기 중 일정의 시작 시각에 만료 처리 등록"""
+    deadline_scheduler.schedule(*expiry_deadline(schedule))
+
+
+def arm_reminder(schedule):
+    """확정된 일정의 10분 전 알람 등록"""
+    deadline_scheduler.schedule(*reminder_deadline(schedule))
+
+
+def finish_schedule(schedule_id, outcome: str):
+    """끝난 일정을 메모리와 캐시에서 빼고 보관 기록으로 옮김 (제거한 일정 반환)"""
+    message_updater.forget(schedule_id)
+    embed_renderer.forget(schedule_id)
+    if trace_recorder is not None:
+        trace_recorder.forget(schedule_id)
+    return schedule_store.remove(schedule_id, outcome=outcome)
+
+
+def disarm_schedule(schedule_id):
+    """일정에 등록된 모든 마감 제거"""
+    deadline_scheduler.cancel((schedule_id, 'expire'))
+    deadline_scheduler.cancel((schedule_id, 'reminder'))
+
+
+async def restore_schedules():
+    """DB 에 저장된 일정을 불러오고 알람/만료 마감을 다시 등록"""
+    for guild_id, name in (await asyncio.to_thread(schedule_writer.database.load_guild_timezones)).items():
+        try:
+            guild_timezones[guild_id] = get_timezone(name)
+        except DateTimeParseError as e:
+            print(f"길드 {guild_id} 시간대 설정 오류: {e}")
+
+    availability_store.load(
+        await asyncio.to_thread(schedule_writer.database.load_availability, shard_ownership, clock()))
+
+    restored = await asyncio.to_thread(schedule_writer.database.load_schedules, shard_ownership)
+    current = clock()
+
+    active = []
+    recurring = []
+    for schedule in restored:
+        # 취소/알람 처리 도중 종료됐거나, 꺼져 있는 동안 시작 시각이 지난 확정 일정은 (지난 일정에 알람을 보내지 않고)
+        # 보관 기록으로 옮김 (반복 일정이면 다음 회차로 이어감)
+        if schedule.cancelled or schedule.reminder_sent or (schedule.activated and schedule.timestamp <= current):
+            schedule_writer.archive(schedule, 'cancelled' if schedule.cancelled else 'completed')
+            if schedule.recurrence is not None:
+                recurring.append(schedule)
+            continue
+        active.append(schedule)
+
+    # 수십만 개의 객체를 한꺼번에 만드는 동안 순환 GC 가 방금 읽은 일정 전체를 거듭 훑지 않도록 잠시 멈춤
+    gc.disable()
     try:
-        channel = bot.get_channel(schedule['channel_id'])
-        message = await channel.fetch_message(schedule['message_id'])
-
-        embed = discord.Embed(
-            title=f"❌ {schedule['title']} (자동 취소됨)",
-            description=schedule['description'],
-            color=discord.Color.red(),
-            timestamp=datetime.now()
+        schedule_store.load(active)
+        deadline_scheduler.schedule_many(
+            reminder_deadline(schedule) if schedule.activated else expiry_deadline(schedule) for schedule in active
         )
-        embed.add_field(name="📍 날짜/시간", value=schedule['datetime'], inline=False)
-        embed.add_field(name="👥 최소 인원", value=f"{schedule['min_participants']}명", inline=True)
-        embed.add_field(name="🚫 취소 사유", value="일정 시간이 지났으나 최소 인원을 충족하지 못했습니다.", inline=False)
+    finally:
+        gc.enable()
+
+    # 복원이 끝난 뒤 다음 회차 생성은 다른 후속 작업처럼 대기열에서 처리
+    for schedule in recurring:
+        await job_pipeline.submit(BULK, schedule_next_occurrence, schedule, label=f"다음 회차 '{schedule.title}'")
+
+    print(f"💾 저장된 일정 {len(schedule_store)}개를 복원했습니다.")
+
+
+async def remind_schedule(schedule_id):
+    """확정된 일정의 10분 전 알람 전송"""
+    schedule = schedule_store.get(schedule_id)
+    if not schedule or not schedule.activated or schedule.reminder_sent:
+        return
+
+    # 보내는 도중 종료돼도 다시 보내지 않도록 전송 전에 기록
+    schedule.reminder_sent = True
+    schedule_store.save(schedule)
+    await schedule_writer.flush()
 
-        # 참석자 현황
-        attending_count = sum(1 for v in schedule['responses'].values() if v)
-        embed.add_field(name="📊 최종 현황", value=f"참석 응답: {attending_count}명 / 최소 필요: {schedule['min_participants']}명",
-                        inline=False)
-        embed.set_footer(text=f"생성자: {schedule['creator_name']}")
+    await send_reminder(schedule)
+    print(f"⏰ 일정 '{schedule.title}'에 대한 알람이 전송되었습니다.")
 
-        await message.edit(embed=embed)
+    # 알람을 보낸 일정은 큐에서 제거
+    finish_schedule(schedule_id, 'completed')
+    print(f"🗑️ 알람 전송 완료된 일정 '{schedule.title}'이 삭제되었습니다.")
+
+    await schedule_next_occurrence(schedule)
+
+
+async def expire_schedule(schedule_id):
+    """시작 시각까지 확정되지 않은 일정 자동 취소"""
+    schedule = schedule_store.get(schedule_id)
+    if not schedule or schedule.activated or schedule.cancelled:
+        return
+
+    print(f"⏱️ 일정 '{schedule.title}'의 시간이 지나 자동 취소됩니다.")
+    schedule.cancelled = True
+    schedule_store.save(schedule)
+    await auto_cancel_schedule(schedule)
+
+    # 큐에서 제거
+    if finish_schedule(schedule_id, 'expired'):
+        print(f"🗑️ 만료된 일정 '{schedule.title}'이 삭제되었습니다.")
+
+    await schedule_next_occurrence(schedule)
+
+
+async def schedule_next_occurrence(schedule):
+    """반복 일정이면 다음 회차 하나만 만들어 게시하고 초대 DM 전송"""
+    rule = schedule.recurrence
+    if rule is None:
+        return None
+
+    upcoming = rule.next_after(schedule.occurrence, clock())
+    if upcoming is None:
+        print(f"🔁 반복 일정 '{schedule.title}'의 모든 회차가 끝났습니다.")
+        return None
+
+    index, timestamp = upcoming
+    next_schedule = Schedule(
+        id=new_schedule_id(schedule.guild_id, schedule.channel_id),
+        guild_id=schedule.guild_id,
+        channel_id=schedule.channel_id,
+        title=schedule.title,
+        description=schedule.description,
+        datetime_text=display_datetime(timestamp, schedule.guild_id),
+        timestamp=timestamp,
+        min_participants=schedule.min_participants,
+        mentioned_users=schedule.mentioned_users,
+        creator_id=schedule.creator_id,
+        creator_name=schedule.creator_name,
+        recurrence=rule,
+        occurrence=index,
+        duration=schedule.duration,
+    )
+    schedule_store.add(next_schedule)
+    arm_expiry(next_schedule)
+
+    try:
+        channel = bot.get_channel(schedule.channel_id) or bot.get_partial_messageable(schedule.channel_id)
+        message = await channel.send(embed=embed_renderer.status(next_schedule))
+        next_schedule.message_id = message.id
+        schedule_store.save(next_schedule)
     except Exception as e:
-        print(f"메시지 업데이트 오류: {e}")
+        print(f"반복 일정 메시지 게시 오류: {e}")
+
+    print(f"🔁 반복 일정 '{schedule.title}'의 {index + 1}회차({next_schedule.datetime_text})를 만들었습니다.")
+    await job_pipeline.submit(BULK, send_invites, next_schedule, label=f"일정 초대 '{schedule.title}'")
+    return next_schedule
+
+
+async def send_invites(schedule):
+    """참석자들에게 참석/불참 버튼이 달린 초대 DM 전송"""
+    dm_embed = embed_renderer.invite(schedule)
+    dm_view = attendance_view(schedule.id)
+    return await dm_fanout.send(
+        schedule.mentioned_users,
+        lambda _: {'embed': dm_embed, 'view': dm_view},
+        f"일정 초대 '{schedule.title}'",
+        kind="invite"
+    )
 
-    # 참석자들에게 DM 전송
-    for user_id in schedule['mentioned_users']:
-        try:
-            user = await bot.fetch_user(user_id)
-            embed = discord.Embed(
-                title="❌ 일정이 자동 취소되었습니다",
-                description=f"**{schedule['title']}** 일정이 시간 만료로 자동 취소되었습니다.",
-                color=discord.Color.red()
-            )
-            embed.add_field(name="📍 날짜/시간", value=schedule['datetime'], inline=False)
-            embed.add_field(name="📝 설명", value=schedule['description'], inline=False)
-            embed.add_field(name="🚫 취소 사유", value="일정 시간이 지났으나 최소 인원을 충족하지 못했습니다.", inline=False)
 
-            attending_count = sum(1 for v in schedule['responses'].values() if v)
-            embed.add_field(name="📊 최종 현황", value=f"참석 응답: {attending_count}명 / 최소 필요: {schedule['min_participants']}명",
-                            inline=False)
+async def auto_cancel_schedule(schedule):
+    """시간 만료로 자동 취소된 일정 처리"""
+    # 그룹 채팅방 메시지 업데이트
+    await message_updater.flush(schedule, embed_renderer.auto_cancel)
 
-            await user.send(embed=embed)
-        except Exception as e:
-            print(f"DM 전송 실패 (User {user_id}): {e}")
+    # 참석자들에게 DM 전송
+    embed = embed_renderer.auto_cancel_notice(schedule)
+    return await dm_fanout.send(schedule.mentioned_users, lambda _: {'embed': embed}, f"자동 취소 '{schedule.title}'", kind="auto_cancel")
 
 
 async def send_reminder(schedule):
     """일정 10분 전 알람을 참석자들에게 전송"""
-    for user_id in schedule['mentioned_users']:
-        if schedule['responses'].get(user_id, False):  # 참석으로 응답한 사람만
-            try:
-                user = await bot.fetch_user(user_id)
-                embed = discord.Embed(
-                    title="⏰ 일정 알림 (10분 전)",
-                    description=f"**{schedule['title']}** 일정이 곧 시작됩니다!",
-                    color=discord.Color.orange()
-                )
-                embed.add_field(name="📍 날짜/시간", value=schedule['datetime'], inline=False)
-                embed.add_field(name="📝 설명", value=schedule['description'], inline=False)
-                embed.add_field(name="⏰", value="10분 후 시작 예정입니다.", inline=False)
-                await user.send(embed=embed)
-            except Exception as e:
-                print(f"알람 DM 전송 실패 (User {user_id}): {e}")
+    # 참석으로 응답한 사람만
+    user_ids = [u for u in schedule.mentioned_users if schedule.responses.get(u, False)]
+
+    embed = embed_renderer.reminder(schedule)
+    await dm_digest.send(user_ids, "reminder", schedule, embed, f"10분 전 알람 '{schedule.title}'")
 
 
 @bot.event
 async def on_ready():
+    if bot.startup_done:
+        print("🔄 게이트웨이에 다시 연결되었습니다.")
+        return
+    bot.startup_done = True
+    startup_profiler.mark("ready")
     print(f'{bot.user}로 로그인했습니다!')
 
-    # 백그라운드 태스크 시작
-    if not check_reminders.is_running():
-        check_reminders.start()
-        print("⏰ 알람 체크 태스크가 시작되었습니다.")
+    # 마감 스케줄러 시작
+    if not deadline_scheduler.is_running():
+        deadline_scheduler.start()
+        print("⏰ 알람/만료 스케줄러가 시작되었습니다.")
 
-    if not check_expired_schedules.is_running():
-        check_expired_schedules.start()
-        print("⏱️ 만료 일정 체크 태스크가 시작되었습니다.")
 
+@bot.event
+async def on_interaction(interaction: discord.Interaction):
+    if startup_profiler.mark("interaction"):
+        print(f"🚀 시작 프로파일 (프로세스 시작 기준):\n{startup_profiler.report()}")
+
+
+async def sync_commands():
+    """명령어 정의가 마지막 동기화 이후 바뀐 경우에만 Discord 에 등록 (해시는 DB 에 보관)"""
+    key = f"command_tree_hash:{bot.application_id}"
+    current = command_tree_hash(bot.tree)
     try:
+        if not FORCE_COMMAND_SYNC and await schedule_writer.get_meta(key) == current:
+            print("⚡ 슬래시 명령어가 바뀌지 않아 동기화를 건너뜁니다.")
+            return
+
         synced = await bot.tree.sync()
+        await schedule_writer.set_meta(key, current)
         print(f'{len(synced)}개의 슬래시 명령어가 동기화되었습니다.')
     except Exception as e:
         print(f'명령어 동기화 오류: {e}')
+    finally:
+        startup_profiler.mark("sync")
 
 
 @bot.tree.error
@@ -455,156 +678,523 @@ async def on_app_command_error(interaction: discord.Interaction, error: app_comm
 @app_commands.describe(
     제목="일정 제목",
     설명="일정 설명",
-    날짜시간="날짜와 시간 (예: 2026-01-25 18:00)",
+    날짜시간="날짜와 시간 (예: 2026-01-25 18:00, 내일 오후 7시, 30분 후)",
     최소인원="일정 확정을 위한 최소 인원",
-    참석자="참석자 멘션 (공백으로 구분, 예: @user1 @user2)"
+    참석자="참석자 멘션 (공백으로 구분, 예: @user1 @user2 @역할, @everyone)",
+    반복="반복 주기 (지정하면 한 회차가 끝날 때 다음 회차를 자동으로 만듦)",
+    반복횟수="전체 반복 횟수 (첫 회차 포함)",
+    반복종료="반복 종료 날짜 (예: 2026-06-30)",
+    소요시간="일정 길이 (분, 기본 60분), 참석자의 다른 일정과 겹치는지 확인할 때 사용"
 )
+@app_commands.choices(반복=[app_commands.Choice(name=name, value=freq) for freq, name in FREQUENCIES.items()])
+@timed_command
 async def create_schedule(
         interaction: discord.Interaction,
         제목: str,
         설명: str,
-        날짜시간: app_commands.Transform[str, DateTimeTransformer],
+        날짜시간: app_commands.Transform[datetime, DateTimeTransformer],
         최소인원: int,
-        참석자: str
+        참석자: str,
+        반복: str | None = None,
+        반복횟수: int | None = None,
+        반복종료: str | None = None,
+        소요시간: app_commands.Range[int, 1, MAX_DURATION_MINUTES] | None = None
 ):
-    # 날짜/시간 유효성 검사 (과거 시간 체크)
-    formats = ["%Y-%m-%d %H:%M", "%Y/%m/%d %H:%M", "%Y.%m.%d %H:%M", "%Y-%m-%d %H:%M:%S"]
-    schedule_time = None
+    # 날짜/시간 유효성 검사 (과거 시간 체크, 날짜시간은 변환기가 UTC 로 해석해 둠)
+    tz = guild_timezone(interaction.guild_id)
+    schedule_timestamp = 날짜시간.timestamp()
+    current = clock()
 
-    for fmt in formats:
-        try:
-            schedule_time = datetime.strptime(날짜시간, fmt)
-            break
-        except ValueError:
-            continue
-
-    if schedule_time and schedule_time <= datetime.now():
+    if schedule_timestamp <= current:
         await interaction.response.send_message(
             f"❌ 일정 시간은 현재 시간보다 이후여야 합니다.\n\n"
-            f"**입력한 시간:** {날짜시간}\n"
-            f"**현재 시간:** {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+            f"**입력한 시간:** {display_datetime(schedule_timestamp, interaction.guild_id)}\n"
+            f"**현재 시간:** {display_datetime(current, interaction.guild_id)}",
             ephemeral=True
         )
         return
 
-    # 멘션된 사용자 파싱
-    mentioned_users = []
-    for word in 참석자.split():
-        if word.startswith('<@') and word.endswith('>'):
-            user_id = int(word.strip('<@!>'))
-            mentioned_users.append(user_id)
+    if 최소인원 <= 0:
+        await interaction.response.send_message("최소 인원은 1명 이상이어야 합니다.", ephemeral=True)
+        return
+
+    # 반복 규칙
+    recurrence = None
+    if 반복 is None:
+        if 반복횟수 is not None or 반복종료 is not None:
+            await interaction.response.send_message("반복 횟수/종료 날짜는 반복 주기와 함께 지정해주세요.", ephemeral=True)
+            return
+    else:
+        until = None
+        if 반복종료 is not None:
+            try:
+                # 종료 날짜 당일의 회차까지 포함
+                until = parse_datetime(반복종료, tz, current_datetime(), default_time=dt_time(23, 59, 59)).timestamp()
+            except DateTimeParseError:
+                await interaction.response.send_message("반복 종료 날짜 형식이 올바르지 않습니다. (예: 2026-06-30)",
+                                                        ephemeral=True)
+                return
+
+        if 반복횟수 is not None and 반복횟수 < 1:
+            await interaction.response.send_message("반복 횟수는 1회 이상이어야 합니다.", ephemeral=True)
+            return
+
+        recurrence = RecurrenceRule(반복, schedule_timestamp, 반복횟수, until, tz.key)
+
+    # 멘션된 사용자 파싱 (역할/@everyone 은 멤버 캐시로 펼치고, 같은 사용자는 한 번만 포함)
+    if mention_resolver.is_cold(interaction.guild, 참석자):
+        # 멤버 목록을 받아오는 동안 응답 시간(3초)이 지나지 않도록 먼저 응답을 미룸
+        await interaction.response.defer(thinking=True)
+    mentioned_users, missing_roles = await mention_resolver.resolve(interaction.guild, 참석자)
 
     if not mentioned_users:
-        await interaction.response.send_message("참석자를 올바르게 멘션해주세요. (예: @user1 @user2)", ephemeral=True)
+        message = "참석자를 올바르게 멘션해주세요. (예: @user1 @user2 @역할)"
+        if missing_roles:
+            message += f"\n찾을 수 없는 역할: {' '.join(f'<@&{r}>' for r in missing_roles)}"
+        await reply_error(interaction, message)
         return
 
-    if 최소인원 <= 0:
-        await interaction.response.send_message("최소 인원은 1명 이상이어야 합니다.", ephemeral=True)
+    if len(mentioned_users) > MAX_INVITEES:
+        await reply_error(interaction, f"참석자는 최대 {MAX_INVITEES}명까지 초대할 수 있습니다. (입력: {len(mentioned_users)}명)")
         return
 
     if len(mentioned_users) < 최소인원:
-        await interaction.response.send_message("지정한 인원 수가 최소 인원 수를 넘지 않습니다.", ephemeral=True)
+        await reply_error(interaction, "지정한 인원 수가 최소 인원 수를 넘지 않습니다.")
         return
 
+    # 참석자별 시간 구간 인덱스로 이미 겹치는 일정이 있는 참석자 확인 (새 일정을 추가하기 전에)
+    duration = 소요시간 * 60 if 소요시간 is not None else DEFAULT_DURATION
+    conflicts = schedule_store.conflicts(mentioned_users, schedule_timestamp, schedule_timestamp + duration)
+
     # 일정 ID 생성
-    schedule_id = f"{interaction.guild.id}_{interaction.channel.id}_{datetime.now().timestamp()}"
+    schedule_id = new_schedule_id(interaction.guild.id, interaction.channel.id)
 
     # 일정 데이터 저장
-    schedule_data = {
-        'id': schedule_id,
-        'title': 제목,
-        'description': 설명,
-        'datetime': 날짜시간,
-        'min_participants': 최소인원,
-        'mentioned_users': mentioned_users,
-        'responses': {},
-        'activated': False,
-        'cancelled': False,
-        'reminder_sent': False,
-        'creator_id': interaction.user.id,
-        'creator_name': interaction.user.name,
-        'channel_id': interaction.channel.id,
-        'message_id': None
-    }
-
-    schedules[schedule_id] = schedule_data
+    schedule_data = Schedule(
+        id=schedule_id,
+        guild_id=interaction.guild.id,
+        channel_id=interaction.channel.id,
+        title=제목,
+        description=설명,
+        datetime_text=display_datetime(schedule_timestamp, interaction.guild_id),
+        timestamp=schedule_timestamp,
+        min_participants=최소인원,
+        mentioned_users=mentioned_users,
+        creator_id=interaction.user.id,
+        creator_name=interaction.user.name,
+        recurrence=recurrence,
+        duration=duration,
+    )
+
+    schedule_store.add(schedule_data)
+    arm_expiry(schedule_data)
 
     # 그룹 채팅방에 일정 메시지 게시
-    view = AttendanceButton(schedule_id)
-    embed = view.create_schedule_embed(schedule_data)
+    embed = embed_renderer.status(schedule_data)
 
-    await interaction.response.send_message(embed=embed)
+    if interaction.response.is_done():
+        message = await interaction.edit_original_response(embed=embed)
+    else:
+        await interaction.response.send_message(embed=embed)
+        message = await interaction.original_response()
 
     # 메시지 ID 저장
-    message = await interaction.original_response()
-    schedule_data['message_id'] = message.id
+    schedule_data.message_id = message.id
+    schedule_store.save(schedule_data)
 
-    # 참석자들에게 DM 전송
-    for user_id in mentioned_users:
-        try:
-            user = await bot.fetch_user(user_id)
-            dm_embed = discord.Embed(
-                title=f"📅 새로운 일정 초대",
-                description=f"**{제목}**에 초대되었습니다!",
-                color=discord.Color.blue()
+    if conflicts:
+        await interaction.followup.send(conflict_report(conflicts, interaction.guild_id), ephemeral=True)
+
+    # 참석자들에게 DM 전송 (응답은 끝났으므로 대량 작업 대기열에서 처리)
+    await job_pipeline.submit(BULK, send_invites, schedule_data, label=f"일정 초대 '{schedule_data.title}'")
+
+    if trace_recorder is not None:
+        trace_recorder.record_create(schedule_data)
+    return schedule_data
+
+
+def conflict_report(conflicts, guild_id):
+    """시간이 겹치는 일정이 있는 참석자 안내 (다른 서버 일정은 제목을 보여주지 않음)"""
+    lines = [f"⚠️ 이 일정과 시간이 겹치는 대기/확정 일정이 있는 참석자가 {len(conflicts)}명 있습니다."]
+    for user_id, schedules in list(conflicts.items())[:CONFLICT_REPORT_LIMIT]:
+        titles = [
+            f"**{s.title}** ({s.datetime_text}, {format_duration(s.duration)})" if s.guild_id == guild_id
+            else "다른 서버의 일정"
+            for s in schedules[:3]
+        ]
+        if len(schedules) > 3:
+            titles.append(f"외 {len(schedules) - 3}개")
+        lines.append(f"• <@{user_id}>: {', '.join(titles)}")
+    if len(conflicts) > CONFLICT_REPORT_LIMIT:
+        lines.append(f"… 외 {len(conflicts) - CONFLICT_REPORT_LIMIT}명")
+
+    report = "\n".join(lines)
+    return report if len(report) <= 2000 else report[:1999] + "…"
+
+
+async def reply_error(interaction: discord.Interaction, message: str):
+    """본인에게만 보이는 오류 응답 (응답을 미뤘다면 공개된 '생각 중' 메시지를 지우고 전송)"""
+    if interaction.response.is_done():
+        await interaction.delete_original_response()
+        await interaction.followup.send(message, ephemeral=True)
+    else:
+        await interaction.response.send_message(message, ephemeral=True)
+
+
+LIST_PAGE_SIZE = 10
+
+# /일정목록 상태 필터
+LIST_FILTERS = {
+    'all': "전체",
+    'pending': "대기",
+    'confirmed': "확정",
+    'cancelled': "취소",
+}
+
+
+class SchedulePageButton(discord.ui.DynamicItem[discord.ui.Button],
+                         template=r'list:(?P<status>all|pending|confirmed|cancelled):(?P<direction>next|prev):'
+                                  r'(?P<timestamp>[0-9.e+-]+):(?P<suffix>[\w.]+)'):
+    """/일정목록 이전/다음 페이지 버튼 (커서는 경계 일정의 (시작 시각, ID 끝부분))"""
+
+    def __init__(self, status: str, direction: str, cursor, disabled: bool = False):
+        timestamp, schedule_id = cursor
+        super().__init__(
+            discord.ui.Button(
+                label="◀ 이전" if direction == 'prev' else "다음 ▶",
+                style=discord.ButtonStyle.secondary,
+                # 채널/길드는 interaction 에서 알 수 있으므로 일정 ID 의 생성 시각 부분만 보관 (custom_id 100자 제한)
+                custom_id=f"list:{status}:{direction}:{timestamp!r}:{schedule_id.rsplit('_', 1)[-1]}",
+                disabled=disabled,
             )
-            dm_embed.add_field(name="📝 설명", value=설명, inline=False)
-            dm_embed.add_field(name="📍 날짜/시간", value=날짜시간, inline=False)
-            dm_embed.add_field(name="👥 최소 인원", value=f"{최소인원}명", inline=False)
-            dm_embed.set_footer(text=f"생성자: {interaction.user.name}")
-
-            dm_view = AttendanceButton(schedule_id)
-            await user.send(embed=dm_embed, view=dm_view)
-        except discord.Forbidden:
-            print(f"DM 전송 실패: {user_id} (DM 차단됨)")
-        except Exception as e:
-            print(f"DM 전송 오류: {e}")
+        )
+        self.status = status
+        self.direction = direction
+        self.cursor = cursor
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        schedule_id = f"{interaction.guild_id}_{interaction.channel_id}_{match['suffix']}"
+        return cls(match['status'], match['direction'], (float(match['timestamp']), schedule_id))
+
+    async def callback(self, interaction: discord.Interaction):
+        cursor = {'after' if self.direction == 'next' else 'before': self.cursor}
+        embed, view = render_schedule_page(interaction.channel_id, self.status, **cursor)
+        await interaction.response.edit_message(embed=embed, view=view)
+
+
+def render_schedule_page(channel_id, status: str, after=None, before=None):
+    """채널 일정 목록의 한 페이지 (페이지 크기만큼만 조회/렌더링)"""
+    schedules, start, total = schedule_store.page(
+        channel_id, None if status == 'all' else status, after=after, before=before, limit=LIST_PAGE_SIZE
+    )
+
+    # 앞 페이지의 일정이 지워져 비어버린 경우 처음부터 다시
+    if not schedules and start:
+        schedules, start, total = schedule_store.page(channel_id, None if status == 'all' else status,
+                                                      limit=LIST_PAGE_SIZE)
+
+    title = "📋 일정 목록" if status == 'all' else f"📋 일정 목록 ({LIST_FILTERS[status]})"
+    embed = discord.Embed(title=title, color=discord.Color.blue())
+
+    if not schedules:
+        embed.description = "진행 중인 일정이 없습니다." if status == 'all' else "해당하는 일정이 없습니다."
+        return embed, None
+
+    for schedule in schedules:
+        if schedule.cancelled:
+            name, value = "❌ 취소됨", f"📍 {schedule.datetime_text}\n👥 최소 {schedule.min_participants}명"
+        elif schedule.activated:
+            name, value = "✅ 확정", f"📍 {schedule.datetime_text}\n👥 참석 {schedule.attending_count}명"
+        else:
+            name = f"⏰ 대기 ({schedule.attending_count}/{schedule.min_participants})"
+            value = f"📍 {schedule.datetime_text}\n👥 최소 {schedule.min_participants}명"
+        embed.add_field(name=f"{schedule.title} - {name}"[:256], value=value, inline=False)
+
+    end = start + len(schedules)
+    embed.set_footer(text=f"{start + 1}-{end} / 전체 {total}개")
+
+    if total <= LIST_PAGE_SIZE:
+        return embed, None
+
+    first, last = schedules[0], schedules[-1]
+    view = discord.ui.View(timeout=None)
+    view.add_item(SchedulePageButton(status, 'prev', (first.timestamp, first.id), disabled=start == 0))
+    view.add_item(SchedulePageButton(status, 'next', (last.timestamp, last.id), disabled=end >= total))
+    view.stop()
+    return embed, view
 
 
 @bot.tree.command(name="일정목록", description="현재 진행 중인 일정 목록을 확인합니다")
-async def list_schedules(interaction: discord.Interaction):
-    # 대기 중 일정과 확정된 일정 모두 가져오기
-    channel_schedules = [s for s in schedules.values() if s['channel_id'] == interaction.channel.id]
-    channel_activated = [s for s in activated_schedules.values() if s['channel_id'] == interaction.channel.id]
+@app_commands.describe(상태="표시할 일정 상태 (기본: 전체)")
+@app_commands.choices(상태=[app_commands.Choice(name=name, value=key) for key, name in LIST_FILTERS.items()])
+@timed_command
+async def list_schedules(interaction: discord.Interaction, 상태: str = 'all'):
+    if trace_recorder is not None:
+        trace_recorder.record_list(interaction.guild_id, interaction.channel.id, 상태)
+    embed, view = render_schedule_page(interaction.channel.id, 상태)
+    if view is None:
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    else:
+        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
-    if not channel_schedules and not channel_activated:
-        await interaction.response.send_message("진행 중인 일정이 없습니다.", ephemeral=True)
+
+ARCHIVE_PAGE_SIZE = 10
+
+
+@bot.tree.command(name="일정기록", description="이 서버에서 끝난 일정 기록을 확인합니다")
+@app_commands.describe(
+    사용자="이 사용자가 초대된 일정만 표시",
+    시작="이 날짜 이후 일정만 (예: 2026-01-01)",
+    종료="이 날짜 이전 일정만 (예: 2026-01-31)"
+)
+@app_commands.guild_only()
+@timed_command
+async def schedule_history(interaction: discord.Interaction, 사용자: discord.Member | None = None,
+                           시작: str | None = None, 종료: str | None = None):
+    tz = guild_timezone(interaction.guild_id)
+    try:
+        since = parse_datetime(시작, tz, current_datetime(), default_time=dt_time(0, 0)).timestamp() if 시작 else None
+        until = parse_datetime(종료, tz, current_datetime(), default_time=dt_time(23, 59, 59)).timestamp() if 종료 else None
+    except DateTimeParseError as e:
+        await interaction.response.send_message(f"❌ 기간을 해석할 수 없습니다. ({e})", ephemeral=True)
         return
 
-    embed = discord.Embed(
-        title="📋 일정 목록",
-        color=discord.Color.blue()
+    # 보관 기록은 디스크에서 읽으므로 먼저 응답을 미룸
+    await interaction.response.defer(ephemeral=True, thinking=True)
+    entries, total = await schedule_writer.query_archive(
+        interaction.guild_id, 사용자.id if 사용자 else None, since, until, limit=ARCHIVE_PAGE_SIZE
     )
 
-    # 대기 중 일정
-    for schedule in channel_schedules:
-        attending_count = sum(1 for v in schedule['responses'].values() if v)
+    title = f"📚 {사용자.display_name} 님의 일정 기록" if 사용자 else "📚 일정 기록"
+    if not entries:
+        await interaction.followup.send(f"{title}\n조건에 맞는 끝난 일정이 없습니다.", ephemeral=True)
+        return
 
-        if schedule.get('cancelled'):
-            status = "❌ 취소됨"
-        else:
-            status = f"⏰ 대기 ({attending_count}/{schedule['min_participants']})"
+    embed = discord.Embed(title=title, color=discord.Color.dark_grey())
+    for entry, record in entries:
+        lines = [f"📅 {display_datetime(entry['timestamp'], interaction.guild_id)}",
+                 f"👥 참석 {entry['attending']}명 / 초대 {entry['invited']}명"]
+        if 사용자:
+            answer = entry['user_attending']
+            lines.append(f"🙋 응답: {'무응답' if answer is None else ('참석' if answer else '불참')}")
+        if record and record['description']:
+            lines.append(record['description'][:100])
+        embed.add_field(name=f"{OUTCOMES.get(entry['outcome'], entry['outcome'])} · {entry['title']}"[:256],
+                        value="\n".join(lines)[:1024], inline=False)
+    embed.set_footer(text=f"최근 {len(entries)}개 / 전체 {total}개")
+    await interaction.followup.send(embed=embed, ephemeral=True)
+
+
+@bot.tree.command(name="내일정", description="내가 초대된 다가오는 일정을 확인합니다")
+@timed_command
+async def my_schedules(interaction: discord.Interaction):
+    # 사용자 역색인으로 본인이 초대된 일정만 확인
+    current = clock()
+    upcoming = [s for s in schedule_store.for_user(interaction.user.id) if s.timestamp > current and not s.cancelled]
+    if not upcoming:
+        await interaction.response.send_message("초대된 다가오는 일정이 없습니다.", ephemeral=True)
+        return
 
+    embed = discord.Embed(title="🗓️ 내 일정", color=discord.Color.blue())
+    for schedule in heapq.nsmallest(LIST_PAGE_SIZE, upcoming, key=lambda s: (s.timestamp, s.id)):
+        answer = schedule.responses.get(interaction.user.id)
         embed.add_field(
-            name=f"{schedule['title']} - {status}",
-            value=f"📍 {schedule['datetime']}\n👥 최소 {schedule['min_participants']}명",
+            name=f"{schedule.title} - {LIST_FILTERS[schedule.status]}"[:256],
+            value=(f"📍 {display_datetime(schedule.timestamp, schedule.guild_id)} · <#{schedule.channel_id}>\n"
+                   f"🙋 내 응답: {'미응답' if answer is None else ('참석' if answer else '불참')}"),
             inline=False
         )
 
-    # 확정된 일정
-    for schedule in channel_activated:
-        attending_count = sum(1 for v in schedule['responses'].values() if v)
-        status = "✅ 확정"
+    footer = f"{min(len(upcoming), LIST_PAGE_SIZE)} / 전체 {len(upcoming)}개"
+    if not shard_ownership.owns_all:
+        footer += " (이 프로세스가 맡은 서버의 일정만 표시)"
+    embed.set_footer(text=footer)
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+@bot.tree.command(name="가능시간", description="시간 추천에 쓸 내 가능 시간을 등록합니다")
+@app_commands.describe(
+    시작="가능한 시간 시작 (예: 2026-01-25 18:00, 내일 오후 7시)",
+    종료="가능한 시간 끝 (예: 2026-01-25 23:00)",
+    삭제="등록한 가능 시간에서 이 구간을 뺌"
+)
+@app_commands.guild_only()
+@timed_command
+async def register_availability(
+        interaction: discord.Interaction,
+        시작: app_commands.Transform[datetime, DateTimeTransformer],
+        종료: app_commands.Transform[datetime, DateTimeTransformer],
+        삭제: bool = False
+):
+    start, end = 시작.timestamp(), 종료.timestamp()
+    current = clock()
+    horizon_end = current + HORIZON_DAYS * 86400
+
+    if end <= start:
+        await interaction.response.send_message("종료 시간은 시작 시간보다 이후여야 합니다.", ephemeral=True)
+        return
+    if end <= current or start >= horizon_end:
+        await interaction.response.send_message(f"가능 시간은 지금부터 {HORIZON_DAYS}일 안으로 지정해주세요.",
+                                                ephemeral=True)
+        return
+
+    start, end = max(start, current), min(end, horizon_end)
+    if 삭제:
+        availability_store.remove(interaction.guild_id, interaction.user.id, start, end, current)
+    else:
+        availability_store.add(interaction.guild_id, interaction.user.id, start, end, current)
+
+    intervals = availability_store.intervals(interaction.guild_id, interaction.user.id)
+    lines = [f"🗓️ 가능 시간을 {'삭제' if 삭제 else '등록'}했습니다. (등록된 구간 {len(intervals)}개)"]
+    lines += [f"• {display_datetime(s, interaction.guild_id)} ~ {display_datetime(e, interaction.guild_id)}"
+              for s, e in intervals[:LIST_PAGE_SIZE]]
+    if len(intervals) > LIST_PAGE_SIZE:
+        lines.append(f"… 외 {len(intervals) - LIST_PAGE_SIZE}개")
+    await interaction.response.send_message("\n".join(lines), ephemeral=True)
+
+
+@bot.tree.command(name="시간추천", description="참석자들이 등록한 가능 시간으로 일정 시간을 추천합니다")
+@app_commands.describe(
+    참석자="참석자 멘션 (공백으로 구분, 예: @user1 @user2 @역할, @everyone)",
+    최소인원="함께 가능해야 하는 최소 인원",
+    소요시간="일정 길이 (분, 기본 60분)",
+    기간=f"지금부터 며칠 안에서 찾을지 (기본 {SUGGEST_DAYS}일)"
+)
+@app_commands.guild_only()
+@timed_command
+async def suggest_time(
+        interaction: discord.Interaction,
+        참석자: str,
+        최소인원: int,
+        소요시간: app_commands.Range[int, 1, MAX_DURATION_MINUTES] | None = None,
+        기간: app_commands.Range[int, 1, HORIZON_DAYS] = SUGGEST_DAYS
+):
+    if 최소인원 <= 0:
+        await interaction.response.send_message("최소 인원은 1명 이상이어야 합니다.", ephemeral=True)
+        return
+
+    if mention_resolver.is_cold(interaction.guild, 참석자):
+        await interaction.response.defer(thinking=True)
+    user_ids, _ = await mention_resolver.resolve(interaction.guild, 참석자)
 
+    if not user_ids:
+        await reply_error(interaction, "참석자를 올바르게 멘션해주세요. (예: @user1 @user2 @역할)")
+        return
+    if len(user_ids) < 최소인원:
+        await reply_error(interaction, "지정한 인원 수가 최소 인원 수를 넘지 않습니다.")
+        return
+
+    # 지금 이후 첫 칸부터 기간 동안을 칸 단위 비트로 표시 (bit i = base + i 번째 칸)
+    duration = 소요시간 * 60 if 소요시간 is not None else DEFAULT_DURATION
+    length = -(-duration // SLOT_SECONDS)
+    base, _ = slot_range(clock(), clock())
+    width = 기간 * 86400 // SLOT_SECONDS
+
+    # 가능 시간에서 이미 대기/확정 일정이 있는 칸은 뺌 (참석자별 시간 구간 인덱스로 기간 안의 일정만 확인)
+    busy = schedule_store.conflicts(user_ids, base * SLOT_SECONDS, (base + width) * SLOT_SECONDS)
+    free = []
+    for user_id in user_ids:
+        bits = availability_store.bitset(interaction.guild_id, user_id, base, width)
+        for schedule in busy.get(user_id, ()):
+            bits &= ~range_mask(*slot_range(schedule.timestamp, schedule.end, inside=False), base, width)
+        free.append(bits)
+
+    picked = best_slots(free, 최소인원, length, width, SUGGEST_LIMIT)
+    unregistered = sum(1 for user_id in user_ids if (interaction.guild_id, user_id) not in availability_store)
+    if not picked:
+        message = f"❌ {기간}일 안에 {최소인원}명 이상이 {format_duration(duration)} 동안 함께 가능한 시간이 없습니다."
+        if unregistered:
+            message += f"\n(가능 시간을 등록하지 않은 참석자 {unregistered}명, `/가능시간` 으로 등록할 수 있습니다.)"
+        await reply_error(interaction, message)
+        return
+
+    embed = discord.Embed(
+        title="🕒 추천 시간",
+        description=f"참석자 {len(user_ids)}명 중 {최소인원}명 이상이 {format_duration(duration)} 동안 가능한 시간입니다.",
+        color=discord.Color.blue()
+    )
+    run_mask = (1 << length) - 1
+    for rank, (slot, count) in enumerate(picked, 1):
+        start = (base + slot) * SLOT_SECONDS
+        available = [user_id for user_id, bits in zip(user_ids, free) if bits >> slot & run_mask == run_mask]
         embed.add_field(
-            name=f"{schedule['title']} - {status}",
-            value=f"📍 {schedule['datetime']}\n👥 참석 {attending_count}명",
+            name=f"{rank}. {display_datetime(start, interaction.guild_id)} ({count}/{len(user_ids)}명 가능)",
+            value=chunk_mentions(available, 1, 900, sep=" ")[0],
             inline=False
         )
 
-    await interaction.response.send_message(embed=embed, ephemeral=True)
+    footer = "/일정생성 의 날짜시간에 추천 시간을 입력해 일정을 만들 수 있습니다."
+    if unregistered:
+        footer += f" (가능 시간을 등록하지 않은 참석자 {unregistered}명)"
+    embed.set_footer(text=footer)
+
+    if interaction.response.is_done():
+        await interaction.edit_original_response(embed=embed)
+    else:
+        await interaction.response.send_message(embed=embed)
+
+
+@functools.cache
+def timezone_names():
+    """시간대 이름 목록 (tzdata 전체를 훑으므로 처음 자동완성할 때 한 번만 만듦)"""
+    from zoneinfo import available_timezones
+    return sorted(available_timezones())
+
+
+@bot.tree.command(name="시간대설정", description="이 서버에서 날짜/시간을 해석할 시간대를 설정합니다")
+@app_commands.describe(시간대="IANA 시간대 이름 (예: Asia/Seoul, America/New_York)")
+@app_commands.default_permissions(manage_guild=True)
+@app_commands.guild_only()
+@timed_command
+async def set_timezone(interaction: discord.Interaction, 시간대: str):
+    try:
+        tz = get_timezone(시간대)
+    except DateTimeParseError as e:
+        await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+        return
+
+    guild_timezones[interaction.guild_id] = tz
+    schedule_writer.save_guild_timezone(interaction.guild_id, tz.key)
+    await interaction.response.send_message(
+        f"🕒 시간대를 **{tz.key}** 로 설정했습니다. (현재 시각: {format_datetime(clock(), tz)})\n"
+        f"이후 만드는 일정부터 적용됩니다.",
+        ephemeral=True
+    )
+
+
+@set_timezone.autocomplete("시간대")
+async def timezone_autocomplete(interaction: discord.Interaction, current: str):
+    current = current.lower()
+    matches = [name for name in timezone_names() if current in name.lower()]
+    return [app_commands.Choice(name=name, value=name) for name in matches[:25]]
+
+
+@bot.tree.command(name="메트릭", description="봇 성능 지표를 확인합니다 (관리자 전용)")
+@app_commands.default_permissions(administrator=True)
+@app_commands.guild_only()
+@timed_command
+async def show_metrics(interaction: discord.Interaction):
+    def ms(histogram, q):
+        value = histogram.quantile(q)
+        return "-" if value is None else ("+Inf" if value == float("inf") else f"≤{value * 1000:g}ms")
+
+    lines = [
+        f"진행 중 일정: {len(schedule_store)}개 / 등록된 마감: {len(deadline_scheduler)}개",
+        f"명령어 처리: {COMMAND_SECONDS.count()}회 (p50 {ms(COMMAND_SECONDS, 0.5)}, p99 {ms(COMMAND_SECONDS, 0.99)})",
+        f"버튼 응답: {BUTTON_ACK_SECONDS.count()}회 (p50 {ms(BUTTON_ACK_SECONDS, 0.5)}, p99 {ms(BUTTON_ACK_SECONDS, 0.99)})",
+        f"알람/만료 지연: p50 {ms(DEADLINE_LATENESS_SECONDS, 0.5)}, p99 {ms(DEADLINE_LATENESS_SECONDS, 0.99)}",
+        f"알람/만료 처리 시간: p50 {ms(DEADLINE_CALLBACK_SECONDS, 0.5)}, p99 {ms(DEADLINE_CALLBACK_SECONDS, 0.99)}",
+        f"DM 전송: 성공 {DM_TOTAL.total(result='delivered')}건 / 실패 {DM_TOTAL.total(result='failed')}건",
+        f"Rate limit(429): {RATE_LIMIT_HITS.total()}회",
+        f"후속 작업: 대기 {len(job_pipeline)}건, 대기 시간 p50 {ms(JOB_WAIT_SECONDS, 0.5)}, p99 {ms(JOB_WAIT_SECONDS, 0.99)}",
+        f"사용자 캐시: 적중 {user_cache.hits} / 미스 {user_cache.misses} / 병합 {user_cache.coalesced}",
+        "시작 시간: " + ", ".join(f"{phase} {elapsed:.2f}s" for phase, elapsed in startup_profiler.phases.items()),
+    ]
+    await interaction.response.send_message("📊 **봇 지표**\n```\n" + "\n".join(lines) + "\n```", ephemeral=True)
 
 
 # 봇 실행
 if __name__ == '__main__':
+    startup_profiler.mark("import")
     bot.run(BOT_TOKEN)
\ No newline at end of file
@@ -0,0 +1,67 @@
+import asyncio
+import re
+
+# 사용자 / 역할 멘션과 @everyone 을 한 번에 찾음
+MENTION_PATTERN = re.compile(r"<@!?(?P<user>\d+)>|<@&(?P<role>\d+)>|(?P<everyone>@everyone)")
+
+
+def needs_members(text: str):
+    """역할/@everyone 멘션이 있어 길드 멤버 목록이 필요한지"""
+    return "<@&" in text or "@everyone" in text
+
+
+class MentionResolver:
+    """참석자 입력의 사용자/역할/@everyone 멘션을 사용자 ID 목록으로 펼침
+
+    역할 멤버는 게이트웨이 멤버 캐시에서만 읽는다. 캐시가 비어 있으면 길드 단위로 한 번만
+    게이트웨이 chunk 요청을 보내고, 멤버마다 REST 조회를 하지는 않는다.
+    """
+
+    def __init__(self):
+        self._chunking = {}  # guild_id -> 진행 중인 chunk 요청
+        self.chunk_requests = 0
+
+    def is_cold(self, guild, text: str):
+        """펼치기 전에 멤버 목록을 받아와야 하는지 (오래 걸릴 수 있어 응답을 미뤄야 함)"""
+        return needs_members(text) and not guild.chunked
+
+    async def ensure_members(self, guild):
+        """길드 멤버 캐시 채우기 (같은 길드의 동시 요청은 하나로 합침)"""
+        if guild.chunked:
+            return
+
+        task = self._chunking.get(guild.id)
+        if task is None:
+            self.chunk_requests += 1
+            task = self._chunking[guild.id] = asyncio.create_task(guild.chunk(cache=True))
+            task.add_done_callback(lambda _: self._chunking.pop(guild.id, None))
+        await asyncio.shield(task)
+
+    async def resolve(self, guild, text: str):
+        """(사용자 ID 목록, 찾지 못한 역할 ID 목록) 반환 (입력 순서 유지, 중복/봇 제외)"""
+        if guild is not None and self.is_cold(guild, text):
+            await self.ensure_members(guild)
+
+        user_ids = {}
+        missing_roles = []
+        for match in MENTION_PATTERN.finditer(text):
+            if match['user']:
+                user_ids[int(match['user'])] = None
+                continue
+            if guild is None:
+                continue
+
+            if match['everyone']:
+                members = guild.members
+            else:
+                role = guild.get_role(int(match['role']))
+                if role is None:
+                    missing_roles.append(int(match['role']))
+                    continue
+                members = role.members
+
+            for member in members:
+                if not member.bot:
+                    user_ids[member.id] = None
+
+        return list(user_ids), missing_roles
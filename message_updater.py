@@ -0,0 +1,76 @@
+import asyncio
+import time
+
+
+class MessageEditCoalescer:
+    """일정별 그룹 메시지 수정 요청을 모아 window 초에 최대 한 번만 수정"""
+
+    def __init__(self, bot, window: float = 1.0):
+        self.bot = bot
+        self.window = window
+
+        self._pending = {}  # schedule_id -> (schedule, render) 가장 최근 요청
+        self._tasks = {}  # schedule_id -> 수정 태스크
+        self._last_edit = {}  # schedule_id -> 마지막 수정 시각 (monotonic)
+        self._messages = {}  # schedule_id -> PartialMessage
+        self._forgotten = set()
+
+    def request(self, schedule, render):
+        """수정 요청 등록 (실제 수정 시점에 render(schedule) 로 최신 상태를 그림)"""
+        self._pending[schedule.id] = (schedule, render)
+        task = self._tasks.get(schedule.id)
+        if task is None:
+            task = self._tasks[schedule.id] = asyncio.create_task(self._run(schedule.id))
+        return task
+
+    async def flush(self, schedule, render):
+        """수정 요청을 등록하고 반영될 때까지 대기"""
+        await asyncio.shield(self.request(schedule, render))
+
+    async def drain(self):
+        """대기 중인 수정을 모두 반영"""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks.values()), return_exceptions=True)
+
+    def forget(self, schedule_id):
+        """더 이상 수정하지 않을 일정의 캐시 정리 (진행 중인 수정은 끝까지 반영)"""
+        if schedule_id in self._tasks:
+            self._forgotten.add(schedule_id)
+        else:
+            self._drop(schedule_id)
+
+    def _drop(self, schedule_id):
+        self._last_edit.pop(schedule_id, None)
+        self._messages.pop(schedule_id, None)
+        self._forgotten.discard(schedule_id)
+
+    def _partial_message(self, schedule):
+        message = self._messages.get(schedule.id)
+        if message is None:
+            # REST 조회 없이 채널/메시지 ID 만으로 수정 가능한 PartialMessage 생성
+            channel = self.bot.get_channel(schedule.channel_id) or self.bot.get_partial_messageable(schedule.channel_id)
+            message = self._messages[schedule.id] = channel.get_partial_message(schedule.message_id)
+        return message
+
+    async def _run(self, schedule_id):
+        try:
+            while schedule_id in self._pending:
+                wait = self._last_edit.get(schedule_id, 0) + self.window - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+                # 대기하는 동안 들어온 요청까지 반영된 최신 상태로 한 번만 수정
+                schedule, render = self._pending.pop(schedule_id)
+                if schedule.message_id is None:
+                    continue
+
+                try:
+                    await self._partial_message(schedule).edit(embed=render(schedule))
+                except Exception as e:
+                    print(f"메시지 업데이트 오류: {e}")
+                finally:
+                    self._last_edit[schedule_id] = time.monotonic()
+        finally:
+            del self._tasks[schedule_id]
+            if schedule_id in self._forgotten:
+                self._drop(schedule_id)
@@ -0,0 +1,217 @@
+import time
+from contextlib import contextmanager
+
+from aiohttp import web
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = [*zip(labelnames, values), *extra]
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    type = None
+
+    def __init__(self, registry, name: str, help: str, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        registry.register(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: 라벨 {self.labelnames} 이 필요합니다 (입력: {tuple(labels)})")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, registry, name, help, labelnames=()):
+        super().__init__(registry, name, help, labelnames)
+        self._values = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def total(self, **labels):
+        """주어진 라벨이 일치하는 시계열 합계 (라벨 생략 시 전체)"""
+        positions = [(self.labelnames.index(n), str(v)) for n, v in labels.items()]
+        return sum(value for key, value in self._values.items() if all(key[i] == v for i, v in positions))
+
+    def samples(self):
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(Metric):
+    """수집 시점에 함수를 호출해 값을 읽는 게이지"""
+    type = "gauge"
+
+    def __init__(self, registry, name, help, function):
+        super().__init__(registry, name, help)
+        self.function = function
+
+    def samples(self):
+        yield f"{self.name} {_format_value(self.function())}"
+
+
+class CallbackCounter(Metric):
+    """수집 시점에 함수를 호출해 누적 값을 읽는 카운터 (다른 객체가 직접 세는 값을 노출)"""
+    type = "counter"
+
+    def __init__(self, registry, name, help, function):
+        super().__init__(registry, name, help)
+        self.function = function
+
+    def samples(self):
+        yield f"{self.name} {_format_value(self.function())}"
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, registry, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series = {}  # key -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+                break
+        series[-2] += value
+        series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self):
+        return sum(series[-1] for series in self._series.values())
+
+    def quantile(self, q: float):
+        """버킷 경계 기준 근사 분위수 (모든 라벨 합산)"""
+        total = self.count()
+        if not total:
+            return None
+
+        target = q * total
+        cumulative = 0
+        for i, bound in enumerate(self.buckets):
+            cumulative += sum(series[i] for series in self._series.values())
+            if cumulative >= target:
+                return bound
+        return self.buckets[-1]
+
+    def samples(self):
+        for key, series in sorted(self._series.items()):
+            cumulative = 0
+            for i, bound in enumerate(self.buckets):
+                cumulative += series[i]
+                labels = _format_labels(self.labelnames, key, [("le", _format_value(bound))])
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(series[-2])}"
+            yield f"{self.name}_count{labels} {series[-1]}"
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric: Metric):
+        self.metrics.append(metric)
+
+    def render(self):
+        """Prometheus 텍스트 형식으로 출력"""
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """/metrics 경로로 레지스트리를 노출하는 로컬 HTTP 서버"""
+
+    def __init__(self, registry: Registry, host: str, port: int):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._runner = None
+
+    async def _handle(self, request):
+        return web.Response(text=self.registry.render(), content_type="text/plain", charset="utf-8",
+                            headers={"X-Content-Type-Options": "nosniff"})
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+# 봇 전역 지표
+registry = Registry()
+
+COMMAND_SECONDS = Histogram(
+    registry, "schedule_bot_command_seconds", "슬래시 명령어 처리 시간", ["command"]
+)
+BUTTON_ACK_SECONDS = Histogram(
+    registry, "schedule_bot_button_ack_seconds", "참석/불참 버튼 클릭부터 응답(ack)까지 걸린 시간"
+)
+DEADLINE_LATENESS_SECONDS = Histogram(
+    registry, "schedule_bot_deadline_lateness_seconds", "알람/만료 마감 시각 대비 실제 처리 지연", ["kind"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 60.0)
+)
+DEADLINE_CALLBACK_SECONDS = Histogram(
+    registry, "schedule_bot_deadline_callback_seconds", "알람/만료 처리 한 번에 걸린 시간", ["kind"]
+)
+DM_TOTAL = Counter(
+    registry, "schedule_bot_dm_total", "DM 전송 결과", ["notification", "result"]
+)
+RATE_LIMIT_HITS = Counter(
+    registry, "schedule_bot_rate_limit_hits_total", "Discord 429 응답 횟수 (discord.http 경고 로그 기준)", ["scope"]
+)
+JOB_WAIT_SECONDS = Histogram(
+    registry, "schedule_bot_job_wait_seconds", "후속 작업이 대기열에서 기다린 시간", ["lane"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 60.0)
+)
+JOBS_TOTAL = Counter(
+    registry, "schedule_bot_jobs_total", "처리한 후속 작업 수", ["lane", "result"]
+)
@@ -0,0 +1,328 @@
+import asyncio
+import bisect
+from collections import defaultdict
+from dataclasses import dataclass, field
+from operator import itemgetter
+
+from recurrence import RecurrenceRule
+
+# 소요 시간을 지정하지 않은 일정의 길이 (초)
+DEFAULT_DURATION = 60 * 60
+
+
+@dataclass(slots=True)
+class Schedule:
+    """일정 레코드 (시작 시각은 생성 시 한 번만 파싱해 epoch 로 보관)"""
+    id: str
+    guild_id: int
+    channel_id: int
+    title: str
+    description: str
+    datetime_text: str
+    timestamp: float
+    min_participants: int
+    mentioned_users: list
+    creator_id: int
+    creator_name: str
+    responses: dict = field(default_factory=dict)
+    activated: bool = False
+    cancelled: bool = False
+    reminder_sent: bool = False
+    message_id: int | None = None
+
+    # 반복 일정: 규칙 하나만 보관하고 다음 회차는 현재 회차가 끝날 때 만듦
+    recurrence: RecurrenceRule | None = None
+    occurrence: int = 0  # 현재 회차 번호 (0부터)
+
+    duration: int = DEFAULT_DURATION  # 소요 시간 (초)
+
+    # 응답 집계 (응답이 바뀔 때마다 증분 갱신)
+    attending_count: int = field(default=0, init=False)
+    declined_count: int = field(default=0, init=False)
+
+    # 상태가 바뀔 때마다 증가 (임베드 캐시 무효화 기준)
+    version: int = field(default=0, init=False)
+
+    def __post_init__(self):
+        for attending in self.responses.values():
+            if attending:
+                self.attending_count += 1
+            else:
+                self.declined_count += 1
+
+    @property
+    def status(self):
+        """목록 필터용 상태 (pending / confirmed / cancelled)"""
+        if self.cancelled:
+            return 'cancelled'
+        return 'confirmed' if self.activated else 'pending'
+
+    @property
+    def end(self):
+        return self.timestamp + self.duration
+
+    @property
+    def pending_count(self):
+        return len(self.mentioned_users) - self.attending_count - self.declined_count
+
+    def touch(self):
+        self.version += 1
+
+    def record_response(self, user_id, attending: bool):
+        self.touch()
+        previous = self.responses.get(user_id)
+        if previous is not None:
+            if previous:
+                self.attending_count -= 1
+            else:
+                self.declined_count -= 1
+
+        self.responses[user_id] = attending
+        if attending:
+            self.attending_count += 1
+        else:
+            self.declined_count += 1
+
+
+class IntervalIndex:
+    """키(사용자)별 구간을 시작 시각순 정렬 리스트로 보관하고 겹치는 구간을 찾음
+
+    겹치는 구간은 시작 시각이 (찾는 구간 시작 - 그 키의 가장 긴 구간 길이) 이후여야 하므로, 이분 탐색으로
+    그 범위만 보면 된다. (키별 구간 수 n, 겹치는 구간 수 k 에 대해 O(log n + k))
+    """
+
+    def __init__(self):
+        self._intervals = {}  # key -> [(start, end, item)] 정렬 리스트
+        self._longest = {}  # key -> 지금까지 추가된 가장 긴 구간 길이 (제거해도 줄이지 않음)
+
+    def add(self, key, start: float, end: float, item):
+        bisect.insort(self._intervals.setdefault(key, []), (start, end, item))
+        self._longest[key] = max(self._longest.get(key, 0), end - start)
+
+    def load(self, grouped, longest: float | None = None):
+        """키별 (start, end, item) 목록을 한꺼번에 추가 (키마다 한 번씩만 정렬)
+
+        longest 를 주면 키마다 구간 길이를 다시 훑지 않고 그 값을 가장 긴 구간 길이로 쓴다. (전체 최댓값처럼
+        실제보다 길어도 조회 범위만 조금 넓어질 뿐 결과는 같음)
+        """
+        for key, entries in grouped.items():
+            intervals = self._intervals.get(key)
+            if intervals is None:
+                intervals = self._intervals[key] = entries
+            else:
+                intervals.extend(entries)
+            intervals.sort()
+            length = longest if longest is not None else max(e - s for s, e, _ in entries)
+            self._longest[key] = max(self._longest.get(key, 0), length)
+
+    def remove(self, key, start: float, end: float, item):
+        intervals = self._intervals.get(key)
+        if not intervals:
+            return
+        entry = (start, end, item)
+        index = bisect.bisect_left(intervals, entry)
+        if index < len(intervals) and intervals[index] == entry:
+            del intervals[index]
+        if not intervals:
+            del self._intervals[key]
+            del self._longest[key]
+
+    def overlapping(self, key, start: float, end: float):
+        """[start, end) 와 겹치는 구간의 item 목록 (시작 시각순)"""
+        intervals = self._intervals.get(key)
+        if not intervals:
+            return []
+        lo = bisect.bisect_right(intervals, (start - self._longest[key], float('inf')))
+        hi = bisect.bisect_left(intervals, (end,))
+        return [item for s, e, item in intervals[lo:hi] if e > start]
+
+
+class ScheduleStore:
+    """일정 저장소 (길드/채널별 보조 인덱스 유지, writer 가 있으면 변경 사항을 영속화)"""
+
+    def __init__(self, writer=None):
+        self.writer = writer
+        self._schedules = {}
+        self._by_guild = {}  # guild_id -> {schedule_id: None} (삽입 순서 유지)
+        self._by_channel = {}  # channel_id -> {schedule_id: None}
+        self._by_user = {}  # 초대된 user_id -> {schedule_id: None} (역색인)
+        self._busy = IntervalIndex()  # 초대된 user_id -> 일정 시간 구간 (일정 충돌 확인용)
+        self._locks = {}  # schedule_id -> asyncio.Lock
+
+        # 채널별 시작 시각순 인덱스: (channel_id, 상태 또는 None) -> [(timestamp, schedule_id)] 정렬 리스트
+        self._timeline = {}
+        self._indexed_status = {}  # schedule_id -> 인덱스에 반영된 상태
+
+    def __len__(self):
+        return len(self._schedules)
+
+    def __contains__(self, schedule_id):
+        return schedule_id in self._schedules
+
+    def __iter__(self):
+        return iter(self._schedules.values())
+
+    def get(self, schedule_id):
+        return self._schedules.get(schedule_id)
+
+    def lock(self, schedule_id):
+        """일정별 상태 변경 잠금"""
+        lock = self._locks.get(schedule_id)
+        if lock is None:
+            lock = self._locks[schedule_id] = asyncio.Lock()
+        return lock
+
+    def add(self, schedule: Schedule, persist: bool = True):
+        self._schedules[schedule.id] = schedule
+        self._by_guild.setdefault(schedule.guild_id, {})[schedule.id] = None
+        self._by_channel.setdefault(schedule.channel_id, {})[schedule.id] = None
+        for user_id in schedule.mentioned_users:
+            self._by_user.setdefault(user_id, {})[schedule.id] = None
+            self._busy.add(user_id, schedule.timestamp, schedule.end, schedule.id)
+
+        key = (schedule.timestamp, schedule.id)
+        bisect.insort(self._timeline.setdefault((schedule.channel_id, None), []), key)
+        bisect.insort(self._timeline.setdefault((schedule.channel_id, schedule.status), []), key)
+        self._indexed_status[schedule.id] = schedule.status
+
+        if persist:
+            self.save(schedule)
+
+    def load(self, schedules):
+        """DB 에서 복원한 일정을 한꺼번에 추가 (저장하지 않음)
+
+        일정마다 정렬 리스트에 insort 하면 복원이 O(n²) 이 되므로, 모두 덧붙인 뒤 리스트마다 한 번씩만 정렬한다.
+        """
+        busy = defaultdict(list)  # user_id -> [(start, end, schedule_id)]
+        longest = 0
+        for schedule in schedules:
+            schedule_id = schedule.id
+            start = schedule.timestamp
+            self._schedules[schedule_id] = schedule
+            self._by_guild.setdefault(schedule.guild_id, {})[schedule_id] = None
+            self._by_channel.setdefault(schedule.channel_id, {})[schedule_id] = None
+
+            # 참석자마다 구간 하나만 덧붙이고, 사용자 색인은 모은 구간으로 끝에 한 번에 만듦
+            interval = (start, start + schedule.duration, schedule_id)
+            for user_id in schedule.mentioned_users:
+                busy[user_id].append(interval)
+            if schedule.duration > longest:
+                longest = schedule.duration
+
+            key = (start, schedule_id)
+            status = schedule.status
+            self._timeline.setdefault((schedule.channel_id, None), []).append(key)
+            self._timeline.setdefault((schedule.channel_id, status), []).append(key)
+            self._indexed_status[schedule_id] = status
+
+        schedule_ids = itemgetter(2)
+        for user_id, intervals in busy.items():
+            ids = self._by_user.get(user_id)
+            if ids is None:
+                self._by_user[user_id] = dict.fromkeys(map(schedule_ids, intervals))
+            else:
+                ids.update(dict.fromkeys(map(schedule_ids, intervals)))
+
+        for timeline in self._timeline.values():
+            timeline.sort()
+        self._busy.load(busy, longest)
+
+    def save(self, schedule: Schedule):
+        """일정 상태 변경 사항 저장"""
+        schedule.touch()
+
+        # 확정/취소로 상태가 바뀌었으면 상태별 인덱스 이동
+        previous = self._indexed_status.get(schedule.id)
+        if previous is not None and previous != schedule.status:
+            key = (schedule.timestamp, schedule.id)
+            self._unindex(schedule.channel_id, previous, key)
+            bisect.insort(self._timeline.setdefault((schedule.channel_id, schedule.status), []), key)
+            self._indexed_status[schedule.id] = schedule.status
+
+        if self.writer is not None:
+            self.writer.save(schedule)
+
+    def record_response(self, schedule: Schedule, user_id, attending: bool):
+        schedule.record_response(user_id, attending)
+        if self.writer is not None:
+            self.writer.save_response(schedule.id, user_id, attending)
+
+    def remove(self, schedule_id, outcome: str | None = None):
+        """메모리에서 일정 제거 (outcome 이 있으면 DB 에서 지우는 대신 보관 기록으로 옮김)"""
+        schedule = self._schedules.pop(schedule_id, None)
+        if schedule is None:
+            return None
+
+        self._locks.pop(schedule_id, None)
+
+        self._discard(self._by_guild, schedule.guild_id, schedule_id)
+        self._discard(self._by_channel, schedule.channel_id, schedule_id)
+        for user_id in schedule.mentioned_users:
+            self._discard(self._by_user, user_id, schedule_id)
+            self._busy.remove(user_id, schedule.timestamp, schedule.end, schedule_id)
+
+        key = (schedule.timestamp, schedule_id)
+        self._unindex(schedule.channel_id, None, key)
+        self._unindex(schedule.channel_id, self._indexed_status.pop(schedule_id, None), key)
+
+        if self.writer is not None:
+            if outcome is None:
+                self.writer.delete(schedule_id)
+            else:
+                self.writer.archive(schedule, outcome)
+        return schedule
+
+    def for_guild(self, guild_id):
+        return [self._schedules[i] for i in self._by_guild.get(guild_id, ())]
+
+    def for_channel(self, channel_id):
+        return [self._schedules[i] for i in self._by_channel.get(channel_id, ())]
+
+    def for_user(self, user_id):
+        """사용자가 초대된 일정 (전체 일정 수와 관계없이 그 사용자의 일정 수만큼만 확인)"""
+        return [self._schedules[i] for i in self._by_user.get(user_id, ())]
+
+    def conflicts(self, user_ids, start: float, end: float):
+        """[start, end) 에 이미 대기/확정 일정이 있는 사용자 -> 겹치는 일정 목록 (불참한 일정은 제외)"""
+        result = {}
+        for user_id in user_ids:
+            overlapping = [self._schedules[i] for i in self._busy.overlapping(user_id, start, end)]
+            overlapping = [s for s in overlapping if not s.cancelled and s.responses.get(user_id) is not False]
+            if overlapping:
+                result[user_id] = overlapping
+        return result
+
+    def page(self, channel_id, status=None, after=None, before=None, limit: int = 10):
+        """채널 일정을 시작 시각순으로 limit 개씩 조회 (커서는 (timestamp, schedule_id))
+
+        after 가 있으면 그 다음부터, before 가 있으면 그 이전 limit 개를 돌려준다.
+        반환값: (일정 목록, 페이지 시작 위치, 전체 개수)
+        """
+        timeline = self._timeline.get((channel_id, status), ())
+        if before is not None:
+            end = bisect.bisect_left(timeline, before)
+            start = max(0, end - limit)
+        else:
+            start = bisect.bisect_right(timeline, after) if after is not None else 0
+            end = start + limit
+
+        return [self._schedules[i] for _, i in timeline[start:end]], start, len(timeline)
+
+    def _unindex(self, channel_id, status, key):
+        timeline = self._timeline.get((channel_id, status))
+        if not timeline:
+            return
+        index = bisect.bisect_left(timeline, key)
+        if index < len(timeline) and timeline[index] == key:
+            del timeline[index]
+        if not timeline:
+            del self._timeline[(channel_id, status)]
+
+    @staticmethod
+    def _discard(index, key, schedule_id):
+        ids = index.get(key)
+        if ids is None:
+            return
+        ids.pop(schedule_id, None)
+        if not ids:
+            del index[key]
@@ -0,0 +1,94 @@
+import calendar
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+FREQUENCIES = {
+    'daily': "매일",
+    'weekly': "매주",
+    'monthly': "매월",
+}
+
+
+@dataclass(slots=True, frozen=True)
+class RecurrenceRule:
+    """반복 규칙 (회차 목록을 만들지 않고 n 번째 회차 시각을 바로 계산)"""
+    freq: str
+    start: float  # 첫 회차 시각 (epoch)
+    count: int | None = None  # 전체 회차 수
+    until: float | None = None  # 이 시각 이후 회차는 만들지 않음
+    timezone: str | None = None  # 회차 계산 기준 시간대 (서머타임이 있어도 같은 현지 시각 유지)
+
+    def __post_init__(self):
+        if self.freq not in FREQUENCIES:
+            raise ValueError(f"지원하지 않는 반복 주기입니다: {self.freq}")
+
+    def occurrence(self, index: int):
+        """index 번째(0부터) 회차 시각, 규칙 범위를 벗어나면 None"""
+        if index < 0 or (self.count is not None and index >= self.count):
+            return None
+
+        first = datetime.fromtimestamp(self.start, self._zone())
+        if self.freq == 'daily':
+            when = first + timedelta(days=index)
+        elif self.freq == 'weekly':
+            when = first + timedelta(weeks=index)
+        else:
+            # 31일처럼 없는 날짜는 그 달의 마지막 날로
+            month = first.month - 1 + index
+            year, month = first.year + month // 12, month % 12 + 1
+            when = first.replace(year=year, month=month, day=min(first.day, calendar.monthrange(year, month)[1]))
+
+        timestamp = when.timestamp()
+        if self.until is not None and timestamp > self.until:
+            return None
+        return timestamp
+
+    def next_after(self, index: int, now: float):
+        """index 회차 다음부터 now 이후인 첫 회차 (index, 시각), 없으면 None
+
+        봇이 오래 꺼져 있었던 경우에도 지나간 회차를 하나씩 만들지 않고 건너뛴다.
+        """
+        index += 1
+        if self.freq != 'monthly':
+            # 지나간 회차 수를 바로 계산해 건너뜀
+            period = 86400 if self.freq == 'daily' else 7 * 86400
+            index = max(index, int((now - self.start) // period))
+
+        while True:
+            timestamp = self.occurrence(index)
+            if timestamp is None:
+                return None
+            if timestamp > now:
+                return index, timestamp
+            index += 1
+
+    def _zone(self):
+        return ZoneInfo(self.timezone) if self.timezone else None
+
+    def describe(self):
+        text = FREQUENCIES[self.freq]
+        if self.count is not None:
+            text += f", 총 {self.count}회"
+        if self.until is not None:
+            until = datetime.fromtimestamp(self.until, self._zone())
+            text += f", {until.strftime('%Y-%m-%d')}까지"
+        return text
+
+    def encode(self):
+        """DB 에 저장할 한 줄 문자열 (예: "weekly;1769331600.0;10;;Asia/Seoul")"""
+        return ";".join((
+            self.freq,
+            repr(self.start),
+            "" if self.count is None else str(self.count),
+            "" if self.until is None else repr(self.until),
+            self.timezone or "",
+        ))
+
+    @classmethod
+    def decode(cls, text: str | None):
+        if not text:
+            return None
+        freq, start, count, until, *zone = text.split(";")
+        return cls(freq, float(start), int(count) if count else None, float(until) if until else None,
+                   zone[0] if zone and zone[0] else None)
@@ -0,0 +1,136 @@
+import asyncio
+import heapq
+import itertools
+import time
+
+from metrics import DEADLINE_CALLBACK_SECONDS, DEADLINE_LATENESS_SECONDS
+
+
+class DeadlineScheduler:
+    """epoch 시각 기준 min-heap 으로 다음 마감 시각까지만 대기하는 스케줄러"""
+
+    def __init__(self, time_func=time.time, speed: float = 1.0):
+        self._time = time_func
+        self.speed = speed  # time_func 가 실제보다 speed 배 빠르게 흐르면 (가상 시계) 대기 시간을 그만큼 줄임
+        self._heap = []  # (when, seq, key)
+        self._entries = {}  # key -> [when, seq, key, callback]
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._running = set()
+        self._cancelled = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def schedule(self, key, when: float, callback):
+        """key 에 대한 마감 시각을 등록 (이미 있으면 갱신)"""
+        self.cancel(key)
+
+        entry = [when, next(self._counter), key, callback]
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+
+        # 가장 빠른 마감 시각이 바뀌었으면 대기 중인 루프를 깨움
+        if self._heap[0] is entry:
+            self._wakeup.set()
+
+    def schedule_many(self, deadlines):
+        """(key, when, callback) 를 한꺼번에 등록 (heappush 를 반복하지 않고 heap 을 한 번만 재구성)"""
+        entries = self._entries
+        for key, when, callback in deadlines:
+            if key in entries:
+                self.cancel(key)
+            entry = [when, next(self._counter), key, callback]
+            entries[key] = entry
+            self._heap.append(entry)
+        heapq.heapify(self._heap)
+        self._wakeup.set()
+
+    def cancel(self, key):
+        """등록된 마감 시각 제거 (heap 에서는 지연 삭제)"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+
+        entry[-1] = None
+        self._cancelled += 1
+
+        # 취소된 항목이 절반을 넘으면 heap 재구성
+        if self._cancelled > 64 and self._cancelled * 2 > len(self._heap):
+            self._heap = [e for e in self._heap if e[-1] is not None]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+        return True
+
+    def deadline(self, key):
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def in_flight(self):
+        """실행 중인 마감 콜백 수"""
+        return len(self._running)
+
+    def is_running(self):
+        return self._task is not None and not self._task.done()
+
+    def _pop_due(self, now):
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            when, _, key, callback = heapq.heappop(self._heap)
+            if callback is None:
+                self._cancelled -= 1
+                continue
+            del self._entries[key]
+            due.append((key, when, callback))
+        return due
+
+    async def _run(self):
+        while True:
+            # 취소된 항목은 heap 앞쪽에서 정리
+            while self._heap and self._heap[0][-1] is None:
+                heapq.heappop(self._heap)
+                self._cancelled -= 1
+
+            self._wakeup.clear()
+
+            if self._heap:
+                timeout = max(0.0, self._heap[0][0] - self._time()) / self.speed
+            else:
+                timeout = None
+
+            if timeout is None or timeout > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                    continue
+                except asyncio.TimeoutError:
+                    pass
+
+            # 느린 콜백(DM 전송 등)이 다음 마감을 늦추지 않도록 태스크로 실행
+            for key, when, callback in self._pop_due(self._time()):
+                task = asyncio.create_task(self._fire(key, when, callback))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+    async def _fire(self, key, when, callback):
+        # (일정 ID, 종류) 형태의 key 는 종류별로 지표를 나눔
+        kind = key[-1] if isinstance(key, tuple) else "deadline"
+        DEADLINE_LATENESS_SECONDS.observe(max(0.0, self._time() - when), kind=kind)
+
+        try:
+            with DEADLINE_CALLBACK_SECONDS.time(kind=kind):
+                await callback()
+        except Exception as e:
+            print(f"마감 처리 중 오류 ({key}): {e}")
@@ -0,0 +1,64 @@
+def guild_shard(guild_id: int, shard_count: int):
+    """Discord 게이트웨이와 같은 방식으로 길드가 속한 샤드 계산"""
+    return (guild_id >> 22) % shard_count
+
+
+def schedule_guild(schedule_id: str):
+    """일정 ID ("{길드}_{채널}_{생성 시각}") 에서 길드 ID 추출"""
+    try:
+        return int(schedule_id.split("_", 1)[0])
+    except ValueError:
+        return None
+
+
+class ShardOwnership:
+    """이 프로세스가 맡은 샤드 (샤드에 속한 길드의 일정과 알람은 이 프로세스만 관리)"""
+
+    def __init__(self, shard_count: int = 1, shard_ids=None):
+        self.shard_count = max(1, shard_count)
+        self.shard_ids = frozenset(range(self.shard_count) if shard_ids is None else shard_ids)
+
+        unknown = [i for i in self.shard_ids if not 0 <= i < self.shard_count]
+        if unknown:
+            raise ValueError(f"샤드 번호 {unknown} 는 0 ~ {self.shard_count - 1} 범위여야 합니다.")
+
+    @classmethod
+    def from_env(cls, shard_count: str | None, shard_ids: str | None):
+        """SHARD_COUNT / SHARD_IDS ("0,1" 형식) 환경 변수로 생성"""
+        if not shard_count:
+            return cls()
+        ids = [int(i) for i in shard_ids.split(",") if i.strip()] if shard_ids else None
+        return cls(int(shard_count), ids)
+
+    @property
+    def owns_all(self):
+        return len(self.shard_ids) == self.shard_count
+
+    @property
+    def receives_dms(self):
+        # DM 이벤트는 항상 0번 샤드로 들어옴
+        return 0 in self.shard_ids
+
+    @property
+    def tag(self):
+        """프로세스별로 따로 쓰는 파일 이름에 붙일 구분자 (예: "all", "shard0-1of4")"""
+        if self.owns_all:
+            return "all"
+        return f"shard{'-'.join(map(str, sorted(self.shard_ids)))}of{self.shard_count}"
+
+    def owns_guild(self, guild_id: int):
+        return self.owns_all or guild_shard(guild_id, self.shard_count) in self.shard_ids
+
+    def owns_schedule(self, schedule_id: str):
+        guild_id = schedule_guild(schedule_id)
+        return guild_id is not None and self.owns_guild(guild_id)
+
+    def sql_filter(self, column: str = "guild_id"):
+        """SQLite WHERE 절 (이 프로세스가 맡은 길드의 행만 선택)"""
+        if self.owns_all:
+            return "1", ()
+        ids = sorted(self.shard_ids)
+        return (f"(({column} >> 22) % {self.shard_count}) IN ({', '.join('?' * len(ids))})", tuple(ids))
+
+    def __repr__(self):
+        return f"ShardOwnership(shard_count={self.shard_count}, shard_ids={sorted(self.shard_ids)})"
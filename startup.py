@@ -0,0 +1,54 @@
+import hashlib
+import json
+import os
+import time
+
+
+def _process_age():
+    """프로세스가 시작된 뒤 지난 시간 (리눅스가 아니면 0)"""
+    try:
+        with open("/proc/self/stat") as f:
+            # 두 번째 필드(실행 파일 이름)에 공백이 있을 수 있어 ')' 뒤부터 셈
+            started = int(f.read().rsplit(")", 1)[1].split()[19]) / os.sysconf("SC_CLK_TCK")
+        return max(0.0, time.clock_gettime(time.CLOCK_BOOTTIME) - started)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0.0
+
+
+class StartupProfiler:
+    """프로세스 시작부터 첫 상호작용까지 단계별 소요 시간 기록
+
+    인터프리터 시작과 모듈 import 시간도 포함되도록 기준 시각을 프로세스 시작 시각으로 잡는다.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.started = clock() - _process_age()
+        self.phases = {}  # 단계 이름 -> 시작 후 경과 시간 (기록 순서 유지)
+
+    def mark(self, phase: str):
+        """단계 완료 시각 기록 (처음 한 번만), 새로 기록했으면 True"""
+        if phase in self.phases:
+            return False
+        self.phases[phase] = self.clock() - self.started
+        return True
+
+    def elapsed(self, phase: str):
+        return self.phases.get(phase)
+
+    def report(self):
+        """단계별 누적/구간 시간 표"""
+        lines = []
+        previous = 0.0
+        for phase, elapsed in self.phases.items():
+            lines.append(f"{phase:<12} {elapsed * 1000:>9.1f}ms  (+{(elapsed - previous) * 1000:.1f}ms)")
+            previous = elapsed
+        return "\n".join(lines)
+
+
+def command_tree_hash(tree):
+    """동기화할 명령어 정의의 해시 (정의가 같으면 항상 같은 값)"""
+    payload = sorted((command.to_dict(tree) for command in tree.get_commands()),
+                     key=lambda command: (command.get('type', 1), command['name']))
+    data = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(data.encode()).hexdigest()
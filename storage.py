@@ -0,0 +1,510 @@
+import asyncio
+import os
+import sqlite3
+import time
+
+from archive import ArchiveSegments, archive_entry, compress_record
+from models import Schedule
+from recurrence import RecurrenceRule
+from sharding import ShardOwnership
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS schedules (
+    id TEXT PRIMARY KEY,
+    guild_id INTEGER NOT NULL,
+    channel_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    datetime_text TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    min_participants INTEGER NOT NULL,
+    mentioned_users TEXT NOT NULL,
+    creator_id INTEGER NOT NULL,
+    creator_name TEXT NOT NULL,
+    activated INTEGER NOT NULL DEFAULT 0,
+    cancelled INTEGER NOT NULL DEFAULT 0,
+    reminder_sent INTEGER NOT NULL DEFAULT 0,
+    message_id INTEGER,
+    recurrence TEXT,
+    occurrence INTEGER NOT NULL DEFAULT 0,
+    duration INTEGER NOT NULL DEFAULT 3600
+);
+CREATE TABLE IF NOT EXISTS responses (
+    schedule_id TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    attending INTEGER NOT NULL,
+    PRIMARY KEY (schedule_id, user_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS forwarded_responses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    schedule_id TEXT NOT NULL,
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    attending INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS guild_settings (
+    guild_id INTEGER PRIMARY KEY,
+    timezone TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS archive (
+    schedule_id TEXT PRIMARY KEY,
+    guild_id INTEGER NOT NULL,
+    channel_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    outcome TEXT NOT NULL,
+    attending INTEGER NOT NULL,
+    invited INTEGER NOT NULL,
+    segment TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS archive_guild_time ON archive (guild_id, timestamp);
+CREATE TABLE IF NOT EXISTS archive_users (
+    user_id INTEGER NOT NULL,
+    timestamp REAL NOT NULL,
+    schedule_id TEXT NOT NULL,
+    attending INTEGER,
+    PRIMARY KEY (user_id, timestamp, schedule_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS availability (
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    start REAL NOT NULL,
+    end REAL NOT NULL,
+    PRIMARY KEY (guild_id, user_id, start)
+) WITHOUT ROWID;
+"""
+
+SCHEDULE_COLUMNS = (
+    "id", "guild_id", "channel_id", "title", "description", "datetime_text", "timestamp",
+    "min_participants", "mentioned_users", "creator_id", "creator_name",
+    "activated", "cancelled", "reminder_sent", "message_id", "recurrence", "occurrence",
+    "duration",
+)
+
+# 이전 버전 DB 에 없는 컬럼
+MIGRATIONS = {
+    "recurrence": "ALTER TABLE schedules ADD COLUMN recurrence TEXT",
+    "occurrence": "ALTER TABLE schedules ADD COLUMN occurrence INTEGER NOT NULL DEFAULT 0",
+    "duration": "ALTER TABLE schedules ADD COLUMN duration INTEGER NOT NULL DEFAULT 3600",
+}
+
+UPSERT_SCHEDULE = (
+    f"INSERT OR REPLACE INTO schedules ({', '.join(SCHEDULE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(SCHEDULE_COLUMNS))})"
+)
+
+
+def schedule_to_row(schedule: Schedule):
+    return (
+        schedule.id, schedule.guild_id, schedule.channel_id, schedule.title, schedule.description,
+        schedule.datetime_text, schedule.timestamp, schedule.min_participants,
+        ",".join(map(str, schedule.mentioned_users)), schedule.creator_id, schedule.creator_name,
+        int(schedule.activated), int(schedule.cancelled), int(schedule.reminder_sent), schedule.message_id,
+        schedule.recurrence.encode() if schedule.recurrence else None, schedule.occurrence,
+        schedule.duration,
+    )
+
+
+class ScheduleDatabase:
+    """SQLite(WAL) 기반 일정 저장소 (모든 메서드는 동기 호출, 워커 스레드에서 사용)
+
+    archive 가 있으면 끝난 일정을 압축 기록 파일로 옮기고 DB 에는 색인만 남긴다.
+    """
+
+    def __init__(self, path: str, archive: ArchiveSegments | None = None):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.archive = archive
+
+        # 샤드 프로세스 여러 개가 같은 파일을 쓰므로 잠금 대기 시간을 넉넉하게
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(schedules)")}
+        for column, statement in MIGRATIONS.items():
+            if column not in columns:
+                try:
+                    self.conn.execute(statement)
+                except sqlite3.OperationalError:
+                    # 다른 샤드 프로세스가 먼저 추가한 경우
+                    pass
+
+    def load_schedules(self, ownership: ShardOwnership | None = None):
+        """저장된 일정을 Schedule 객체로 복원 (ownership 이 있으면 맡은 샤드의 일정만)"""
+        where, params = (ownership or ShardOwnership()).sql_filter()
+
+        responses = {}
+        for schedule_id, user_id, attending in self.conn.execute(
+                "SELECT schedule_id, user_id, attending FROM responses "
+                f"WHERE schedule_id IN (SELECT id FROM schedules WHERE {where})", params):
+            responses.setdefault(schedule_id, {})[user_id] = bool(attending)
+
+        schedules = []
+        for row in self.conn.execute(f"SELECT {', '.join(SCHEDULE_COLUMNS)} FROM schedules WHERE {where}", params):
+            (schedule_id, guild_id, channel_id, title, description, datetime_text, timestamp,
+             min_participants, mentioned_users, creator_id, creator_name,
+             activated, cancelled, reminder_sent, message_id, recurrence, occurrence,
+             duration) = row
+
+            schedules.append(Schedule(
+                id=schedule_id,
+                guild_id=guild_id,
+                channel_id=channel_id,
+                title=title,
+                description=description,
+                datetime_text=datetime_text,
+                timestamp=timestamp,
+                min_participants=min_participants,
+                mentioned_users=list(map(int, mentioned_users.split(","))) if mentioned_users else [],
+                creator_id=creator_id,
+                creator_name=creator_name,
+                responses=responses.get(schedule_id, {}),
+                activated=bool(activated),
+                cancelled=bool(cancelled),
+                reminder_sent=bool(reminder_sent),
+                message_id=message_id,
+                recurrence=RecurrenceRule.decode(recurrence),
+                occurrence=occurrence,
+                duration=duration,
+            ))
+        return schedules
+
+    def load_guild_timezones(self):
+        """길드별 시간대 설정 (guild_id -> IANA 시간대 이름)"""
+        return dict(self.conn.execute("SELECT guild_id, timezone FROM guild_settings"))
+
+    def load_availability(self, ownership: ShardOwnership | None = None, since: float = 0):
+        """가능 시간 구간 (guild_id, user_id, start, end) 목록 (끝나지 않은 구간만)"""
+        where, params = (ownership or ShardOwnership()).sql_filter()
+        return self.conn.execute(
+            f"SELECT guild_id, user_id, start, end FROM availability WHERE end > ? AND {where}", (since,) + params
+        ).fetchall()
+
+    def apply(self, upserts, responses, deletes, forwarded=(), guild_timezones=(), archives=(), availability=()):
+        """변경 사항을 하나의 트랜잭션으로 반영 (보관 기록은 파일에 먼저 쓰고 색인은 같은 트랜잭션에서 추가)
+
+        트랜잭션이 실패하면 이번에 덧붙인 기록을 잘라낸다. 그 사이 프로세스가 죽으면 색인 없는 기록이 남지만,
+        일정 행도 지워지지 않았으므로 다음 복원 때 다시 보관되고 남은 기록은 읽히지 않는 자리만 차지한다.
+        """
+        locations = []
+        if archives and self.archive is not None:
+            locations = self.archive.append([compress_record(record) for _, _, record in archives])
+
+        try:
+            with self.conn:
+                self.conn.execute("BEGIN IMMEDIATE")
+                if upserts:
+                    self.conn.executemany(UPSERT_SCHEDULE, upserts)
+                if responses:
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO responses (schedule_id, user_id, attending) VALUES (?, ?, ?)",
+                        responses
+                    )
+                if deletes:
+                    params = [(schedule_id,) for schedule_id in deletes]
+                    self.conn.executemany("DELETE FROM responses WHERE schedule_id = ?", params)
+                    self.conn.executemany("DELETE FROM schedules WHERE id = ?", params)
+                if forwarded:
+                    self.conn.executemany(
+                        "INSERT INTO forwarded_responses (schedule_id, guild_id, user_id, attending) "
+                        "VALUES (?, ?, ?, ?)",
+                        forwarded
+                    )
+                if guild_timezones:
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO guild_settings (guild_id, timezone) VALUES (?, ?)", guild_timezones
+                    )
+                if availability:
+                    # 사용자별 구간 목록을 통째로 바꿈
+                    self.conn.executemany("DELETE FROM availability WHERE guild_id = ? AND user_id = ?",
+                                          [(guild_id, user_id) for guild_id, user_id, _ in availability])
+                    self.conn.executemany(
+                        "INSERT INTO availability (guild_id, user_id, start, end) VALUES (?, ?, ?, ?)",
+                        [(guild_id, user_id, start, end) for guild_id, user_id, intervals in availability
+                         for start, end in intervals]
+                    )
+                if locations:
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO archive (schedule_id, guild_id, channel_id, title, timestamp, outcome, "
+                        "attending, invited, segment, offset, length) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [row + location for (row, _, _), location in zip(archives, locations)]
+                    )
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO archive_users (user_id, timestamp, schedule_id, attending) "
+                        "VALUES (?, ?, ?, ?)",
+                        [user for _, users, _ in archives for user in users]
+                    )
+        except BaseException:
+            # 색인을 쓰지 못한 기록은 세그먼트에서 잘라내 재시도 때 같은 기록이 두 번 남지 않게 함
+            if locations:
+                self.archive.truncate(locations)
+            raise
+
+
+    def query_archive(self, guild_id, user_id=None, since=None, until=None, limit: int = 10):
+        """보관된 일정을 최근 것부터 limit 개 조회 (색인만 읽고, 표시할 기록만 파일에서 읽음)
+
+        반환값: ([(색인 정보 dict, 기록 dict 또는 None)], 조건에 맞는 전체 개수)
+        """
+        since = float("-inf") if since is None else since
+        until = float("inf") if until is None else until
+        if user_id is None:
+            source = "archive a"
+            where = "a.guild_id = ? AND a.timestamp BETWEEN ? AND ?"
+            params = (guild_id, since, until)
+            response = "NULL"
+        else:
+            source = "archive_users u JOIN archive a ON a.schedule_id = u.schedule_id"
+            where = "u.user_id = ? AND u.timestamp BETWEEN ? AND ? AND a.guild_id = ?"
+            params = (user_id, since, until, guild_id)
+            response = "u.attending"
+
+        total = self.conn.execute(f"SELECT COUNT(*) FROM {source} WHERE {where}", params).fetchone()[0]
+        rows = self.conn.execute(
+            f"SELECT a.schedule_id, a.title, a.timestamp, a.outcome, a.attending, a.invited, {response}, "
+            f"a.segment, a.offset, a.length FROM {source} WHERE {where} ORDER BY a.timestamp DESC LIMIT ?",
+            params + (limit,)
+        ).fetchall()
+
+        entries = []
+        for schedule_id, title, timestamp, outcome, attending, invited, user_attending, segment, offset, length in rows:
+            entry = {
+                'schedule_id': schedule_id, 'title': title, 'timestamp': timestamp, 'outcome': outcome,
+                'attending': attending, 'invited': invited,
+                'user_attending': None if user_attending is None else bool(user_attending),
+            }
+            record = None
+            if self.archive is not None:
+                try:
+                    record = self.archive.read(segment, offset, length)
+                except (OSError, ValueError) as e:
+                    print(f"보관 기록 읽기 오류 ({schedule_id}): {e}")
+            entries.append((entry, record))
+        return entries, total
+
+    def get_meta(self, key: str):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def take_forwarded(self, ownership: ShardOwnership):
+        """다른 프로세스가 넘긴 응답 중 맡은 샤드의 것을 꺼냄 (받은 순서대로)"""
+        where, params = ownership.sql_filter()
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            rows = self.conn.execute(
+                f"SELECT id, schedule_id, user_id, attending FROM forwarded_responses WHERE {where} ORDER BY id",
+                params
+            ).fetchall()
+            if rows:
+                self.conn.executemany("DELETE FROM forwarded_responses WHERE id = ?", [(row[0],) for row in rows])
+        return [(schedule_id, user_id, bool(attending)) for _, schedule_id, user_id, attending in rows]
+
+    def close(self):
+        self.conn.close()
+
+
+# 저장에 실패했을 때 다시 시도하기까지 최대 대기 시간 (초)
+MAX_RETRY_DELAY = 30.0
+
+# 종료할 때 남은 변경 사항 저장을 다시 시도하는 횟수
+CLOSE_RETRIES = 3
+
+
+class WriteBehindWriter:
+    """변경 사항을 모아 일정 간격마다 묶어서 저장 (이벤트 루프는 fsync 를 기다리지 않음)
+
+    저장에 실패하면 (예: 다른 샤드 프로세스가 DB 를 잠그고 있음) 꺼낸 변경 사항을 다시 대기열에 합치고
+    간격을 두 배씩 늘려 가며 다시 시도한다.
+    """
+
+    def __init__(self, database: ScheduleDatabase, flush_interval: float = 0.5, max_batch: int = 500):
+        self.database = database
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+
+        self._upserts = {}  # schedule_id -> Schedule (최신 상태만 유지)
+        self._responses = {}  # (schedule_id, user_id) -> attending
+        self._deletes = set()
+        self._forwarded = []  # 다른 샤드 소유 일정에 대한 응답
+        self._guild_timezones = {}  # guild_id -> 시간대 이름
+        self._archives = {}  # schedule_id -> (Schedule, 보관 사유, 보관 시각)
+        self._availability = {}  # (guild_id, user_id) -> 가능 시간 구간 목록 (최신 상태만 유지)
+        self._flush_handle = None
+        self._flush_task = None
+        self._flush_lock = asyncio.Lock()
+        self._failures = 0  # 연속 저장 실패 횟수
+
+    def __len__(self):
+        return (len(self._upserts) + len(self._responses) + len(self._deletes) + len(self._forwarded)
+                + len(self._guild_timezones) + len(self._archives) + len(self._availability))
+
+    def save(self, schedule: Schedule):
+        self._deletes.discard(schedule.id)
+        self._upserts[schedule.id] = schedule
+        self._schedule_flush()
+
+    def save_response(self, schedule_id, user_id, attending):
+        self._responses[(schedule_id, user_id)] = attending
+        self._schedule_flush()
+
+    def save_guild_timezone(self, guild_id, timezone: str):
+        self._guild_timezones[guild_id] = timezone
+        self._schedule_flush()
+
+    def save_availability(self, guild_id, user_id, intervals):
+        self._availability[(guild_id, user_id)] = intervals
+        self._schedule_flush()
+
+    def forward_response(self, schedule_id, guild_id, user_id, attending):
+        """소유 샤드 프로세스가 가져가도록 응답을 공유 DB 에 남김"""
+        self._forwarded.append((schedule_id, guild_id, user_id, int(attending)))
+        self._schedule_flush()
+
+    async def take_forwarded(self, ownership: ShardOwnership):
+        # 쓰기와 같은 연결을 쓰므로 flush 와 겹치지 않게 실행
+        async with self._flush_lock:
+            return await asyncio.to_thread(self.database.take_forwarded, ownership)
+
+    async def get_meta(self, key: str):
+        async with self._flush_lock:
+            return await asyncio.to_thread(self.database.get_meta, key)
+
+    async def set_meta(self, key: str, value: str):
+        """바로 기록 (명령어 동기화 해시처럼 작업이 끝난 직후 남겨야 하는 값)"""
+        async with self._flush_lock:
+            await asyncio.to_thread(self.database.set_meta, key, value)
+
+    def delete(self, schedule_id):
+        self._upserts.pop(schedule_id, None)
+        self._deletes.add(schedule_id)
+        self._schedule_flush()
+
+    def archive(self, schedule: Schedule, outcome: str):
+        """끝난 일정을 보관 기록으로 옮기고 일정 표에서는 삭제"""
+        self._archives[schedule.id] = (schedule, outcome, time.time())
+        self.delete(schedule.id)
+
+    async def query_archive(self, guild_id, user_id=None, since=None, until=None, limit: int = 10):
+        # 아직 기록하지 않은 보관 일정도 조회되도록 먼저 반영
+        await self.flush()
+        async with self._flush_lock:
+            return await asyncio.to_thread(self.database.query_archive, guild_id, user_id, since, until, limit)
+
+    def _schedule_flush(self):
+        if self._flush_task is not None:
+            return
+
+        # 재시도를 기다리는 중에는 배치가 커져도 바로 저장하지 않음
+        if len(self) >= self.max_batch and not self._failures:
+            self._start_flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.flush_interval, self._start_flush)
+
+    def _start_flush(self):
+        self._flush_handle = None
+        if self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+
+    async def flush(self):
+        async with self._flush_lock:
+            self._flush_task = None
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+
+            if not len(self):
+                return
+
+            batch = self._take()
+            upserts, responses, deletes, forwarded, guild_timezones, archives, availability = batch
+
+            # 행 변환은 이벤트 루프에서 끝내고 스레드에는 불변 데이터만 전달
+            try:
+                await asyncio.to_thread(
+                    self.database.apply,
+                    [schedule_to_row(s) for s in upserts.values()],
+                    [(schedule_id, user_id, int(attending))
+                     for (schedule_id, user_id), attending in responses.items() if schedule_id not in deletes],
+                    list(deletes),
+                    forwarded,
+                    list(guild_timezones.items()),
+                    [archive_entry(schedule, outcome, archived_at)
+                     for schedule, outcome, archived_at in archives.values()],
+                    [(guild_id, user_id, intervals) for (guild_id, user_id), intervals in availability.items()],
+                )
+            except Exception as e:
+                self._restore(batch)
+                self._failures += 1
+                delay = min(self.flush_interval * 2 ** self._failures, MAX_RETRY_DELAY)
+                print(f"일정 저장 오류 ({len(upserts)}건 갱신, {len(deletes)}건 삭제): {e} "
+                      f"({delay:.1f}초 후 다시 시도)")
+                self._flush_handle = asyncio.get_running_loop().call_later(delay, self._start_flush)
+                return
+
+            self._failures = 0
+
+    def _take(self):
+        """대기 중인 변경 사항을 꺼내고 빈 대기열로 교체"""
+        batch = (self._upserts, self._responses, self._deletes, self._forwarded,
+                 self._guild_timezones, self._archives, self._availability)
+        self._upserts = {}
+        self._responses = {}
+        self._deletes = set()
+        self._forwarded = []
+        self._guild_timezones = {}
+        self._archives = {}
+        self._availability = {}
+        return batch
+
+    def _restore(self, batch):
+        """저장하지 못한 변경 사항을 대기열에 되돌림 (그 사이 새로 쌓인 변경 사항이 우선)"""
+        upserts, responses, deletes, forwarded, guild_timezones, archives, availability = batch
+
+        # 저장 후에 삭제된 일정의 예전 상태는 버리고, 다시 저장된 일정의 예전 삭제는 취소
+        upserts = {schedule_id: schedule for schedule_id, schedule in upserts.items()
+                   if schedule_id not in self._deletes}
+        upserts.update(self._upserts)
+        self._upserts = upserts
+        self._deletes = (deletes - self._upserts.keys()) | self._deletes
+
+        responses.update(self._responses)
+        self._responses = responses
+        self._forwarded = forwarded + self._forwarded
+        guild_timezones.update(self._guild_timezones)
+        self._guild_timezones = guild_timezones
+        archives.update(self._archives)
+        self._archives = archives
+        availability.update(self._availability)
+        self._availability = availability
+
+    async def close(self):
+        """남은 변경 사항을 저장하고 연결을 닫음 (끝내 저장하지 못하면 잃는 변경 사항을 알림)"""
+        await self.flush()
+        for attempt in range(CLOSE_RETRIES + 1):
+            # 실패한 flush 가 예약한 재시도 대신 여기서 직접 다시 시도
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+            if not len(self) or attempt == CLOSE_RETRIES:
+                break
+            await asyncio.sleep(min(self.flush_interval * 2 ** self._failures, MAX_RETRY_DELAY))
+            await self.flush()
+
+        if len(self):
+            print(f"🚨 종료 전에 저장하지 못한 변경 사항 {len(self)}건을 잃습니다. "
+                  f"(일정 갱신 {len(self._upserts)}건, 삭제 {len(self._deletes)}건, 응답 {len(self._responses)}건, "
+                  f"보관 {len(self._archives)}건)")
+        await asyncio.to_thread(self.database.close)
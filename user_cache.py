@@ -0,0 +1,135 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """LRU + TTL 캐시 (maxsize 초과 시 가장 오래 쓰지 않은 항목부터 제거)"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def get(self, key):
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key):
+        item = self._data.pop(key, None)
+        return item[1] if item else None
+
+
+class UserCache:
+    """사용자/DM 채널 조회 캐시 (게이트웨이 캐시 우선, 동시 조회는 한 번의 요청으로 합침)"""
+
+    def __init__(self, bot, maxsize: int = 10000, ttl: float = 3600):
+        self.bot = bot
+        self.users = TTLCache(maxsize, ttl)
+        self.dm_channels = TTLCache(maxsize, ttl)
+        self._inflight = {}  # (kind, user_id) -> Future
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'users': len(self.users),
+            'dm_channels': len(self.dm_channels),
+        }
+
+    def has_dm_channel(self, user_id):
+        return user_id in self.dm_channels
+
+    def invalidate(self, user_id):
+        self.users.pop(user_id)
+        self.dm_channels.pop(user_id)
+
+    async def get_user(self, user_id):
+        user = self.bot.get_user(user_id)
+        if user is None:
+            user = self.users.get(user_id)
+
+        if user is not None:
+            self.hits += 1
+            return user
+
+        return await self._load(('user', user_id), self._fetch_user, user_id)
+
+    async def get_dm_channel(self, user_id):
+        channel = self.dm_channels.get(user_id)
+        if channel is not None:
+            self.hits += 1
+            return channel
+
+        user = self.bot.get_user(user_id) or self.users.get(user_id)
+        if user is not None and user.dm_channel is not None:
+            self.hits += 1
+            self.dm_channels.set(user_id, user.dm_channel)
+            return user.dm_channel
+
+        return await self._load(('dm', user_id), self._create_dm, user_id)
+
+    async def _fetch_user(self, user_id):
+        user = await self.bot.fetch_user(user_id)
+        self.users.set(user_id, user)
+        return user
+
+    async def _create_dm(self, user_id):
+        user = self.bot.get_user(user_id) or self.users.get(user_id)
+        if user is None:
+            user = await self._fetch_user(user_id)
+
+        channel = user.dm_channel or await user.create_dm()
+        self.dm_channels.set(user_id, channel)
+        return channel
+
+    async def _load(self, key, loader, user_id):
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await loader(user_id)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 기다리는 쪽이 없을 때 "exception was never retrieved" 경고 방지
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]